@@ -0,0 +1,97 @@
+'''
+ ____________________________________________________________________
+ Lawrenceville, GA
+_____________________________________________________________________
+
+   Program:    benchAdminClient.py
+   Purpose:    Runs agsAdmin.AdminClient against stubAdminServer and
+               reports call latency, token reuse, connection reuse and
+               how long hung or failing calls take to give up.
+
+               python benchAdminClient.py [calls]
+_____________________________________________________________________
+   History:     AG      10/2026     Created
+_____________________________________________________________________
+'''
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'script'))
+import agsAdmin
+from stubAdminServer import StubAdminServer
+
+folder = 'MyCityServices'
+service = 'MyCityServices.MapServer'
+
+
+def client(server, **kwargs):
+    return agsAdmin.AdminClient('127.0.0.1', server.port, 'siteadmin', 'secret', scheme='http', **kwargs)
+
+
+def benchCalls(server, calls):
+
+    state = server.state
+    admin = client(server)
+    start = time.time()
+    for i in range(calls):
+        admin.stopService(folder, service)
+        admin.startService(folder, service)
+    elapsed = time.time() - start
+    admin.close()
+    print('{} stop/start pairs: {:.1f} ms per call, {} tokens generated, {} connections'.format(
+        calls, elapsed * 1000 / (calls * 2), state.counts.get('generateToken', 0), state.connections))
+
+
+def benchStartPoll(server):
+
+    server.state.start_lag = 1.5
+    admin = client(server)
+    start = time.time()
+    admin.startService(folder, service)
+    poll = admin.pollStatus(folder, service, 'STARTED', interval=0.25, timeout=10)
+    reached = poll.wait(15)
+    print('start + poll to STARTED: {} in {:.2f}s'.format(reached, time.time() - start))
+    server.state.start_lag = 0
+    admin.close()
+
+
+def benchHung(server):
+
+    server.state.hang = 5
+    admin = client(server, timeout=0.5, retries=2, backoff=0.1)
+    start = time.time()
+    try:
+        admin.stopService(folder, service)
+        result = 'returned'
+    except agsAdmin.AdminError:
+        result = 'gave up'
+    print('hung server, timeout 0.5s x 3 attempts: {} after {:.2f}s'.format(result, time.time() - start))
+    server.state.hang = 0
+    admin.close()
+
+
+def benchRetry(server):
+
+    server.state.fail_next = 2
+    admin = client(server, retries=3, backoff=0.1)
+    start = time.time()
+    result = admin.stopService(folder, service)
+    print('two 503s then success: {} after {:.2f}s'.format(result.get('status'), time.time() - start))
+    admin.close()
+
+
+if __name__ == '__main__':
+
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    server = StubAdminServer()
+    server.startBackground()
+
+    benchCalls(server, calls)
+    benchStartPoll(server)
+    benchRetry(server)
+    benchHung(server)
+
+    server.shutdown()
@@ -0,0 +1,135 @@
+'''
+ ____________________________________________________________________
+ Lawrenceville, GA
+_____________________________________________________________________
+
+   Program:    benchBulkWriter.py
+   Purpose:    Compares bulkWriter.appendRows against Append_management
+               (TEST and NO_TEST) on a local file geodatabase where arcpy
+               is installed. Without arcpy there is nothing to compare
+               against: appendRows only runs through the fake arcpy
+               backend (bench\fakeArcpy) to check every row arrives
+               intact at each batch size, no timings are reported.
+
+               python benchBulkWriter.py [rows]
+_____________________________________________________________________
+   History:     AG      10/2026     Created
+                AG      10/2026     SQLite stand-in replaced by the real appendRows on the
+                                    fake arcpy backend against a fake Append_management
+                AG      10/2026     Fake backend only checks appendRows output, the fake
+                                    Append baseline measured nothing about the real one
+_____________________________________________________________________
+'''
+
+import os
+import sys
+import time
+import shutil
+import random
+import tempfile
+
+bench_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(bench_dir, '..', 'script'))
+
+# real arcpy where installed, the fake backend everywhere else
+try:
+    import arcpy
+    workspace = None
+except ImportError:
+    sys.path.insert(0, os.path.join(bench_dir, 'fakeArcpy'))
+    import arcpy
+    from arcpy import workspace
+import bulkWriter
+
+batch_sizes = [100, 1000, 10000]
+
+
+def makeRows(count, seed=1):
+    '''(Parcel_No, Full_Address, x, y) rows'''
+
+    rng = random.Random(seed)
+    return [('R{:04d} {:03d}'.format(5000 + i // 1000, i % 1000),
+             '{} {} ST LAWRENCEVILLE GA 30046'.format(rng.randint(1, 9999), rng.choice(['OAK', 'PINE', 'MAIN', 'CLAYTON'])),
+             rng.uniform(0, 10000), rng.uniform(0, 10000)) for i in range(count)]
+
+
+def report(name, elapsed, count):
+    print('{:<34} {:>8.2f}s {:>10.0f} rows/s'.format(name, elapsed, count / elapsed if elapsed else 0))
+
+
+def checkFake(rows):
+    '''appendRows through the fake cursors, every row compared with the source'''
+
+    print('Fake arcpy backend (bench\\fakeArcpy), {} rows, correctness only'.format(len(rows)))
+    source = workspace.add(workspace.Table('source', 'Point'))
+    source.addField('Parcel_No', 'String', 50)
+    source.addField('Full_Address', 'String', 100)
+    for parcel_no, address, x, y in rows:
+        source.insert([(x, y), parcel_no, address])
+
+    fields = ['SHAPE@XY', 'Parcel_No', 'Full_Address']
+    def read(fc):
+        with arcpy.da.SearchCursor(fc, fields) as scur:
+            return [tuple(row) for row in scur]
+    expected = read('source')
+
+    mapping = [('SHAPE@', 'SHAPE@'), ('Parcel_No', 'Parcel_No'), ('Full_Address', 'Full_Address')]
+    for batch_size in batch_sizes:
+        fc = arcpy.CreateFeatureclass_management('bench.gdb', 'bulk_{}'.format(batch_size), 'POINT', 'source')[0]
+        edit = arcpy.da.Editor('bench.gdb')
+        edit.startEditing(False, False)
+        count = bulkWriter.appendRows('source', fc, mapping, batch_size, edit)
+        edit.stopEditing(True)
+        if count != len(rows) or read(fc) != expected:
+            raise RuntimeError('appendRows batch {} wrote {} rows that differ from the source'.format(batch_size, count))
+        print('appendRows batch {:<6} {} rows match the source'.format(batch_size, count))
+
+    workspace.clear()
+
+
+def benchArcpy(rows, folder):
+
+    print('File geodatabase, {} rows'.format(len(rows)))
+    gdb = arcpy.CreateFileGDB_management(folder, 'bench.gdb')[0]
+    sr = arcpy.SpatialReference(2240)
+    source = arcpy.CreateFeatureclass_management(gdb, 'source', 'POINT', spatial_reference=sr)[0]
+    arcpy.AddField_management(source, 'Parcel_No', 'TEXT', field_length=50)
+    arcpy.AddField_management(source, 'Full_Address', 'TEXT', field_length=100)
+    with arcpy.da.InsertCursor(source, ['Parcel_No', 'Full_Address', 'SHAPE@XY']) as icur:
+        for parcel_no, address, x, y in rows:
+            icur.insertRow([parcel_no, address, (x, y)])
+
+    def target(name):
+        return arcpy.CreateFeatureclass_management(gdb, name, 'POINT', source, spatial_reference=sr)[0]
+
+    for schema_type in ['TEST', 'NO_TEST']:
+        fc = target('append_' + schema_type.lower())
+        start = time.time()
+        arcpy.Append_management(source, fc, schema_type)
+        report('Append {}'.format(schema_type), time.time() - start, len(rows))
+
+    mapping = [('SHAPE@', 'SHAPE@'), ('Parcel_No', 'Parcel_No'), ('Full_Address', 'Full_Address')]
+    for batch_size in batch_sizes:
+        fc = target('bulk_{}'.format(batch_size))
+        edit = arcpy.da.Editor(gdb)
+        edit.startEditing(False, False)
+        start = time.time()
+        bulkWriter.appendRows(source, fc, mapping, batch_size, edit)
+        edit.stopEditing(True)
+        report('appendRows batch {}'.format(batch_size), time.time() - start, len(rows))
+
+
+if __name__ == '__main__':
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rows = makeRows(count)
+
+    if workspace is not None:
+        checkFake(rows)
+        print('arcpy not available, Append_management comparison skipped')
+    else:
+        folder = tempfile.mkdtemp()
+        try:
+            benchArcpy(rows, folder)
+        finally:
+            shutil.rmtree(folder, ignore_errors=True)
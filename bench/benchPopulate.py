@@ -0,0 +1,191 @@
+'''
+ ____________________________________________________________________
+ Lawrenceville, GA
+_____________________________________________________________________
+
+   Program:    benchPopulate.py
+   Purpose:    Times populateParcelsAll, populateHiperweb and
+               populateServiceFields end to end on synthetic data
+               (syntheticData.py) through the fake arcpy backend, so
+               changes to them can be measured without the SDE.
+               --only mergejoin times the Full_Address update of
+               engine='spatialjoin' (mergeJoin.py), time and peak
+               allocations.
+
+               python benchPopulate.py [parcels] [--workers N] [--only NAME] [-v]
+_____________________________________________________________________
+   History:     AG      10/2026     Created
+                AG      10/2026     Dict against numpy update paths (--only columnar)
+                AG      10/2026     Hiperweb runs use the compiled lexicon
+                AG      10/2026     Full_Address update through the merge join
+                AG      10/2026     numpy runs skipped when numpy is not installed
+                AG      10/2026     numpy runs removed with columnar.py, --only columnar
+                                    is now --only mergejoin
+_____________________________________________________________________
+'''
+
+import os
+import sys
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+import syntheticData
+from syntheticData import workspace, workingCopy
+
+import lexiconCompiler
+import parseCache
+import stageMetrics
+import updateHiperweb
+import updateParcelsAll
+import updateUtilityParcels
+
+
+def report(name, elapsed, rows, note=''):
+    peak = stageMetrics.peakRSS()
+    print('{:<34} {:>8.2f}s {:>10.0f} rows/s {:>7} peak  {}'.format(
+        name, elapsed, rows / elapsed if elapsed else 0, '{:.0f}MB'.format(peak / 1048576.0) if peak else 'n/a', note))
+
+
+def column(fc, field):
+    fc = workspace.get(fc)
+    idx = fc.fieldIndex(field)
+    return [row[idx] for row in fc.rows]
+
+
+def benchParcelsAll():
+
+    workingCopy('ParcelsAll', 'ParcelsAll_f', ['Parcel_No', 'Full_Address'], copy=['Parcel_No'])
+    start = time.time()
+    updateParcelsAll.populateParcelsAll('ParcelsAll_f', 'AddressesAll')
+    elapsed = time.time() - start
+
+    values = column('ParcelsAll_f', 'Full_Address')
+    report('populateParcelsAll', elapsed, len(values), '{} parcels with an address'.format(sum(1 for v in values if v)))
+
+
+def benchHiperweb(workers, folder):
+
+    lexicon, lexicon_digest = lexiconCompiler.loadLexicon(syntheticData.lexicon_json,
+                                                          os.path.join(folder, 'parsing_lists.lexicon'))
+    fields = ['Full_Address', 'Hiperweb_Address', 'StreetNumber', 'StreetName', 'StreetType', 'PreDirection', 'PostDirection']
+
+    def run(name, cache=None, workers=1):
+        workingCopy('ParcelsAll', 'ParcelsHiperweb_f', syntheticData.hiperweb_fields, copy=['Parcel_No', 'Full_Address'])
+        start = time.time()
+        updateHiperweb.populateHiperweb('ParcelsHiperweb_f', *(fields + [lexicon, cache, workers]))
+        elapsed = time.time() - start
+        report(name, elapsed, len(workspace.get('ParcelsHiperweb_f').rows))
+        return column('ParcelsHiperweb_f', 'Hiperweb_Address')
+
+    serial = run('populateHiperweb')
+    if workers > 1:
+        parallel = run('populateHiperweb {} workers'.format(workers), workers=workers)
+        if parallel != serial:
+            print('  parallel output differs from serial!')
+
+    db = os.path.join(folder, 'Hiperweb_parse_cache.sqlite')
+    for name in ['populateHiperweb cold cache', 'populateHiperweb warm cache']:
+        with parseCache.ParseCache(db, lexicon, lexicon_digest) as cache:
+            if run(name, cache) != serial:
+                print('  cached output differs from uncached!')
+
+
+def benchServiceFields(folder):
+
+    # parcels in the service area, standing in for the Clip in prepUtilityParcels
+    area = workspace.get('CityUtilityServiceArea').rows[0][1][0]
+    x0, y0 = area[0]
+    x1, y1 = area[2]
+    inside = lambda row: all(x0 <= x <= x1 and y0 <= y <= y1 for x, y in row[1][0])
+
+    route_cache = os.path.join(folder, 'route_index.pkl')
+    for name in ['populateServiceFields cold routes', 'populateServiceFields warm routes']:
+        workingCopy('ParcelsAll', 'UtilityParcels_f', syntheticData.utility_fields,
+                    copy=['Parcel_No', 'Full_Address'], where=inside)
+        start = time.time()
+        updateUtilityParcels.populateServiceFields('UtilityParcels_f', 'ServiceInfo', 'LimbRoutes', 'SanitationRoutes',
+                                                   'RecycleRoutes', route_cache)
+        elapsed = time.time() - start
+
+        accounts = column('UtilityParcels_f', 'Account')
+        routes = column('UtilityParcels_f', 'Limb_Pickup_Day')
+        report(name, elapsed, len(accounts), '{} with an account, {} with a limb route'.format(
+            sum(1 for a in accounts if a), sum(1 for r in routes if r)))
+
+
+def measured(func, *args, **kwargs):
+    '''Runs func, returns (seconds, peak bytes allocated while it ran or None)'''
+
+    if tracemalloc:
+        tracemalloc.start()
+    start = time.time()
+    func(*args, **kwargs)
+    elapsed = time.time() - start
+    peak = None
+    if tracemalloc:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def reportPeak(name, elapsed, rows, peak, note=''):
+    print('{:<34} {:>8.2f}s {:>10.0f} rows/s {:>7} alloc {}'.format(
+        name, elapsed, rows / elapsed if elapsed else 0, '{:.0f}MB'.format(peak / 1048576.0) if peak else 'n/a', note))
+
+
+def benchMergeJoin():
+
+    # spatial join output engine='spatialjoin' reads, TARGET_FID and Full_Address_1
+    workingCopy('ParcelsAll', 'ParcelsAll_f', ['Parcel_No', 'Full_Address'], copy=['Parcel_No'])
+    updateParcelsAll.populateParcelsAllIndex('ParcelsAll_f', 'AddressesAll')
+    sj = syntheticData.table('par_add_sj', None, [('TARGET_FID', 'Integer'), ('Full_Address_1', 'String')])
+    for row in workspace.get('ParcelsAll_f').rows:
+        sj.insert([row[0], row[3]])
+
+    expected = column('ParcelsAll_f', 'Full_Address')
+
+    workingCopy('ParcelsAll', 'ParcelsAll_f', ['Parcel_No', 'Full_Address'], copy=['Parcel_No'])
+    elapsed, peak = measured(updateParcelsAll.updateFullAddress, 'ParcelsAll_f', 'par_add_sj')
+    values = column('ParcelsAll_f', 'Full_Address')
+    reportPeak('Full_Address update merge join', elapsed, len(values), peak)
+    if values != expected:
+        print('  merge join Full_Address differs from the point index!')
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Times the populate functions on synthetic data')
+    parser.add_argument('parcels', nargs='?', type=int, default=10000, help='parcel count, 10k to 1M')
+    parser.add_argument('--workers', type=int, default=4, help='parse workers for the parallel Hiperweb run')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--only', choices=['parcelsall', 'hiperweb', 'servicefields', 'mergejoin'])
+    parser.add_argument('-v', '--verbose', action='store_true', help='show the scripts\' logging')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format='%(levelname)s: %(message)s')
+
+    start = time.time()
+    sizes = syntheticData.generate(args.parcels, args.seed)
+    print('generated {} parcels, {} address points, {} service points in {:.1f}s'.format(
+        sizes['ParcelsAll'], sizes['AddressesAll'], sizes['ServiceInfo'], time.time() - start))
+
+    folder = tempfile.mkdtemp()
+    try:
+        if args.only in (None, 'parcelsall'):
+            benchParcelsAll()
+        if args.only in (None, 'hiperweb'):
+            benchHiperweb(args.workers, folder)
+        if args.only in (None, 'servicefields'):
+            benchServiceFields(folder)
+        if args.only in (None, 'mergejoin'):
+            benchMergeJoin()
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
@@ -0,0 +1,107 @@
+'''
+ ____________________________________________________________________
+ Lawrenceville, GA
+_____________________________________________________________________
+
+   Program:    benchSpatialJoin.py
+   Purpose:    Times the spatialIndex parcel/address lookup against
+               SpatialJoin_analysis on synthetic parcels and points.
+               The SpatialJoin side only runs where arcpy is installed.
+
+               python benchSpatialJoin.py [parcels] [points]
+_____________________________________________________________________
+   History:     AG      10/2026     Created
+_____________________________________________________________________
+'''
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'script'))
+import spatialIndex
+
+try:
+    import arcpy
+except ImportError:
+    arcpy = None
+
+
+def makeParcels(count, size=100.0):
+    '''Square grid of parcels, returns [(oid, rings)]'''
+
+    side = int(count ** 0.5) + 1
+    parcels = []
+    for i in range(count):
+        x0 = (i % side) * size
+        y0 = (i // side) * size
+        ring = [(x0, y0), (x0, y0 + size), (x0 + size, y0 + size), (x0 + size, y0), (x0, y0)]
+        parcels.append((i + 1, [ring]))
+    return parcels, side * size
+
+
+def makePoints(count, extent, seed=1):
+    '''Random address points, returns [(oid, x, y, address)]'''
+
+    rng = random.Random(seed)
+    return [(i + 1, rng.uniform(0, extent), rng.uniform(0, extent), '{} MAIN ST'.format(i + 1))
+            for i in range(count)]
+
+
+def benchIndex(parcels, points):
+
+    start = time.time()
+    idx = spatialIndex.PointIndex()
+    for oid, x, y, address in points:
+        idx.insert(x, y, (oid, address))
+    idx.build()
+    matches = {}
+    for oid, rings in parcels:
+        match = idx.firstInPolygon(rings)
+        matches[oid] = match[1] if match else None
+    return time.time() - start, matches
+
+
+def benchSpatialJoin(parcels, points):
+
+    sr = arcpy.SpatialReference(2240)
+    parcel_fc = arcpy.CreateFeatureclass_management('in_memory', 'bench_parcels', 'POLYGON', spatial_reference=sr)[0]
+    arcpy.AddField_management(parcel_fc, 'Full_Address', 'TEXT')
+    with arcpy.da.InsertCursor(parcel_fc, ['SHAPE@']) as icur:
+        for oid, rings in parcels:
+            icur.insertRow([arcpy.Polygon(arcpy.Array([arcpy.Point(x, y) for x, y in rings[0]]), sr)])
+    point_fc = arcpy.CreateFeatureclass_management('in_memory', 'bench_points', 'POINT', spatial_reference=sr)[0]
+    arcpy.AddField_management(point_fc, 'Full_Address', 'TEXT')
+    with arcpy.da.InsertCursor(point_fc, ['SHAPE@XY', 'Full_Address']) as icur:
+        for oid, x, y, address in points:
+            icur.insertRow([(x, y), address])
+
+    start = time.time()
+    sj = arcpy.SpatialJoin_analysis(parcel_fc, point_fc, 'in_memory\\bench_sj', 'JOIN_ONE_TO_ONE', 'KEEP_ALL', '', 'INTERSECT')
+    lut = dict((row[0], row[1]) for row in arcpy.da.SearchCursor(sj, ['TARGET_FID', 'Full_Address_1']))
+    elapsed = time.time() - start
+
+    for fc in [parcel_fc, point_fc, sj]:
+        arcpy.Delete_management(fc)
+    return elapsed, lut
+
+
+if __name__ == '__main__':
+
+    parcel_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    point_count = int(sys.argv[2]) if len(sys.argv) > 2 else parcel_count
+
+    parcels, extent = makeParcels(parcel_count)
+    points = makePoints(point_count, extent)
+
+    elapsed, matches = benchIndex(parcels, points)
+    print('spatialIndex:     {:.2f}s  {:.0f} parcels/sec'.format(elapsed, parcel_count / elapsed))
+
+    if arcpy:
+        sj_elapsed, lut = benchSpatialJoin(parcels, points)
+        print('SpatialJoin:      {:.2f}s  {:.0f} parcels/sec'.format(sj_elapsed, parcel_count / sj_elapsed))
+        differ = sum(1 for oid in matches if (matches[oid] is None) != (lut.get(oid) is None))
+        print('parcels matched differently: {}'.format(differ))
+    else:
+        print('arcpy not available, SpatialJoin side skipped')
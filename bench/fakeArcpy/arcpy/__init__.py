@@ -0,0 +1,128 @@
+'''
+ ____________________________________________________________________
+ Lawrenceville, GA
+_____________________________________________________________________
+
+   Program:    arcpy (fake)
+   Purpose:    In-memory stand-in for the parts of arcpy the populate
+               functions use, so they can be timed on a machine without
+               ArcGIS. Put bench\fakeArcpy first on sys.path to use it.
+               Timings cover the scripts' own Python work; real cursor
+               and SDE I/O costs are not modelled.
+_____________________________________________________________________
+   History:     AG      10/2026     Created
+_____________________________________________________________________
+'''
+
+from . import da
+from . import workspace
+from .geometry import Array, Extent, Point, PointGeometry, Polygon, SpatialReference
+from .workspace import field_types
+
+
+class _Env(object):
+
+    def __init__(self):
+        self.workspace = None
+        self.scratchWorkspace = None
+        self.overwriteOutput = False
+        self.outputCoordinateSystem = None
+
+env = _Env()
+
+
+class Result(object):
+    '''What geoprocessing tools return, str() gives the output path'''
+
+    def __init__(self, *outputs):
+        self._outputs = [str(o) for o in outputs]
+
+    def getOutput(self, index):
+        return self._outputs[index]
+
+    def __getitem__(self, index):
+        return self._outputs[index]
+
+    def __str__(self):
+        return self._outputs[0]
+
+
+class _Describe(object):
+
+    def __init__(self, table):
+        self.name = table.name
+        self.baseName = table.name
+        self.dataType = 'FeatureClass' if table.shapeType else 'Table'
+        self.OIDFieldName = 'OBJECTID'
+        self.hasOID = True
+        self.fields = list(table.fields)
+        self.spatialReference = table.spatialReference
+        if table.shapeType:
+            self.shapeType = table.shapeType
+            self.shapeFieldName = 'SHAPE'
+
+    @property
+    def extent(self):
+        table = workspace.get(self.name)
+        shp = table.fieldIndex('SHAPE')
+        xs = []
+        ys = []
+        for row in table.rows:
+            raw = row[shp]
+            if raw is None:
+                continue
+            if table.shapeType == 'Point':
+                xs.append(raw[0])
+                ys.append(raw[1])
+            else:
+                for ring in raw:
+                    for x, y in ring:
+                        xs.append(x)
+                        ys.append(y)
+        if not xs:
+            return Extent()
+        return Extent(min(xs), min(ys), max(xs), max(ys))
+
+
+def Describe(value):
+    return _Describe(workspace.get(value))
+
+
+def Exists(dataset):
+    return workspace.shortName(dataset) in workspace.tables
+
+
+def ListFields(dataset, wild_card=None, field_type=None):
+    return list(workspace.get(dataset).fields)
+
+
+def GetCount_management(in_rows):
+    return Result(len(workspace.get(in_rows).rows))
+
+
+def AddField_management(in_table, field_name, field_type, field_precision=None, field_scale=None,
+                        field_length=None, field_alias=None, field_is_nullable=None,
+                        field_is_required=None, field_domain=None):
+    workspace.get(in_table).addField(field_name, field_types.get(field_type, field_type), field_length or 255)
+    return Result(in_table)
+
+
+def CreateFeatureclass_management(out_path, out_name, geometry_type=None, template=None, has_m=None,
+                                  has_z=None, spatial_reference=None, *args, **kwargs):
+    shape_type = {'POINT': 'Point', 'POLYGON': 'Polygon', 'POLYLINE': 'Polyline'}.get((geometry_type or '').upper())
+    table = workspace.Table(out_name, shape_type, spatial_reference)
+    if template:
+        for fld in workspace.get(template).fields:
+            if fld.type not in ('OID', 'Geometry'):
+                table.addField(fld.name, fld.type, fld.length)
+    workspace.add(table)
+    return Result(str(out_path) + '\\' + out_name)
+
+
+def CreateTable_management(out_path, out_name, template=None, *args, **kwargs):
+    return CreateFeatureclass_management(out_path, out_name, None, template)
+
+
+def Delete_management(in_data, data_type=None):
+    workspace.tables.pop(workspace.shortName(in_data), None)
+    return Result(in_data)
@@ -0,0 +1,259 @@
+'''
+ ____________________________________________________________________
+ Lawrenceville, GA
+_____________________________________________________________________
+
+   Program:    da.py
+   Purpose:    SearchCursor, UpdateCursor, InsertCursor and Editor of
+               the fake arcpy package over workspace.py tables. Field
+               tokens OID@, SHAPE@, SHAPE@XY, SHAPE@WKB and
+               SHAPE@TRUECENTROID are supported. Where clauses only in
+               the forms the scripts use: FIELD < n, FIELD > n, FIELD
+               BETWEEN a AND b, FIELD IN (n, ...) and FIELD IS NOT NULL.
+_____________________________________________________________________
+   History:     AG      10/2026     Created
+                AG      10/2026     TableToNumPyArray, OID slice where clauses
+                AG      10/2026     ORDER BY any one field, for mergeJoin.py
+                AG      10/2026     IN, IS NOT NULL and ORDER BY ... DESC, for
+                                    sourceFingerprint.py
+                AG      10/2026     TableToNumPyArray removed with columnar.py
+_____________________________________________________________________
+'''
+
+import re
+
+from . import geometry
+from . import workspace
+
+
+def _toShape(table, raw):
+    '''Geometry object for a raw shape'''
+
+    if raw is None:
+        return None
+    if table.shapeType == 'Point':
+        return geometry.PointGeometry(geometry.Point(raw[0], raw[1]), table.spatialReference)
+    return geometry.Polygon.fromRings(raw, table.spatialReference)
+
+
+def _fromShape(table, value):
+    '''Raw shape for a geometry object, (x, y) or list of rings'''
+
+    if value is None:
+        return None
+    if table.shapeType == 'Point':
+        if isinstance(value, (tuple, list)):
+            return (value[0], value[1])
+        pnt = value.firstPoint if hasattr(value, 'firstPoint') else value
+        return (pnt.X, pnt.Y)
+    return [list(ring) for ring in value.rings]
+
+
+def _readers(table, fields):
+    '''One function per cursor field returning its value from a stored row'''
+
+    readers = []
+    for name in fields:
+        token = name.upper()
+        if token == 'OID@':
+            readers.append(lambda row: row[0])
+        elif token.startswith('SHAPE@'):
+            shp = table.fieldIndex('SHAPE')
+            if token == 'SHAPE@':
+                readers.append(lambda row, shp=shp: _toShape(table, row[shp]))
+            elif token == 'SHAPE@XY' and table.shapeType == 'Point':
+                readers.append(lambda row, shp=shp: row[shp])
+            elif token in ('SHAPE@XY', 'SHAPE@TRUECENTROID'):
+                def centroid(row, shp=shp):
+                    if row[shp] is None:
+                        return None
+                    pnt = _toShape(table, row[shp]).trueCentroid
+                    return (pnt.X, pnt.Y)
+                readers.append(centroid)
+            elif token == 'SHAPE@WKB':
+                readers.append(lambda row, shp=shp: None if row[shp] is None else _toShape(table, row[shp]).WKB)
+            else:
+                raise RuntimeError('Unsupported field token {}'.format(name))
+        else:
+            idx = table.fieldIndex(name)
+            readers.append(lambda row, idx=idx: row[idx])
+    return readers
+
+
+def _writers(table, fields):
+    '''(cursor position, field index, convert) for each writable cursor field'''
+
+    writers = []
+    for pos, name in enumerate(fields):
+        token = name.upper()
+        if token == 'OID@':
+            continue
+        if token in ('SHAPE@', 'SHAPE@XY'):
+            shp = table.fieldIndex('SHAPE')
+            writers.append((pos, shp, lambda value: _fromShape(table, value)))
+        elif token.startswith('SHAPE@'):
+            # centroids and WKB are read only, updateRow leaves them alone
+            continue
+        else:
+            writers.append((pos, table.fieldIndex(name), None))
+    return writers
+
+
+def _order(table, sql_clause):
+    '''Rows in OID order, or ORDER BY one field, nulls first ascending and last descending'''
+
+    postfix = (sql_clause or (None, None))[1]
+    if not postfix or postfix.upper().replace(' ', '') in ('ORDERBYOBJECTID', 'ORDERBYOID'):
+        return list(table.rows)
+    m = re.match(r'^\s*ORDER\s+BY\s+(\w+)(?:\s+(ASC|DESC))?\s*$', postfix, re.I)
+    if not m:
+        raise NotImplementedError('Fake cursors only order by one field, got {}'.format(postfix))
+    idx = table.fieldIndex(m.group(1))
+    return sorted(table.rows, key=lambda row: (row[idx] is not None, row[idx]),
+                  reverse=(m.group(2) or '').upper() == 'DESC')
+
+
+def _where(table, rows, where_clause):
+    '''rows matching FIELD < n, FIELD > n, FIELD BETWEEN a AND b, FIELD IN (...) or FIELD IS NOT NULL'''
+
+    if not where_clause:
+        return rows
+    m = re.match(r'^\s*(\w+)\s+IS\s+NOT\s+NULL\s*$', where_clause, re.I)
+    if m:
+        idx = table.fieldIndex(m.group(1))
+        return [row for row in rows if row[idx] is not None]
+    m = re.match(r'^\s*(\w+)\s+IN\s*\(([-\d,\s]*)\)\s*$', where_clause, re.I)
+    if m:
+        idx = table.fieldIndex(m.group(1))
+        values = set(int(v) for v in m.group(2).split(',') if v.strip())
+        return [row for row in rows if row[idx] in values]
+    m = re.match(r'^\s*(\w+)\s*(?:(<|>)\s*(-?\d+)|BETWEEN\s+(-?\d+)\s+AND\s+(-?\d+))\s*$', where_clause, re.I)
+    if not m:
+        raise NotImplementedError('Fake cursors do not take where clause {}'.format(where_clause))
+    idx = table.fieldIndex(m.group(1))
+    if m.group(2) == '<':
+        keep = lambda v: v < int(m.group(3))
+    elif m.group(2) == '>':
+        keep = lambda v: v > int(m.group(3))
+    else:
+        keep = lambda v: int(m.group(4)) <= v <= int(m.group(5))
+    return [row for row in rows if row[idx] is not None and keep(row[idx])]
+
+
+class _Cursor(object):
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def __iter__(self):
+        return self
+
+    def next(self):
+        return self.__next__()
+
+
+class SearchCursor(_Cursor):
+
+    def __init__(self, in_table, field_names, where_clause=None, spatial_reference=None,
+                 explode_to_points=False, sql_clause=(None, None)):
+
+        table = workspace.get(in_table)
+        if isinstance(field_names, str):
+            field_names = [f.strip() for f in field_names.split(';')] if field_names != '*' else [f.name for f in table.fields]
+        self.fields = tuple(field_names)
+        self._readers = _readers(table, field_names)
+        self._rows = iter(_where(table, _order(table, sql_clause), where_clause))
+
+    def __next__(self):
+        row = next(self._rows)
+        return tuple([read(row) for read in self._readers])
+
+    def reset(self):
+        raise NotImplementedError
+
+
+class UpdateCursor(_Cursor):
+
+    def __init__(self, in_table, field_names, where_clause=None, spatial_reference=None,
+                 explode_to_points=False, sql_clause=(None, None)):
+
+        self._table = workspace.get(in_table)
+        self.fields = tuple(field_names)
+        self._readers = _readers(self._table, field_names)
+        self._writers = _writers(self._table, field_names)
+        self._rows = iter(_where(self._table, _order(self._table, sql_clause), where_clause))
+        self._current = None
+        self._deleted = set()
+
+    def __next__(self):
+        self._current = next(self._rows)
+        return [read(self._current) for read in self._readers]
+
+    def updateRow(self, values):
+        row = self._current
+        for pos, idx, convert in self._writers:
+            row[idx] = convert(values[pos]) if convert else values[pos]
+
+    def deleteRow(self):
+        self._deleted.add(self._current[0])
+
+    def __exit__(self, *args):
+        if self._deleted:
+            self._table.rows = [row for row in self._table.rows if row[0] not in self._deleted]
+        return False
+
+
+class InsertCursor(object):
+
+    def __init__(self, in_table, field_names):
+
+        self._table = workspace.get(in_table)
+        self.fields = tuple(field_names)
+        self._writers = _writers(self._table, field_names)
+        self._width = len(self._table.fields) - 1
+
+    def insertRow(self, values):
+        row = [None] * self._width
+        for pos, idx, convert in self._writers:
+            row[idx - 1] = convert(values[pos]) if convert else values[pos]
+        return self._table.insert(row)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+class Editor(object):
+    '''Edits are applied straight away, the session only tracks state'''
+
+    def __init__(self, workspace_path):
+        self.workspace = workspace_path
+        self.isEditing = False
+
+    def startEditing(self, with_undo=True, multiuser_mode=True):
+        self.isEditing = True
+
+    def stopEditing(self, save_changes=True):
+        self.isEditing = False
+
+    def startOperation(self):
+        pass
+
+    def stopOperation(self):
+        pass
+
+    def abortOperation(self):
+        pass
+
+    def __enter__(self):
+        self.startEditing()
+        return self
+
+    def __exit__(self, *args):
+        self.stopEditing(args[0] is None)
+        return False
@@ -0,0 +1,189 @@
+'''
+ ____________________________________________________________________
+ Lawrenceville, GA
+_____________________________________________________________________
+
+   Program:    geometry.py
+   Purpose:    Point, Array, Polygon and PointGeometry stand-ins for the
+               fake arcpy package. Only what the update scripts and the
+               benchmarks read: iteration over parts, extent, centroids
+               and WKB.
+_____________________________________________________________________
+   History:     AG      10/2026     Created
+_____________________________________________________________________
+'''
+
+import struct
+
+
+class SpatialReference(object):
+
+    def __init__(self, item=None):
+        self.factoryCode = item if isinstance(item, int) else 0
+        self.name = str(item)
+
+
+class Extent(object):
+
+    def __init__(self, XMin=None, YMin=None, XMax=None, YMax=None):
+        self.XMin = XMin
+        self.YMin = YMin
+        self.XMax = XMax
+        self.YMax = YMax
+
+    @property
+    def width(self):
+        return self.XMax - self.XMin
+
+    @property
+    def height(self):
+        return self.YMax - self.YMin
+
+
+class Point(object):
+
+    __slots__ = ('X', 'Y', 'Z', 'M', 'ID')
+
+    def __init__(self, X=None, Y=None, Z=None, M=None, ID=None):
+        self.X = X
+        self.Y = Y
+        self.Z = Z
+        self.M = M
+        self.ID = ID
+
+
+class Array(list):
+    '''arcpy.Array, a list of Points or of Arrays of Points'''
+    pass
+
+
+def ringsExtent(rings):
+    xs = [x for ring in rings for x, y in ring]
+    ys = [y for ring in rings for x, y in ring]
+    return Extent(min(xs), min(ys), max(xs), max(ys))
+
+
+class Polygon(object):
+    '''Kept as a list of rings of (x, y) tuples, every ring is its own part'''
+
+    def __init__(self, inputs=None, spatial_reference=None):
+
+        self.spatialReference = spatial_reference
+        self.rings = []
+        if inputs:
+            parts = inputs if isinstance(inputs[0], list) else [inputs]
+            for part in parts:
+                ring = [(p.X, p.Y) for p in part if p is not None]
+                if ring and ring[0] != ring[-1]:
+                    ring.append(ring[0])
+                self.rings.append(ring)
+
+    @classmethod
+    def fromRings(cls, rings, spatial_reference=None):
+        geom = cls(None, spatial_reference)
+        geom.rings = rings
+        return geom
+
+    def __iter__(self):
+        for ring in self.rings:
+            yield Array(Point(x, y) for x, y in ring)
+
+    def getPart(self, index=None):
+        parts = list(self)
+        return Array(parts) if index is None else parts[index]
+
+    @property
+    def partCount(self):
+        return len(self.rings)
+
+    @property
+    def pointCount(self):
+        return sum(len(ring) for ring in self.rings)
+
+    @property
+    def extent(self):
+        return ringsExtent(self.rings)
+
+    @property
+    def area(self):
+        return sum(ringArea(ring) for ring in self.rings)
+
+    @property
+    def firstPoint(self):
+        x, y = self.rings[0][0]
+        return Point(x, y)
+
+    @property
+    def trueCentroid(self):
+        '''Area weighted center, may fall outside the polygon like arcpy's'''
+
+        sx = sy = total = 0.0
+        for ring in self.rings:
+            cx, cy, a = ringCentroid(ring)
+            sx += cx * a
+            sy += cy * a
+            total += a
+        if total == 0:
+            ext = self.extent
+            return Point((ext.XMin + ext.XMax) / 2.0, (ext.YMin + ext.YMax) / 2.0)
+        return Point(sx / total, sy / total)
+
+    @property
+    def centroid(self):
+        return self.trueCentroid
+
+    @property
+    def WKB(self):
+        data = [struct.pack('<BII', 1, 3, len(self.rings))]
+        for ring in self.rings:
+            data.append(struct.pack('<I', len(ring)))
+            data.append(struct.pack('<{}d'.format(len(ring) * 2), *[c for pnt in ring for c in pnt]))
+        return bytearray(b''.join(data))
+
+
+class PointGeometry(object):
+
+    def __init__(self, inputs, spatial_reference=None):
+        self.spatialReference = spatial_reference
+        self.x = inputs.X
+        self.y = inputs.Y
+
+    @property
+    def firstPoint(self):
+        return Point(self.x, self.y)
+
+    @property
+    def centroid(self):
+        return self.firstPoint
+
+    trueCentroid = centroid
+
+    @property
+    def extent(self):
+        return Extent(self.x, self.y, self.x, self.y)
+
+    @property
+    def WKB(self):
+        return bytearray(struct.pack('<BIdd', 1, 1, self.x, self.y))
+
+
+def ringArea(ring):
+    '''Unsigned shoelace area'''
+    return abs(ringCentroid(ring)[2])
+
+
+def ringCentroid(ring):
+    '''(cx, cy, signed area) of a closed ring'''
+
+    a = cx = cy = 0.0
+    for i in range(len(ring) - 1):
+        x1, y1 = ring[i]
+        x2, y2 = ring[i + 1]
+        cross = x1 * y2 - x2 * y1
+        a += cross
+        cx += (x1 + x2) * cross
+        cy += (y1 + y2) * cross
+    a /= 2.0
+    if a == 0:
+        return ring[0][0], ring[0][1], 0.0
+    return cx / (6.0 * a), cy / (6.0 * a), a
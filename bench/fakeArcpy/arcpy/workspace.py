@@ -0,0 +1,96 @@
+'''
+ ____________________________________________________________________
+ Lawrenceville, GA
+_____________________________________________________________________
+
+   Program:    workspace.py
+   Purpose:    In-memory tables behind the fake arcpy package. Every
+               feature class lives in one registry keyed by its short
+               name, so SDE paths like ...\sdeCity.GISADMIN.ParcelsAll
+               and fgdb paths like ...\working.gdb\ParcelsAll resolve
+               to the same table.
+_____________________________________________________________________
+   History:     AG      10/2026     Created
+_____________________________________________________________________
+'''
+
+tables = {}
+
+# arcpy field types by AddField_management type keyword
+field_types = {'TEXT': 'String', 'SHORT': 'SmallInteger', 'LONG': 'Integer', 'FLOAT': 'Single',
+               'DOUBLE': 'Double', 'DATE': 'Date', 'GUID': 'Guid'}
+
+
+class Field(object):
+
+    def __init__(self, name, type='String', length=255):
+        self.name = name
+        self.aliasName = name
+        self.baseName = name
+        self.type = type
+        self.length = length
+        self.editable = type != 'OID'
+        self.required = type in ('OID', 'Geometry')
+        self.isNullable = not self.required
+
+
+class Table(object):
+    '''
+    Rows are lists in field order. The shape is kept raw: (x, y) for
+    points, a list of rings of (x, y) tuples for polygons.
+    '''
+
+    def __init__(self, name, shape_type=None, spatial_reference=None):
+
+        self.name = name
+        self.shapeType = shape_type
+        self.spatialReference = spatial_reference
+        self.fields = [Field('OBJECTID', 'OID', 4)]
+        if shape_type:
+            self.fields.append(Field('SHAPE', 'Geometry', 0))
+        self.rows = []
+        self.next_oid = 1
+
+    def fieldIndex(self, name):
+        upper = name.upper()
+        for i, fld in enumerate(self.fields):
+            if fld.name.upper() == upper:
+                return i
+        raise RuntimeError('Cannot find field {} in {}'.format(name, self.name))
+
+    def addField(self, name, type='String', length=255):
+        self.fields.append(Field(name, type, length))
+        for row in self.rows:
+            row.append(None)
+
+    def insert(self, values):
+        '''values in field order without OBJECTID, returns the new OID'''
+
+        oid = self.next_oid
+        self.next_oid += 1
+        self.rows.append([oid] + list(values))
+        return oid
+
+
+def shortName(path):
+    '''Last path element without the database.owner. prefix'''
+
+    name = str(path).replace('/', '\\').rstrip('\\').split('\\')[-1]
+    return name.split('.')[-1]
+
+
+def get(path):
+
+    name = shortName(path)
+    if name not in tables:
+        raise RuntimeError('ERROR 000732: Dataset {} does not exist or is not supported'.format(path))
+    return tables[name]
+
+
+def add(table):
+    tables[table.name] = table
+    return table
+
+
+def clear():
+    tables.clear()
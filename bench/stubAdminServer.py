@@ -0,0 +1,157 @@
+'''
+ ____________________________________________________________________
+ Lawrenceville, GA
+_____________________________________________________________________
+
+   Program:    stubAdminServer.py
+   Purpose:    Local stand-in for the ArcGIS Server admin API used by
+               agsAdmin.py: generateToken, service start/stop/status.
+               Delays, hangs and failures can be injected to measure
+               publish-time latency and bounded calls.
+
+               python stubAdminServer.py [port]
+_____________________________________________________________________
+   History:     AG      10/2026     Created
+_____________________________________________________________________
+'''
+
+import json
+import socket
+import sys
+import threading
+import time
+
+try:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import urlparse, parse_qs
+except ImportError:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import urlparse, parse_qs
+
+
+class StubState(object):
+    '''Counters and injected behaviour shared by all handler threads'''
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.token_lifetime = 3600
+        self.delay = 0.0
+        self.hang = 0.0
+        self.fail_next = 0
+        self.start_lag = 0.0
+        self.services = {}
+        self.tokens = {}
+        self.counts = {}
+        self.connections = 0
+
+    def count(self, name):
+        with self.lock:
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+
+class StubHandler(BaseHTTPRequestHandler):
+
+    # keep-alive, like ArcGIS Server
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        # headers and body go out in separate writes
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.server.state.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, code, result):
+        body = json.dumps(result).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _params(self):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            params.update(parse_qs(self.rfile.read(length).decode('utf-8')))
+        return url.path, dict((k, v[0]) for k, v in params.items())
+
+    def do_GET(self):
+        self.do_POST()
+
+    def do_POST(self):
+
+        state = self.server.state
+        path, params = self._params()
+
+        if state.hang:
+            time.sleep(state.hang)
+        if state.delay:
+            time.sleep(state.delay)
+        with state.lock:
+            fail = state.fail_next > 0
+            if fail:
+                state.fail_next -= 1
+        if fail:
+            state.count('failed')
+            return self._send(503, {'status': 'error'})
+
+        if path == '/arcgis/admin/generateToken':
+            state.count('generateToken')
+            token = 'token{}'.format(len(state.tokens) + 1)
+            expires = time.time() + state.token_lifetime
+            state.tokens[token] = expires
+            return self._send(200, {'token': token, 'expires': int(expires * 1000)})
+
+        token = params.get('token')
+        if token not in state.tokens or state.tokens[token] < time.time():
+            state.count('badToken')
+            return self._send(200, {'status': 'error', 'code': 498, 'messages': ['Invalid token.']})
+
+        parts = path.rstrip('/').split('/')
+        action = parts[-1]
+        service = '/'.join(parts[4:-1])
+        state.count(action)
+        if action == 'stop':
+            state.services[service] = ('STOPPED', 0)
+        elif action == 'start':
+            state.services[service] = ('STARTED', time.time() + state.start_lag)
+        elif action == 'status':
+            current, ready = state.services.get(service, ('STARTED', 0))
+            if current == 'STARTED' and time.time() < ready:
+                current = 'STARTING'
+            return self._send(200, {'configuredState': current, 'realTimeState': current})
+        else:
+            return self._send(404, {'status': 'error'})
+        return self._send(200, {'status': 'success'})
+
+
+class StubAdminServer(ThreadingMixIn, HTTPServer):
+
+    daemon_threads = True
+
+    def __init__(self, port=0):
+        HTTPServer.__init__(self, ('127.0.0.1', port), StubHandler)
+        self.state = StubState()
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def startBackground(self):
+        thread = threading.Thread(target=self.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return thread
+
+
+if __name__ == '__main__':
+
+    server = StubAdminServer(int(sys.argv[1]) if len(sys.argv) > 1 else 6080)
+    print('stub admin server on http://127.0.0.1:{}'.format(server.port))
+    server.serve_forever()
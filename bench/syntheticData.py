@@ -0,0 +1,261 @@
+'''
+ ____________________________________________________________________
+ Lawrenceville, GA
+_____________________________________________________________________
+
+   Program:    syntheticData.py
+   Purpose:    Builds realistic county parcels, address points,
+               ServiceInfo points, route polygons and the service area
+               in the fake arcpy workspace (bench\fakeArcpy), using the
+               production table and field names. Scale is set by the
+               parcel count, 10k to 1M.
+
+               python syntheticData.py [parcels]     prints table sizes
+_____________________________________________________________________
+   History:     AG      10/2026     Created
+_____________________________________________________________________
+'''
+
+import os
+import sys
+import json
+import random
+
+bench_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(bench_dir, '..', 'script'))
+sys.path.insert(0, os.path.join(bench_dir, 'fakeArcpy'))
+import arcpy
+from arcpy import workspace
+
+lexicon_json = os.path.join(bench_dir, '..', 'supp', 'parsing_lists.json')
+
+# lot and block layout, feet
+lot_width = 80.0
+lot_depth = 150.0
+street_width = 60.0
+lots_per_block = 12
+
+# county share of parcels, west to east
+counties = [('Gwinnett', 0.7), ('Rockdale', 0.2), ('Walton', 0.1)]
+
+county_cities = {'Gwinnett': ['LAWRENCEVILLE', 'DULUTH', 'SNELLVILLE', 'BUFORD', 'DACULA', 'GRAYSON', 'LILBURN'],
+                 'Rockdale': ['CONYERS'],
+                 'Walton': ['LOGANVILLE', 'MONROE', 'SOCIAL CIRCLE']}
+county_zips = {'Gwinnett': ['30043', '30044', '30045', '30046', '30096', '30039', '30019'],
+               'Rockdale': ['30012', '30013', '30094'],
+               'Walton': ['30052', '30655', '30025']}
+
+street_roots = ['OAK', 'MAPLE', 'PINE', 'CEDAR', 'DOGWOOD', 'MAGNOLIA', 'HICKORY', 'WILLOW', 'BIRCH', 'POPLAR',
+                'SUGARLOAF', 'PIKE', 'CULVER', 'CLAYTON', 'PERRY', 'CROGAN', 'HURRICANE SHOALS', 'COLLINS HILL',
+                'HI HOPE', 'BUNCOMBE', 'JACKSON', 'NORTH CLAYTON', 'SCENIC', 'OLD NORCROSS', 'FIVE FORKS TRICKUM',
+                'ALCOVY', 'WINDER', 'SAINT ANDREWS', 'RIVER BEND', 'HIGHLAND']
+# common suffixes, plus long forms and USPS variants the parser has to handle
+street_types = ['ST', 'RD', 'DR', 'LN', 'CT', 'WAY', 'CIR', 'PKWY', 'TRL', 'HWY', 'PL', 'BLVD']
+street_type_variants = ['STREET', 'ROAD', 'DRIVE', 'LANE', 'COURT', 'CIRCLE', 'PARKWAY', 'TRAIL', 'CRCLE', 'PKY']
+
+services = [('WATER', 0.9), ('SEWER', 0.7), ('GARBAGE', 0.8), ('ELECTRIC', 0.6), ('GAS', 0.45),
+            ('STORMWATER FEE', 0.5), ('SECURITY LIGHTS', 0.05), ('SHD WTR', 0.02), ('SHD SWR', 0.02)]
+
+days = ['MONDAY', 'TUESDAY', 'WEDNESDAY', 'THURSDAY', 'FRIDAY']
+
+
+def table(name, shape_type, fields):
+    '''New fake feature class with (name, type) fields'''
+
+    fc = workspace.Table(name, shape_type)
+    for fld, fld_type in fields:
+        fc.addField(fld, fld_type, 255)
+    return workspace.add(fc)
+
+
+def lotRing(rng, x0, y0):
+    '''Lot rectangle with jittered corners and a mid-side vertex, closed'''
+
+    j = lambda: rng.uniform(-3.0, 3.0)
+    ring = [(x0 + j(), y0 + j()), (x0 + j(), y0 + lot_depth + j()),
+            (x0 + lot_width / 2.0, y0 + lot_depth + j()),
+            (x0 + lot_width + j(), y0 + lot_depth + j()), (x0 + lot_width + j(), y0 + j())]
+    ring.append(ring[0])
+    return ring
+
+
+def streetName(rng, row):
+    '''(predir, name, type, postdir) for the street of a block row'''
+
+    r = random.Random(row * 7919 + 17)
+    predir = r.choice(['N', 'S', 'E', 'W']) if r.random() < 0.1 else None
+    sttype = r.choice(street_type_variants) if r.random() < 0.15 else r.choice(street_types)
+    postdir = r.choice(['NE', 'NW', 'SE', 'SW']) if r.random() < 0.03 else None
+    return predir, r.choice(street_roots), sttype, postdir
+
+
+def streetAddress(rng, number, street, unit=None):
+
+    predir, name, sttype, postdir = street
+    parts = [str(number), predir, name, sttype, postdir]
+    if unit:
+        parts.extend([rng.choice(['APT', 'UNIT', 'STE']), str(unit)])
+    return ' '.join(p for p in parts if p)
+
+
+def parcelId(county, i):
+
+    if county == 'Gwinnett':
+        return 'R{:04d} {:03d}'.format(5000 + i // 1000, i % 1000)
+    if county == 'Rockdale':
+        return '{:04d}-{:02d}-{:03d}'.format(i // 100000, (i // 1000) % 100, i % 1000)
+    return 'C{:04d}-{:03d}'.format(i // 1000, i % 1000)
+
+
+def generate(parcel_count=10000, seed=1):
+    '''
+    Builds the county tables and the DataMining inputs in the fake
+    workspace. Returns {table name: row count}.
+    '''
+
+    rng = random.Random(seed)
+    workspace.clear()
+    with open(lexicon_json) as f:
+        city_list = json.load(f)['city_list']
+
+    import updateAddressesAll
+
+    county_parcels = dict((c, table(c + 'Parcels', 'Polygon', [(fld, 'String')]))
+                          for c, fld in [('Gwinnett', 'PIN'), ('Rockdale', 'PARCEL_NO'), ('Walton', 'Parcel_No')])
+    county_addresses = {'Gwinnett': table('GwinnettAddresses', 'Point', [('FULLADDR', 'String'), ('MUNICIPALITY', 'String'), ('ZIP5', 'String')]),
+                        'Rockdale': table('RockdaleAddresses', 'Point', [('ADDR', 'Integer'), ('Street_Nam', 'String'), ('City_Name', 'String')]),
+                        'Walton': table('WaltonAddresses', 'Point', [('ADDR', 'String'), ('Mail_City', 'String'), ('Zip_Code', 'String')])}
+    parcelsall = table('ParcelsAll', 'Polygon', [('Parcel_No', 'String'), ('Full_Address', 'String')])
+    addressesall = table('AddressesAll', 'Point', [('Full_Address', 'String')])
+    serviceinfo = table('ServiceInfo', 'Point', [('SvcName', 'String'), ('AcctNum', 'String'), ('CustClass', 'String')])
+
+    # blocks of two back-to-back lot rows with a street on each side
+    blocks_per_row = max(1, int((parcel_count / 2.0 / lots_per_block) ** 0.5))
+    lots_per_row = blocks_per_row * lots_per_block
+    width = lots_per_row * lot_width + blocks_per_row * street_width
+    rows = int(parcel_count / float(lots_per_row)) + 1
+    height = (rows // 2 + 1) * (2 * lot_depth + street_width)
+
+    # city limits in the middle of the area, the county line splits by x
+    area = (width * 0.2, height * 0.2, width * 0.8, height * 0.8)
+    county_breaks = []
+    edge = 0.0
+    for county, share in counties:
+        edge += share * width
+        county_breaks.append((edge, county))
+
+    account = 100000
+    for i in range(parcel_count):
+        row, col = divmod(i, lots_per_row)
+        x0 = col * lot_width + (col // lots_per_block) * street_width
+        y0 = (row // 2) * (2 * lot_depth + street_width) + (row % 2) * lot_depth
+        ring = lotRing(rng, x0, y0)
+        county = [c for edge, c in county_breaks if x0 < edge or c == 'Walton'][0]
+        parcel_no = parcelId(county, i)
+        county_parcels[county].insert([[ring], parcel_no])
+
+        cx = x0 + lot_width / 2.0
+        cy = y0 + lot_depth / 2.0
+        street = streetName(rng, row)
+        city = rng.choice(county_cities[county]) if rng.random() < 0.97 else rng.choice(city_list)
+        zipcode = rng.choice(county_zips[county])
+
+        # most lots have one address, a few have units, some none
+        roll = rng.random()
+        units = [None] if roll < 0.92 else ([] if roll < 0.95 else list(range(1, rng.randint(2, 6))))
+        number = 100 + (col % lots_per_block) * 10 + (row % 2) * 5 + 2 * (col // lots_per_block) * 100
+        first_address = None
+        for unit in units:
+            address = streetAddress(rng, number, street, unit)
+            xy = (cx + rng.uniform(-20, 20), cy + rng.uniform(-40, 40))
+            if county == 'Gwinnett':
+                values = [address, city if rng.random() > 0.01 else '<Null>', zipcode]
+                geo = {'geo_Address': values[0], 'geo_City': values[1], 'geo_Zip': values[2]}
+            elif county == 'Rockdale':
+                values = [number, address.split(' ', 1)[1], city]
+                geo = {'geo_Number': values[0], 'geo_Address': values[1], 'geo_City': values[2]}
+            else:
+                values = [address, city, zipcode]
+                geo = {'geo_Address': values[0], 'geo_City': values[1], 'geo_Zip': values[2]}
+            county_addresses[county].insert([xy] + values)
+            full = updateAddressesAll.buildFullAddress([geo.get(g) for g in updateAddressesAll.geo_fields])
+            addressesall.insert([xy, full])
+            first_address = first_address or full
+
+        parcelsall.insert([[ring], parcel_no, first_address])
+
+        # utility accounts inside city limits, one point per service
+        if area[0] < cx < area[2] and area[1] < cy < area[3] and rng.random() < 0.8:
+            accounts = [str(account)] if rng.random() < 0.9 else [str(account), str(account + 1)]
+            account += len(accounts)
+            custclass = 'RES' if rng.random() < 0.85 else 'COM'
+            for svc, share in services:
+                if rng.random() < share:
+                    xy = (cx + rng.uniform(-25, 25), cy + rng.uniform(-50, 50))
+                    serviceinfo.insert([xy, svc, rng.choice(accounts), custclass])
+
+    # service points in the street, matching no parcel
+    for i in range(len(serviceinfo.rows) // 50):
+        serviceinfo.insert([(rng.uniform(area[0], area[2]), 0.0), rng.choice(services)[0], str(account + i), 'RES'])
+
+    servicearea = table('CityUtilityServiceArea', 'Polygon', [('Name', 'String')])
+    servicearea.insert([[boxRing(*area)], 'City of Lawrenceville'])
+
+    # limb pickup in north-south strips, sanitation in east-west strips, recycling in quadrants
+    limb = table('LimbRoutes', 'Polygon', [('DOW', 'String')])
+    sanitation = table('SanitationRoutes', 'Polygon', [('DOW', 'String')])
+    recycle = table('RecycleRoutes', 'Polygon', [('Weekday', 'String'), ('Week', 'String')])
+    step_x = (area[2] - area[0]) / len(days)
+    step_y = (area[3] - area[1]) / len(days)
+    for i, day in enumerate(days):
+        limb.insert([[boxRing(area[0] + i * step_x, area[1], area[0] + (i + 1) * step_x, area[3])], day])
+        sanitation.insert([[boxRing(area[0], area[1] + i * step_y, area[2], area[1] + (i + 1) * step_y)], day])
+    mid_x = (area[0] + area[2]) / 2.0
+    mid_y = (area[1] + area[3]) / 2.0
+    for i, (x0, y0, x1, y1) in enumerate([(area[0], area[1], mid_x, mid_y), (mid_x, area[1], area[2], mid_y),
+                                          (area[0], mid_y, mid_x, area[3]), (mid_x, mid_y, area[2], area[3])]):
+        recycle.insert([[boxRing(x0, y0, x1, y1)], ['TUESDAY', 'THURSDAY'][i % 2], 'A' if i < 2 else 'B'])
+
+    # templates the prep functions copy
+    table('ParcelsHiperweb', 'Polygon', [(f, 'String') for f in hiperweb_fields])
+    table('UtilityParcels', 'Polygon', [(f, 'String') for f in utility_fields])
+
+    return dict((name, len(fc.rows)) for name, fc in sorted(workspace.tables.items()))
+
+
+# fields of the working copies, in cursor order
+hiperweb_fields = ['Parcel_No', 'Full_Address', 'Hiperweb_Address', 'StreetNumber', 'StreetName',
+                   'StreetType', 'PreDirection', 'PostDirection']
+utility_fields = ['Parcel_No', 'Full_Address', 'Electric', 'Garbage', 'Gas', 'Security_Lights', 'Sewer',
+                  'Stormwater', 'Water', 'Account', 'Customer_Classification', 'Limb_Pickup_Day',
+                  'Sanitation_Pickup_Day', 'Recycle_Pickup_Day', 'Recycle_Pickup_Week']
+
+
+def boxRing(x0, y0, x1, y1):
+    return [(x0, y0), (x0, y1), (x1, y1), (x1, y0), (x0, y0)]
+
+
+def workingCopy(source, name, fields, copy=None, where=None):
+    '''
+    Fresh copy of source as name with fields, the way the prep functions
+    leave their working fcs. Values of the copy fields (default all) come
+    from source, the rest start empty. where(row) filters source rows.
+    '''
+
+    src = workspace.get(source)
+    fc = table(name, src.shapeType, [(f, 'String') for f in fields])
+    src_idx = dict((fld.name.upper(), i) for i, fld in enumerate(src.fields))
+    copy = [c.upper() for c in (fields if copy is None else copy)]
+    picks = [src_idx.get(f.upper()) if f.upper() in copy else None for f in fields]
+    shp = src.fieldIndex('SHAPE')
+    for row in src.rows:
+        if where is None or where(row):
+            fc.insert([row[shp]] + [row[i] if i is not None else None for i in picks])
+    return name
+
+
+if __name__ == '__main__':
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    for name, rows in sorted(generate(count).items()):
+        print('{:<24} {:>9}'.format(name, rows))
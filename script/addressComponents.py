@@ -0,0 +1,71 @@
+'''
+ ____________________________________________________________________
+ Lawrenceville, GA
+_____________________________________________________________________
+
+   Program:    addressComponents.py
+   Purpose:    Street number and street of every address as loaded from
+               the county sources, keyed by the Full_Address built from
+               them. Written by updateAddressesAll.py; Full_Address is
+               what the ParcelsAll join carries, so updateHiperweb.py can
+               look the pieces up instead of splitting the string apart.
+_____________________________________________________________________
+   History:     AG      10/2026     Created
+_____________________________________________________________________
+'''
+
+import os
+import sqlite3
+import logging
+
+db_name = 'address_components.sqlite'
+
+
+class ComponentStore(object):
+    '''SQLite table of (Full_Address, number, street), the first record of a Full_Address wins'''
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+
+    def write(self, records):
+        '''Replaces the store with (Full_Address, number, street) records, returns the count kept'''
+
+        tmp_path = self.db_path + '.tmp'
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+        conn = sqlite3.connect(tmp_path)
+        try:
+            conn.execute('CREATE TABLE components (address TEXT PRIMARY KEY, number TEXT, street TEXT)')
+            conn.executemany('INSERT OR IGNORE INTO components VALUES (?, ?, ?)',
+                             ((address, None if number is None else u'{}'.format(number), street)
+                              for address, number, street in records))
+            conn.commit()
+            count = conn.execute('SELECT COUNT(*) FROM components').fetchone()[0]
+        finally:
+            conn.close()
+
+        # readers never see a half written store
+        if os.path.exists(self.db_path):
+            os.remove(self.db_path)
+        os.rename(tmp_path, self.db_path)
+
+        logging.info('{} address components saved'.format(count))
+        return count
+
+    def load(self):
+        '''{Full_Address: (number, street)}, empty when there is no store'''
+
+        if not os.path.exists(self.db_path):
+            logging.info('No address components at {}, every address is parsed'.format(self.db_path))
+            return {}
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            components = dict((row[0], (row[1], row[2]))
+                              for row in conn.execute('SELECT address, number, street FROM components'))
+        finally:
+            conn.close()
+
+        logging.info('{} address components loaded'.format(len(components)))
+        return components
@@ -0,0 +1,214 @@
+'''
+ ____________________________________________________________________
+ Lawrenceville, GA
+_____________________________________________________________________
+
+   Program:    addressParser.py
+   Purpose:    Splits a ParcelsAll Full_Address string into the Hiperweb
+               address components. Imported by updateHiperweb.py.
+_____________________________________________________________________
+   History:     AG      10/2026     Created from populateHiperweb
+                AG      10/2026     StreetType respelled through Lexicon.suffixes
+                AG      10/2026     Street parsing split out to parseStreet, parseParts
+                                    for addresses with ingest components
+                AG      10/2026     parseParallel parses in process inside a daemonic
+                                    pool worker (runPipeline.py waves) and when empty
+_____________________________________________________________________
+'''
+
+import re
+import json
+import multiprocessing
+
+# <Null> placeholders left behind when Full_Address was built from empty
+# county fields, and runs of spaces left behind once they are removed
+null_pattern = re.compile(r'<Nul\.?l>')
+space_pattern = re.compile(r' {2,}')
+
+
+class Lexicon(object):
+    '''
+    Lookup sets built once from parsing_lists.json. suffix_map respells
+    a street type (lexiconCompiler.py maps variants to the USPS standard),
+    types missing from it are written as found.
+    '''
+
+    def __init__(self, dir_list, subadd_list, city_list, sttype_list, suffix_map=None):
+
+        self.dirs = frozenset(dir_list)
+        self.subadds = frozenset(subadd_list)
+        self.sttypes = frozenset(sttype_list)
+        self.suffixes = dict(suffix_map or {})
+
+        # cities keyed by word count so "STONE MOUNTAIN" is one lookup
+        cities = {}
+        for city in city_list:
+            words = tuple(city.split(' '))
+            cities.setdefault(len(words), set()).add(words)
+        self.cities = dict((n, frozenset(words)) for n, words in cities.items())
+        self.city_lengths = sorted(self.cities)
+
+    def cityLength(self, address_list):
+        '''Returns the number of trailing words that make up a city, or 0'''
+
+        for n in self.city_lengths:
+            if len(address_list) < n:
+                break
+            tail = address_list[-n:]
+            # single word cities are checked upper case, as before
+            if n == 1:
+                tail = [tail[0].upper()]
+            if tuple(tail) in self.cities[n]:
+                return n
+        return 0
+
+
+def loadLexicon(json_path):
+    '''Reads parsing_lists.json and returns a Lexicon, street types as found'''
+
+    with open(json_path) as f:
+        json_array = json.load(f)
+
+    return Lexicon(json_array['dir_list'], json_array['subadd_list'],
+                   json_array['city_list'], json_array['sttype_list'])
+
+
+def cleanAddress(full_address):
+    '''Strips state, zip and <Null> placeholders from a Full_Address'''
+
+    address_split = full_address.split(' GA ', 2)
+    if len(address_split) > 2:
+        address = ' '.join(full_address.split(' ')[:-2])
+    else:
+        address = address_split[0]
+
+    address = null_pattern.sub('', address)
+    return space_pattern.sub(' ', address).strip()
+
+
+def parseAddress(full_address, lexicon):
+    '''
+    Parses a Full_Address string. Returns a tuple in UpdateCursor order:
+    (Hiperweb_Address, StreetNumber, StreetName, StreetType, PreDirection,
+    PostDirection). Components that are not found are None.
+    '''
+
+    if full_address is None:
+        return (None, None, None, None, None, None)
+
+    address = cleanAddress(full_address)
+    return (address,) + parseStreet(address, lexicon, True)
+
+
+def parseParts(full_address, number, street, lexicon):
+    '''
+    parseAddress output for a Full_Address whose number and street were
+    kept at ingest (addressComponents.py): only the street line is split,
+    there is no city, state or zip to find in it.
+    '''
+
+    street_line = u' '.join(u'{}'.format(x) for x in (number, street) if x is not None)
+    street_line = space_pattern.sub(' ', null_pattern.sub('', street_line)).strip()
+    return (cleanAddress(full_address),) + parseStreet(street_line, lexicon)
+
+
+def parseStreet(address, lexicon, has_city=False):
+    '''
+    (StreetNumber, StreetName, StreetType, PreDirection, PostDirection) of
+    a cleaned address, a trailing city is dropped first when has_city
+    '''
+
+    stnum = stname = sttype = predir = postdir = None
+
+    address_list = address.split(' ')
+
+    # clean up for 2430 Tucker Dr... GYST
+    if len(address_list) > 1 and address_list[1] == '-':
+        del(address_list[1:3])
+        address = ' '.join(address_list)
+
+    # removing text after comma, or text after subadd val, or removing city
+    if ',' in address:
+        address_list = address.split(',', 1)[0].strip().split(' ')
+    elif '-' in address:
+        address_list = address.split('-', 1)[0].strip().split(' ')
+    else:
+        address_list = address.split(' ')
+        subadds = lexicon.subadds
+        for i, s in enumerate(address_list):
+            if s in subadds:
+                del(address_list[i:])
+                break
+        else:
+            n = lexicon.cityLength(address_list) if has_city else 0
+            if n:
+                del(address_list[-n:])
+
+    # all invalid nulls, sub addresses, city, state, and zip info is removed!!
+
+    dirs = lexicon.dirs
+
+    if address_list and address_list[0].isdigit():
+        stnum = address_list.pop(0)
+
+    if address_list and address_list[0] in dirs:
+        predir = address_list.pop(0)
+
+    if address_list and address_list[-1] in dirs:
+        postdir = address_list[-1]
+        # list.remove drops the first match, kept for identical output
+        address_list.remove(postdir)
+
+    if address_list and address_list[0] == 'HWY':
+        stname = ' '.join(address_list[:2])
+    elif address_list and address_list[-1] in lexicon.sttypes:
+        sttype = address_list[-1]
+        address_list.remove(sttype)
+        stname = ' '.join(address_list)
+        sttype = lexicon.suffixes.get(sttype, sttype)
+    else:
+        stname = ' '.join(address_list)
+
+    return (stnum, stname, sttype, predir, postdir)
+
+
+# lexicon for pool workers, set once per process by _initWorker
+_worker_lexicon = None
+
+
+def _initWorker(lexicon):
+    global _worker_lexicon
+    _worker_lexicon = lexicon
+
+
+def _parseChunk(chunk):
+    return [(oid, parseAddress(address, _worker_lexicon)) for oid, address in chunk]
+
+
+def parseParallel(pairs, lexicon, workers, chunk_size=20000):
+    '''
+    Parses (OID, Full_Address) pairs on a pool of worker processes. Pairs are
+    sorted on OID and sent out as contiguous OID ranges of chunk_size rows.
+    Returns a dict of OID to parseAddress output. Parses in process when
+    already running in a daemonic pool worker, which cannot start a pool.
+    '''
+
+    if not pairs:
+        return {}
+    if multiprocessing.current_process().daemon:
+        return dict((oid, parseAddress(address, lexicon)) for oid, address in pairs)
+
+    pairs = sorted(pairs)
+    chunks = [pairs[i:i + chunk_size] for i in range(0, len(pairs), chunk_size)]
+
+    pool = multiprocessing.Pool(workers, _initWorker, (lexicon,))
+    try:
+        results = pool.map(_parseChunk, chunks, 1)
+    finally:
+        pool.close()
+        pool.join()
+
+    parsed = {}
+    for chunk in results:
+        parsed.update(chunk)
+    return parsed
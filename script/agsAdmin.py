@@ -0,0 +1,217 @@
+'''
+ ____________________________________________________________________
+ Lawrenceville, GA
+_____________________________________________________________________
+
+   Program:    agsAdmin.py
+   Purpose:    ArcGIS Server admin client for starting and stopping
+               services. Caches the token until shortly before it
+               expires, reuses keep-alive connections, and retries with
+               bounded backoff and timeouts. Imported by
+               updateUtilityParcels.py.
+_____________________________________________________________________
+   History:     AG      10/2026     Created from get_token and
+                                    serviceStartStop
+                AG      10/2026     Non-json responses retried and raised as AdminError
+_____________________________________________________________________
+'''
+
+import json
+import logging
+import socket
+import ssl
+import threading
+import time
+
+try:
+    import httplib
+    from urllib import urlencode
+except ImportError:
+    import http.client as httplib
+    from urllib.parse import urlencode
+
+# invalid or expired token codes returned in the json body
+token_errors = (498, 499)
+
+
+class AdminError(Exception):
+    pass
+
+
+class AdminClient(object):
+    '''
+    One client per server. Connections are kept per thread so pollStatus
+    can run next to start/stop calls; the token is shared between threads.
+    '''
+
+    def __init__(self, server, port, username, password, expiration=720, timeout=30,
+                 retries=3, backoff=1.0, max_backoff=10.0, scheme='https', context=None):
+
+        self.server = server
+        self.port = int(port)
+        self.username = username
+        self.password = password
+        self.expiration = expiration
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.scheme = scheme
+        self.context = context
+
+        # refresh the token this many seconds before it expires
+        self.token_margin = 60
+        self._token = None
+        self._token_expires = 0
+        self._token_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _connection(self):
+
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            if self.scheme == 'https':
+                conn = httplib.HTTPSConnection(self.server, self.port, timeout=self.timeout,
+                                               context=self.context or ssl.create_default_context())
+            else:
+                conn = httplib.HTTPConnection(self.server, self.port, timeout=self.timeout)
+            self._local.conn = conn
+        return conn
+
+    def _dropConnection(self):
+
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+        self._local.conn = None
+
+    def close(self):
+        self._dropConnection()
+
+    def _request(self, path, params, method='POST'):
+        '''Sends one request with retries, returns the decoded json'''
+
+        body = urlencode(params)
+        headers = {'Content-Type': 'application/x-www-form-urlencoded', 'Connection': 'keep-alive'}
+        if method == 'GET':
+            path = path + '?' + body
+            body = None
+
+        delay = self.backoff
+        for attempt in range(self.retries + 1):
+            try:
+                conn = self._connection()
+                conn.request(method, path, body, headers)
+                response = conn.getresponse()
+                # read the whole body so the connection can be reused
+                data = response.read()
+                if response.status >= 500:
+                    raise AdminError('HTTP {} from {}'.format(response.status, path))
+                # proxy error pages and cut off bodies are retried like a 5xx
+                try:
+                    return json.loads(data.decode('utf-8'))
+                except ValueError:
+                    raise AdminError('HTTP {} from {} is not json: {!r}'.format(response.status, path, data[:200]))
+
+            except (httplib.HTTPException, socket.error, socket.timeout, AdminError) as e:
+                self._dropConnection()
+                if attempt == self.retries:
+                    raise AdminError('{} failed after {} attempts: {}'.format(path, attempt + 1, e))
+                logging.info('{} failed ({}), retrying in {} seconds'.format(path, e, delay))
+                time.sleep(delay)
+                delay = min(delay * 2, self.max_backoff)
+
+    def token(self):
+        '''Cached token, generated again shortly before it expires'''
+
+        with self._token_lock:
+            if self._token and time.time() < self._token_expires - self.token_margin:
+                return self._token
+
+            logging.info("getting token")
+            result = self._request('/arcgis/admin/generateToken',
+                                   {'username': self.username, 'password': self.password,
+                                    'expiration': str(self.expiration), 'client': 'requestip', 'f': 'json'})
+            if not result or 'token' not in result:
+                raise AdminError('Failed to get token: {}'.format(result.get('messages') if result else result))
+
+            self._token = result['token']
+            # expires is epoch milliseconds
+            if 'expires' in result:
+                self._token_expires = int(result['expires']) / 1000.0
+            else:
+                self._token_expires = time.time() + self.expiration * 60
+            return self._token
+
+    def _adminCall(self, path, method='POST'):
+        '''Admin request with the cached token, one refresh if it was rejected'''
+
+        for attempt in range(2):
+            result = self._request(path, {'token': self.token(), 'f': 'json'}, method)
+            if result.get('code') in token_errors and attempt == 0:
+                with self._token_lock:
+                    self._token = None
+                continue
+            return result
+
+    def _servicePath(self, folder, service):
+        if folder:
+            return '/arcgis/admin/services/{}/{}'.format(folder, service)
+        return '/arcgis/admin/services/{}'.format(service)
+
+    def startService(self, folder, service):
+        logging.info("start service")
+        return self._adminCall(self._servicePath(folder, service) + '/start')
+
+    def stopService(self, folder, service):
+        logging.info("stop service")
+        return self._adminCall(self._servicePath(folder, service) + '/stop')
+
+    def status(self, folder, service):
+        return self._adminCall(self._servicePath(folder, service) + '/status', 'GET')
+
+    def pollStatus(self, folder, service, state, interval=2, timeout=120):
+        '''
+        Polls the service status on a background thread until realTimeState
+        equals state or the timeout passes. Returns a StatusPoll to wait on.
+        '''
+
+        poll = StatusPoll()
+
+        def run():
+            deadline = time.time() + timeout
+            try:
+                while True:
+                    result = self.status(folder, service)
+                    poll.result = result
+                    if result.get('realTimeState') == state:
+                        poll.reached = True
+                        break
+                    if time.time() + interval > deadline:
+                        break
+                    time.sleep(interval)
+            except Exception as e:
+                poll.error = e
+            finally:
+                self._dropConnection()
+                poll.done.set()
+
+        thread = threading.Thread(target=run)
+        thread.daemon = True
+        thread.start()
+        return poll
+
+
+class StatusPoll(object):
+    '''Handle returned by AdminClient.pollStatus'''
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.reached = False
+        self.result = None
+        self.error = None
+
+    def wait(self, timeout=None):
+        '''True once the requested state was reached'''
+        self.done.wait(timeout)
+        return self.reached
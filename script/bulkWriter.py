@@ -0,0 +1,151 @@
+'''
+ ____________________________________________________________________
+ Lawrenceville, GA
+_____________________________________________________________________
+
+   Program:    bulkWriter.py
+   Purpose:    Batched inserts in place of Append_management. The field
+               mapping is checked once up front, then rows stream through
+               an InsertCursor in edit operations of batch_size rows, with
+               progress logged per batch. Imported by syncSDE.py and the
+               prep functions.
+_____________________________________________________________________
+   History:     AG      10/2026     Created
+_____________________________________________________________________
+'''
+
+import arcpy
+import time
+import logging
+
+# field types that can be written from each other
+type_groups = {'String': 'text', 'Guid': 'text', 'GlobalID': 'text',
+               'SmallInteger': 'int', 'Integer': 'int', 'OID': 'int',
+               'Single': 'float', 'Double': 'float',
+               'Date': 'date'}
+# source group: target groups it can be written to
+writable = {'text': ['text'],
+            'int': ['int', 'float', 'text'],
+            'float': ['float', 'text'],
+            'date': ['date', 'text']}
+
+
+class MappingError(Exception):
+    pass
+
+
+def validateMapping(source, target, mapping):
+    '''
+    Checks a [(target field, source field)] mapping once before any row is
+    written: both fields exist, the target is editable and the types are
+    compatible. SHAPE@ tokens pass through. Returns (source fields,
+    target fields), raises MappingError listing every problem.
+    '''
+
+    src_flds = dict((fld.name.upper(), fld) for fld in arcpy.ListFields(source))
+    tgt_flds = dict((fld.name.upper(), fld) for fld in arcpy.ListFields(target))
+
+    problems = []
+    for tgt, src in mapping:
+        if tgt.upper().startswith('SHAPE@') or src.upper().startswith('SHAPE@'):
+            continue
+        s = src_flds.get(src.upper())
+        t = tgt_flds.get(tgt.upper())
+        if s is None:
+            problems.append('{} not in {}'.format(src, source))
+        if t is None:
+            problems.append('{} not in {}'.format(tgt, target))
+        if s is None or t is None:
+            continue
+        if not t.editable:
+            problems.append('{} is not editable'.format(tgt))
+        s_group = type_groups.get(s.type)
+        t_group = type_groups.get(t.type)
+        if s_group is None or t_group not in writable[s_group]:
+            problems.append('{} ({}) cannot be written to {} ({})'.format(src, s.type, tgt, t.type))
+        elif t.type == 'String' and s.type == 'String' and s.length > t.length:
+            logging.info('{} is {} long, {} is {}: longer values will fail'.format(src, s.length, tgt, t.length))
+
+    if problems:
+        raise MappingError('Field mapping {} -> {}: {}'.format(source, target, '; '.join(problems)))
+
+    return [src for tgt, src in mapping], [tgt for tgt, src in mapping]
+
+
+class BulkWriter(object):
+    '''
+    Context manager around an InsertCursor. With an arcpy.da.Editor each
+    batch is its own edit operation; a failure aborts the open batch only.
+    '''
+
+    def __init__(self, target, fields, batch_size=1000, edit=None, label='Inserted'):
+
+        self.target = target
+        self.fields = fields
+        self.batch_size = batch_size
+        self.edit = edit
+        self.label = label
+        self.count = 0
+        self.batches = 0
+        self._cursor = None
+
+    def __enter__(self):
+        self._start = time.time()
+        self._open()
+        return self
+
+    def _open(self):
+        if self.edit:
+            self.edit.startOperation()
+        self._cursor = arcpy.da.InsertCursor(self.target, self.fields)
+
+    def _close(self):
+        del(self._cursor)
+        self._cursor = None
+        if self.edit:
+            self.edit.stopOperation()
+
+    def insertRow(self, row):
+        self._cursor.insertRow(row)
+        self.count += 1
+        if self.count % self.batch_size == 0:
+            self._close()
+            self._progress()
+            self._open()
+
+    def _progress(self):
+        self.batches += 1
+        elapsed = time.time() - self._start
+        logging.info('{} batch {}: {} rows, {:.0f} rows/s'.format(self.label, self.batches, self.count,
+                                                                   self.count / elapsed if elapsed else 0))
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self._close()
+            if self.count % self.batch_size:
+                self._progress()
+        else:
+            del(self._cursor)
+            self._cursor = None
+            if self.edit:
+                self.edit.abortOperation()
+        return False
+
+
+def appendRows(source, target, mapping, batch_size=10000, edit=None, where=None):
+    '''
+    Append replacement: validates [(target field, source field)] once and
+    streams the source rows into target, projected to its spatial
+    reference. Returns the number of rows written.
+    '''
+
+    src_fields, tgt_fields = validateMapping(source, target, mapping)
+    sr = arcpy.Describe(target).spatialReference
+
+    logging.info('Appending {} to {}...'.format(source, target))
+    with BulkWriter(target, tgt_fields, batch_size, edit, 'Appended') as writer:
+        with arcpy.da.SearchCursor(source, src_fields, where, sr) as scur:
+            for row in scur:
+                writer.insertRow(row)
+
+    return writer.count
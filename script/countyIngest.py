@@ -0,0 +1,121 @@
+'''
+ ____________________________________________________________________
+ Lawrenceville, GA
+_____________________________________________________________________
+
+   Program:    countyIngest.py
+   Purpose:    Loads the county sources of ParcelsAll and AddressesAll
+               side by side. The county list and each county's field
+               mapping come from counties.json; each county is read by
+               its own worker process into a partition in its own fgdb
+               (partitions\<County>.gdb, one writer per fgdb), then the
+               partitions are merged into the working feature class in
+               config order. A new county is a new json entry and runs
+               alongside the others.
+_____________________________________________________________________
+   History:     AG      10/2026     Created
+                AG      10/2026     Workers log to the run's log file, merge
+                                    fields from every county's mapping
+_____________________________________________________________________
+'''
+
+import arcpy
+import os
+import json
+import logging
+import multiprocessing
+
+import bulkWriter
+
+
+def loadCounties(path, layer):
+    '''
+    [(county, source fc name, {target field: source field})] for layer
+    ('parcels' or 'addresses') of every county in the json that has one
+    '''
+
+    with open(path) as f:
+        counties = json.load(f)['counties']
+    return [(c['name'], c[layer]['fc'], c[layer]['fields']) for c in counties if layer in c]
+
+
+def sourcePath(fds, fc):
+    '''Source feature class of a county in the ExternalData feature dataset'''
+
+    return fds + r'\sdeCity.GISADMIN.' + fc
+
+
+def partitionFor(folder, county, template, name):
+    '''
+    Empty partition of county shaped like template, in the county's own
+    fgdb under folder\\partitions. Returns its path.
+    '''
+
+    partition_fldr = folder + r'\partitions'
+    if not os.path.exists(partition_fldr):
+        os.makedirs(partition_fldr)
+    gdb = partition_fldr + '\\' + county + '.gdb'
+    if not arcpy.Exists(gdb):
+        arcpy.CreateFileGDB_management(partition_fldr, county + '.gdb')
+
+    out = gdb + '\\' + name
+    if arcpy.Exists(out):
+        arcpy.Delete_management(out)
+    desc = arcpy.Describe(template)
+    arcpy.CreateFeatureclass_management(gdb, name, desc.shapeType.upper(), template, spatial_reference=desc.spatialReference)
+    return out
+
+
+def mergeFields(sources):
+    '''SHAPE@ and every target field mapped by any county in sources'''
+
+    return ['SHAPE@'] + sorted(set().union(*[fields.keys() for county, fc, fields in sources]))
+
+
+def _initWorker(logfile, log_format, log_datefmt):
+
+    if logfile:
+        logging.basicConfig(filename=logfile, level=logging.INFO, format=log_format, datefmt=log_datefmt)
+
+
+def _logConfig():
+    '''(file, format, date format) of the run's log file handler, Nones when not logging to a file'''
+
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, logging.FileHandler):
+            return handler.baseFilename, handler.formatter._fmt, handler.formatter.datefmt
+    return None, None, None
+
+
+def ingest(func, tasks, workers=None):
+    '''
+    func(task) for every county task, one worker process per county up to
+    workers (all counties when None, in process when 1). func returns
+    (partition, rows, ...) and must be importable by the workers. Results
+    come back in task order. Workers log to the caller's log file. Runs in
+    process inside a pool worker.
+    '''
+
+    workers = min(workers or len(tasks), len(tasks))
+    # a stage already running in a runPipeline worker cannot start a pool
+    if workers <= 1 or multiprocessing.current_process().daemon:
+        return [func(task) for task in tasks]
+
+    # arcpy is not thread safe, counties load in separate processes
+    pool = multiprocessing.Pool(workers, _initWorker, _logConfig())
+    try:
+        return pool.map(func, tasks, 1)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def merge(partitions, target, fields):
+    '''Appends each partition into target in order, returns the rows merged'''
+
+    mapping = [(fld, fld) for fld in fields]
+    count = 0
+    for partition in partitions:
+        count += bulkWriter.appendRows(partition, target, mapping)
+    logging.info('{} rows merged from {} partitions'.format(count, len(partitions)))
+    return count
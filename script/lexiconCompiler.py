@@ -0,0 +1,171 @@
+'''
+ ____________________________________________________________________
+ Lawrenceville, GA
+_____________________________________________________________________
+
+   Program:    lexiconCompiler.py
+   Purpose:    Compiles parsing_lists.json into a pickled Lexicon next
+               to it (parsing_lists.lexicon): frozen lookup sets, the
+               city matcher keyed by word count and a variant to USPS
+               standard suffix map (Publication 28, Appendix C1) so
+               StreetType is written in one spelling. The artifact is
+               rebuilt when the json changes or artifact_format is bumped.
+               Imported by updateHiperweb.py.
+
+               python lexiconCompiler.py [parsing_lists.json]
+_____________________________________________________________________
+   History:     AG      10/2026     Created
+_____________________________________________________________________
+'''
+
+import os
+import sys
+import json
+import pickle
+import logging
+
+import addressParser
+import parseCache
+
+# bump when the Lexicon layout or the suffix table below changes
+artifact_format = 1
+
+# USPS standard suffix: primary name and common abbreviations
+usps_suffixes = {
+    'ALY': ['ALLEE', 'ALLEY', 'ALLY', 'ALY'], 'ANX': ['ANEX', 'ANNEX', 'ANNX', 'ANX'], 'ARC': ['ARC', 'ARCADE'],
+    'AVE': ['AV', 'AVE', 'AVEN', 'AVENU', 'AVENUE', 'AVN', 'AVNUE'], 'BYU': ['BAYOO', 'BAYOU'], 'BCH': ['BCH', 'BEACH'],
+    'BND': ['BEND', 'BND'], 'BLF': ['BLF', 'BLUF', 'BLUFF'], 'BLFS': ['BLUFFS'], 'BTM': ['BOT', 'BTM', 'BOTTM', 'BOTTOM'],
+    'BLVD': ['BLVD', 'BOUL', 'BOULEVARD', 'BOULV'], 'BR': ['BR', 'BRNCH', 'BRANCH'], 'BRG': ['BRDGE', 'BRG', 'BRIDGE'],
+    'BRK': ['BRK', 'BROOK'], 'BRKS': ['BROOKS'], 'BG': ['BURG'], 'BGS': ['BURGS'],
+    'BYP': ['BYP', 'BYPA', 'BYPAS', 'BYPASS', 'BYPS'], 'CP': ['CAMP', 'CP', 'CMP'], 'CYN': ['CANYN', 'CANYON', 'CNYN'],
+    'CPE': ['CAPE', 'CPE'], 'CSWY': ['CAUSEWAY', 'CAUSWA', 'CSWY'],
+    'CTR': ['CEN', 'CENT', 'CENTER', 'CENTR', 'CENTRE', 'CNTER', 'CNTR', 'CTR'], 'CTRS': ['CENTERS'],
+    'CIR': ['CIR', 'CIRC', 'CIRCL', 'CIRCLE', 'CRCL', 'CRCLE'], 'CIRS': ['CIRCLES'], 'CLF': ['CLF', 'CLIFF'],
+    'CLFS': ['CLFS', 'CLIFFS'], 'CLB': ['CLB', 'CLUB'], 'CMN': ['COMMON'], 'CMNS': ['COMMONS'], 'COR': ['COR', 'CORNER'],
+    'CORS': ['CORNERS', 'CORS'], 'CRSE': ['COURSE', 'CRSE'], 'CT': ['COURT', 'CT'], 'CTS': ['COURTS', 'CTS'],
+    'CV': ['COVE', 'CV'], 'CVS': ['COVES'], 'CRK': ['CREEK', 'CRK'], 'CRES': ['CRESCENT', 'CRES', 'CRSENT', 'CRSNT'],
+    'CRST': ['CREST'], 'XING': ['CROSSING', 'CRSSNG', 'XING'], 'XRD': ['CROSSROAD'], 'XRDS': ['CROSSROADS'],
+    'CURV': ['CURVE'], 'DL': ['DALE', 'DL'], 'DM': ['DAM', 'DM'], 'DV': ['DIV', 'DIVIDE', 'DV', 'DVD'],
+    'DR': ['DR', 'DRIV', 'DRIVE', 'DRV'], 'DRS': ['DRIVES'], 'EST': ['EST', 'ESTATE'], 'ESTS': ['ESTATES', 'ESTS'],
+    'EXPY': ['EXP', 'EXPR', 'EXPRESS', 'EXPRESSWAY', 'EXPW', 'EXPY'], 'EXT': ['EXT', 'EXTENSION', 'EXTN', 'EXTNSN'],
+    'EXTS': ['EXTENSIONS', 'EXTS'], 'FALL': ['FALL'], 'FLS': ['FALLS', 'FLS'], 'FRY': ['FERRY', 'FRRY', 'FRY'],
+    'FLD': ['FIELD', 'FLD'], 'FLDS': ['FIELDS', 'FLDS'], 'FLT': ['FLAT', 'FLT'], 'FLTS': ['FLATS', 'FLTS'],
+    'FRD': ['FORD', 'FRD'], 'FRDS': ['FORDS'], 'FRST': ['FOREST', 'FORESTS', 'FRST'], 'FRG': ['FORG', 'FORGE', 'FRG'],
+    'FRGS': ['FORGES'], 'FRK': ['FORK', 'FRK'], 'FRKS': ['FORKS', 'FRKS'], 'FT': ['FORT', 'FRT', 'FT'],
+    'FWY': ['FREEWAY', 'FREEWY', 'FRWAY', 'FRWY', 'FWY'], 'GDN': ['GARDEN', 'GARDN', 'GRDEN', 'GRDN'],
+    'GDNS': ['GARDENS', 'GDNS', 'GRDNS'], 'GTWY': ['GATEWAY', 'GATEWY', 'GATWAY', 'GTWAY', 'GTWY'],
+    'GLN': ['GLEN', 'GLN'], 'GLNS': ['GLENS'], 'GRN': ['GREEN', 'GRN'], 'GRNS': ['GREENS'],
+    'GRV': ['GROV', 'GROVE', 'GRV'], 'GRVS': ['GROVES'], 'HBR': ['HARB', 'HARBOR', 'HARBR', 'HBR', 'HRBOR'],
+    'HBRS': ['HARBORS'], 'HVN': ['HAVEN', 'HVN'], 'HTS': ['HEIGHTS', 'HT', 'HTS'],
+    'HWY': ['HIGHWAY', 'HIGHWY', 'HIWAY', 'HIWY', 'HWAY', 'HWY'], 'HL': ['HILL', 'HL'], 'HLS': ['HILLS', 'HLS'],
+    'HOLW': ['HLLW', 'HOLLOW', 'HOLLOWS', 'HOLW', 'HOLWS'], 'INLT': ['INLET', 'INLT'], 'IS': ['IS', 'ISLAND', 'ISLND'],
+    'ISS': ['ISLANDS', 'ISLNDS', 'ISS'], 'ISLE': ['ISLE', 'ISLES'],
+    'JCT': ['JCT', 'JCTION', 'JCTN', 'JUNCTION', 'JUNCTN', 'JUNCTON'], 'JCTS': ['JCTNS', 'JCTS', 'JUNCTIONS'],
+    'KY': ['KEY', 'KY'], 'KYS': ['KEYS', 'KYS'], 'KNL': ['KNL', 'KNOL', 'KNOLL'], 'KNLS': ['KNLS', 'KNOLLS'],
+    'LK': ['LK', 'LAKE'], 'LKS': ['LKS', 'LAKES'], 'LAND': ['LAND'], 'LNDG': ['LANDING', 'LNDG', 'LNDNG'],
+    'LN': ['LANE', 'LN'], 'LGT': ['LGT', 'LIGHT'], 'LGTS': ['LIGHTS'], 'LF': ['LF', 'LOAF'], 'LCK': ['LCK', 'LOCK'],
+    'LCKS': ['LCKS', 'LOCKS'], 'LDG': ['LDG', 'LDGE', 'LODG', 'LODGE'], 'LOOP': ['LOOP', 'LOOPS'], 'MALL': ['MALL'],
+    'MNR': ['MNR', 'MANOR'], 'MNRS': ['MANORS', 'MNRS'], 'MDW': ['MEADOW'], 'MDWS': ['MDW', 'MDWS', 'MEADOWS', 'MEDOWS'],
+    'MEWS': ['MEWS'], 'ML': ['MILL'], 'MLS': ['MILLS'], 'MSN': ['MISSION', 'MISSN', 'MSSN'], 'MTWY': ['MOTORWAY'],
+    'MT': ['MNT', 'MT', 'MOUNT'], 'MTN': ['MNTAIN', 'MNTN', 'MOUNTAIN', 'MOUNTIN', 'MTIN', 'MTN'],
+    'MTNS': ['MNTNS', 'MOUNTAINS'], 'NCK': ['NCK', 'NECK'], 'ORCH': ['ORCH', 'ORCHARD', 'ORCHRD'],
+    'OVAL': ['OVAL', 'OVL'], 'OPAS': ['OVERPASS'], 'PARK': ['PARK', 'PRK', 'PARKS'],
+    'PKWY': ['PARKWAY', 'PARKWY', 'PKWAY', 'PKWY', 'PKY', 'PARKWAYS', 'PKWYS'], 'PASS': ['PASS'], 'PSGE': ['PASSAGE'],
+    'PATH': ['PATH', 'PATHS'], 'PIKE': ['PIKE', 'PIKES'], 'PNE': ['PINE'], 'PNES': ['PINES', 'PNES'],
+    'PL': ['PL', 'PLACE'], 'PLN': ['PLAIN', 'PLN'], 'PLNS': ['PLAINS', 'PLNS'], 'PLZ': ['PLAZA', 'PLZ', 'PLZA'],
+    'PT': ['POINT', 'PT'], 'PTS': ['POINTS', 'PTS'], 'PRT': ['PORT', 'PRT'], 'PRTS': ['PORTS', 'PRTS'],
+    'PR': ['PR', 'PRAIRIE', 'PRR'], 'RADL': ['RAD', 'RADIAL', 'RADIEL', 'RADL'], 'RAMP': ['RAMP'],
+    'RNCH': ['RANCH', 'RANCHES', 'RNCH', 'RNCHS'], 'RPD': ['RAPID', 'RPD'], 'RPDS': ['RAPIDS', 'RPDS'],
+    'RST': ['REST', 'RST'], 'RDG': ['RDG', 'RDGE', 'RIDGE'], 'RDGS': ['RDGS', 'RIDGES'],
+    'RIV': ['RIV', 'RIVER', 'RVR', 'RIVR'], 'RD': ['RD', 'ROAD'], 'RDS': ['ROADS', 'RDS'], 'RTE': ['ROUTE'],
+    'ROW': ['ROW'], 'RUE': ['RUE'], 'RUN': ['RUN'], 'SHL': ['SHL', 'SHOAL'], 'SHLS': ['SHLS', 'SHOALS'],
+    'SHR': ['SHOAR', 'SHORE', 'SHR'], 'SHRS': ['SHOARS', 'SHORES', 'SHRS'], 'SKWY': ['SKYWAY'],
+    'SPG': ['SPG', 'SPNG', 'SPRING', 'SPRNG'], 'SPGS': ['SPGS', 'SPNGS', 'SPRINGS', 'SPRNGS'], 'SPUR': ['SPUR', 'SPURS'],
+    'SQ': ['SQ', 'SQR', 'SQRE', 'SQU', 'SQUARE'], 'SQS': ['SQRS', 'SQUARES'], 'STA': ['STA', 'STATION', 'STATN', 'STN'],
+    'STRA': ['STRA', 'STRAV', 'STRAVEN', 'STRAVENUE', 'STRAVN', 'STRVN', 'STRVNUE'],
+    'STRM': ['STREAM', 'STREME', 'STRM'], 'ST': ['STREET', 'STRT', 'ST', 'STR'], 'STS': ['STREETS'],
+    'SMT': ['SMT', 'SUMIT', 'SUMITT', 'SUMMIT'], 'TER': ['TER', 'TERR', 'TERRACE'], 'TRWY': ['THROUGHWAY'],
+    'TRCE': ['TRACE', 'TRACES', 'TRCE'], 'TRAK': ['TRACK', 'TRACKS', 'TRAK', 'TRK', 'TRKS'], 'TRFY': ['TRAFFICWAY'],
+    'TRL': ['TRAIL', 'TRAILS', 'TRL', 'TRLS'], 'TRLR': ['TRAILER', 'TRLR', 'TRLRS'],
+    'TUNL': ['TUNEL', 'TUNL', 'TUNLS', 'TUNNEL', 'TUNNELS', 'TUNNL'], 'TPKE': ['TRNPK', 'TURNPIKE', 'TURNPK'],
+    'UPAS': ['UNDERPASS'], 'UN': ['UN', 'UNION'], 'UNS': ['UNIONS'], 'VLY': ['VALLEY', 'VALLY', 'VLLY', 'VLY'],
+    'VLYS': ['VALLEYS', 'VLYS'], 'VIA': ['VDCT', 'VIA', 'VIADCT', 'VIADUCT'], 'VW': ['VIEW', 'VW'],
+    'VWS': ['VIEWS', 'VWS'], 'VLG': ['VILL', 'VILLAG', 'VILLAGE', 'VILLG', 'VILLIAGE', 'VLG'],
+    'VLGS': ['VILLAGES', 'VLGS'], 'VL': ['VILLE', 'VL'], 'VIS': ['VIS', 'VIST', 'VISTA', 'VST', 'VSTA'],
+    'WALK': ['WALK', 'WALKS'], 'WALL': ['WALL'], 'WAY': ['WY', 'WAY'], 'WAYS': ['WAYS'], 'WL': ['WELL'],
+    'WLS': ['WELLS', 'WLS']}
+
+
+def suffixMap(sttype_list):
+    '''Variant to USPS standard for every suffix in sttype_list, unknown ones map to themselves'''
+
+    standard = {}
+    for canonical, variants in usps_suffixes.items():
+        for variant in variants:
+            standard[variant] = canonical
+    # a standard form is never respelled, USPS lists MDW under MEADOWS too
+    for canonical in usps_suffixes:
+        standard[canonical] = canonical
+
+    mapping = {}
+    for sttype in sttype_list:
+        if sttype not in standard:
+            logging.info('{} is not a USPS suffix, kept as is'.format(sttype))
+        mapping[sttype] = standard.get(sttype, sttype)
+    return mapping
+
+
+def compileLexicon(json_path):
+    '''Lexicon with suffix map from parsing_lists.json'''
+
+    with open(json_path) as f:
+        json_array = json.load(f)
+
+    return addressParser.Lexicon(json_array['dir_list'], json_array['subadd_list'], json_array['city_list'],
+                                 json_array['sttype_list'], suffixMap(json_array['sttype_list']))
+
+
+def artifactPath(json_path):
+    return os.path.splitext(json_path)[0] + '.lexicon'
+
+
+def loadLexicon(json_path, artifact_path=None):
+    '''
+    Returns (Lexicon, digest) for parsing_lists.json, from the compiled
+    artifact when it was built from the same json and artifact_format,
+    otherwise compiling and writing it first. The digest changes with
+    either, so results cached under it (parseCache.py) follow suit.
+    '''
+
+    artifact_path = artifact_path or artifactPath(json_path)
+    digest = '{}-{}'.format(parseCache.fileHash(json_path), artifact_format)
+
+    if os.path.exists(artifact_path):
+        try:
+            with open(artifact_path, 'rb') as f:
+                cached = pickle.load(f)
+            if cached['digest'] == digest:
+                return cached['lexicon'], digest
+            logging.info('{} is out of date, recompiling...'.format(artifact_path))
+        except Exception:
+            logging.info('{} unreadable, recompiling...'.format(artifact_path))
+
+    lexicon = compileLexicon(json_path)
+    tmp_path = artifact_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump({'digest': digest, 'lexicon': lexicon}, f, pickle.HIGHEST_PROTOCOL)
+    if os.path.exists(artifact_path):
+        os.remove(artifact_path)
+    os.rename(tmp_path, artifact_path)
+
+    return lexicon, digest
+
+
+if __name__ == '__main__':
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+    json_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                                  '..', 'supp', 'parsing_lists.json')
+    lexicon, digest = loadLexicon(json_path)
+    print('{} {} suffixes to {} standard forms'.format(artifactPath(json_path), len(lexicon.suffixes),
+                                                       len(set(lexicon.suffixes.values()))))
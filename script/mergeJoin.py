@@ -0,0 +1,72 @@
+'''
+ ____________________________________________________________________
+ Lawrenceville, GA
+_____________________________________________________________________
+
+   Program:    mergeJoin.py
+   Purpose:    Writes join output (SpatialJoin TARGET_FID rows) back to
+               the join target in one pass with constant memory: the join
+               table is read sorted on its key and the target's
+               UpdateCursor sorted on OBJECTID, and the two streams are
+               merged like a sorted merge join. Replaces the lookup dicts
+               built per hard-coded OID slice.
+_____________________________________________________________________
+   History:     AG      10/2026     Created
+_____________________________________________________________________
+'''
+
+import arcpy
+import logging
+
+
+def _sortedRows(table, fields, key):
+    '''Rows of table with key first, in ascending key order'''
+
+    last = None
+    with arcpy.da.SearchCursor(table, [key] + fields, sql_clause=(None, 'ORDER BY {}'.format(key))) as scur:
+        for row in scur:
+            if row[0] is None:
+                continue
+            if last is not None and row[0] < last:
+                raise RuntimeError('{} is not sorted on {}'.format(table, key))
+            last = row[0]
+            yield row
+
+
+def mergeUpdate(target, fields, join_table, key, join_fields):
+    '''
+    Sets fields of each target row to join_fields of the join_table row
+    whose key is the target OID. Target rows with no join row are left
+    alone; the first join row of a repeated key wins. Only rows whose
+    values change are written. Returns (rows read, rows written).
+    '''
+
+    oid = arcpy.Describe(target).OIDFieldName
+    join_rows = _sortedRows(join_table, join_fields, key)
+    jrow = next(join_rows, None)
+    joined = 1 if jrow is not None else 0
+
+    targets = 0
+    written = 0
+    last = None
+    with arcpy.da.UpdateCursor(target, ['OID@'] + fields, sql_clause=(None, 'ORDER BY {}'.format(oid))) as ucur:
+        for urow in ucur:
+            targets += 1
+            if last is not None and urow[0] < last:
+                raise RuntimeError('{} is not sorted on {}'.format(target, oid))
+            last = urow[0]
+
+            # skip join rows of target rows already passed, and repeats
+            while jrow is not None and jrow[0] < urow[0]:
+                jrow = next(join_rows, None)
+                joined += jrow is not None
+            if jrow is None or jrow[0] != urow[0]:
+                continue
+
+            values = list(jrow[1:])
+            if list(urow[1:]) != values:
+                ucur.updateRow([urow[0]] + values)
+                written += 1
+
+    logging.info('{} of {} rows updated'.format(written, targets))
+    return targets + joined, written
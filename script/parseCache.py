@@ -0,0 +1,125 @@
+'''
+ ____________________________________________________________________
+ Lawrenceville, GA
+_____________________________________________________________________
+
+   Program:    parseCache.py
+   Purpose:    SQLite cache of parsed Hiperweb addresses so unchanged
+               Full_Address values are not re-parsed on every run.
+               Imported by updateHiperweb.py.
+_____________________________________________________________________
+   History:     AG      10/2026     Created
+_____________________________________________________________________
+'''
+
+import sqlite3
+import hashlib
+import logging
+import time
+
+import addressParser
+
+
+def fileHash(path):
+    '''md5 of a file, used to tie cached results to one lexicon'''
+
+    md5 = hashlib.md5()
+    with open(path, 'rb') as f:
+        md5.update(f.read())
+    return md5.hexdigest()
+
+
+class ParseCache(object):
+    '''
+    Parsed components keyed by Full_Address and the lexicon hash. The key is
+    the Full_Address text as stored; the parser is whitespace sensitive so
+    no further normalizing is done. Rows for any other lexicon hash are
+    evicted on open, and rows not used for max_age_days are evicted on close.
+    '''
+
+    def __init__(self, db_path, lexicon, lexicon_hash, max_age_days=90):
+
+        self.db_path = db_path
+        self.lexicon = lexicon
+        self.lexicon_hash = lexicon_hash
+        self.max_age = max_age_days * 86400
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self.cached = {}
+        self.used = set()
+        self.new = {}
+        self.conn = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        # only save results from a clean run
+        self.close(exc_type is None)
+
+    def open(self):
+
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute('''CREATE TABLE IF NOT EXISTS parsed (
+                             address TEXT, lexicon TEXT, hiperweb TEXT, stnum TEXT,
+                             stname TEXT, sttype TEXT, predir TEXT, postdir TEXT,
+                             last_used INTEGER, PRIMARY KEY (address, lexicon))''')
+
+        # lexicon json changed, nothing cached under the old hash is valid
+        cur = self.conn.execute('DELETE FROM parsed WHERE lexicon <> ?', (self.lexicon_hash,))
+        self.evicted += cur.rowcount
+        self.conn.commit()
+
+        rows = self.conn.execute('''SELECT address, hiperweb, stnum, stname, sttype, predir, postdir
+                                    FROM parsed WHERE lexicon = ?''', (self.lexicon_hash,))
+        self.cached = dict((row[0], tuple(row[1:])) for row in rows)
+        logging.info('{} parsed addresses in cache'.format(len(self.cached)))
+
+    def get(self, full_address):
+        '''Returns cached parseAddress output, or None on a miss'''
+
+        parsed = self.cached.get(full_address)
+        if parsed is not None:
+            self.used.add(full_address)
+        else:
+            parsed = self.new.get(full_address)
+
+        if parsed is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return parsed
+
+    def add(self, full_address, parsed):
+        self.new[full_address] = parsed
+
+    def parse(self, full_address):
+        '''Returns parseAddress output, from the cache when possible'''
+
+        parsed = self.get(full_address)
+        if parsed is None:
+            parsed = addressParser.parseAddress(full_address, self.lexicon)
+            self.add(full_address, parsed)
+        return parsed
+
+    def close(self, save=True):
+
+        if self.conn is None:
+            return
+
+        if save:
+            now = int(time.time())
+            self.conn.executemany('INSERT OR REPLACE INTO parsed VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                  ((k, self.lexicon_hash) + v + (now,) for k, v in self.new.items()))
+            self.conn.executemany('UPDATE parsed SET last_used = ? WHERE address = ? AND lexicon = ?',
+                                  ((now, k, self.lexicon_hash) for k in self.used))
+            cur = self.conn.execute('DELETE FROM parsed WHERE last_used < ?', (now - self.max_age,))
+            self.evicted += cur.rowcount
+            self.conn.commit()
+
+        self.conn.close()
+        self.conn = None
+
+        logging.info('Parse cache: {} hits, {} misses, {} evicted'.format(self.hits, self.misses, self.evicted))
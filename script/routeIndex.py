@@ -0,0 +1,120 @@
+'''
+ ____________________________________________________________________
+ Lawrenceville, GA
+_____________________________________________________________________
+
+   Program:    routeIndex.py
+   Purpose:    Assigns limb, sanitation and recycle route values to
+               utility parcels by parcel center in one cursor sweep.
+               Route polygons are indexed once and kept on disk until
+               a route layer changes. Imported by updateUtilityParcels.py.
+_____________________________________________________________________
+   History:     AG      10/2026     Created
+                AG      10/2026     Layer fingerprint from sourceFingerprint.py
+                AG      10/2026     Parcel rows reported to stageMetrics.py
+_____________________________________________________________________
+'''
+
+import arcpy
+import os
+import logging
+import pickle
+
+import sourceFingerprint
+import spatialIndex
+import stageMetrics
+
+
+def layerFingerprint(fc, value_fields):
+    '''
+    Row count, extent, max LAST_EDITED_DATE and hash of every row of a
+    route layer, they are small.
+    '''
+
+    return repr(sorted(sourceFingerprint.fingerprint(fc, sample=None).items()) + [value_fields])
+
+
+def buildRouteIndex(fc, value_fields):
+    '''PolygonIndex of a route layer, items are (OID, (values...))'''
+
+    idx = spatialIndex.PolygonIndex()
+    with arcpy.da.SearchCursor(fc, ['OID@', 'SHAPE@'] + value_fields) as scur:
+        for row in scur:
+            if row[1] is not None:
+                idx.insert(spatialIndex.ringsFromGeometry(row[1]), (row[0], tuple(row[2:])))
+    idx.build()
+    return idx
+
+
+def loadRouteIndexes(layers, cache_path):
+    '''
+    Returns {name: PolygonIndex} for layers given as
+    [(name, fc, value_fields, parcel_fields)], reusing cached indexes
+    whose layer fingerprint has not changed.
+    '''
+
+    cached = {}
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'rb') as f:
+                cached = pickle.load(f)
+        except Exception:
+            logging.info('Route index cache unreadable, rebuilding...')
+            cached = {}
+
+    indexes = {}
+    changed = False
+    for name, fc, value_fields, parcel_fields in layers:
+        fp = layerFingerprint(fc, value_fields)
+        if name in cached and cached[name][0] == fp:
+            logging.info('Using cached {} route index'.format(name))
+            indexes[name] = cached[name][1]
+        else:
+            logging.info('Building {} route index...'.format(name))
+            indexes[name] = buildRouteIndex(fc, value_fields)
+            cached[name] = (fp, indexes[name])
+            changed = True
+
+    if changed:
+        with open(cache_path, 'wb') as f:
+            pickle.dump(cached, f, pickle.HIGHEST_PROTOCOL)
+
+    return indexes
+
+
+def assignRoutes(parcels, layers, cache_path):
+    '''
+    Writes each layer's values to its parcel fields where the parcel center
+    falls in a route polygon, matching HAVE_THEIR_CENTER_IN. Centers are
+    computed once per parcel for all layers.
+    '''
+
+    indexes = loadRouteIndexes(layers, cache_path)
+
+    fields = ['SHAPE@TRUECENTROID']
+    slots = []
+    for name, fc, value_fields, parcel_fields in layers:
+        slots.append((indexes[name], len(fields), len(parcel_fields)))
+        fields.extend(parcel_fields)
+
+    counts = [0] * len(layers)
+    parcels_read = 0
+    logging.info('Assigning routes by parcel center...')
+    with arcpy.da.UpdateCursor(parcels, fields) as ucur:
+        for urow in ucur:
+            parcels_read += 1
+            xy = urow[0]
+            if not xy or xy[0] is None:
+                continue
+            for i, (idx, start, width) in enumerate(slots):
+                match = idx.firstContaining(xy[0], xy[1])
+                if match:
+                    urow[start:start + width] = match[1]
+                    counts[i] += 1
+            ucur.updateRow(urow)
+    stageMetrics.rows(read=parcels_read, written=parcels_read)
+
+    for (name, fc, value_fields, parcel_fields), count in zip(layers, counts):
+        logging.info('{} parcels in a {} route'.format(count, name))
+
+    return parcels
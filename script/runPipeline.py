@@ -0,0 +1,347 @@
+'''
+ ____________________________________________________________________
+ Lawrenceville, GA
+_____________________________________________________________________
+
+   Program:    runPipeline.py
+   Purpose:    Runs the AddressesAll, ParcelsAll, Hiperweb and
+               UtilityParcels updates as one dependency graph. Each stage
+               reads and posts to the database its own script does
+               (parent_cxn, sql_instance); stages on the same database
+               share one version and connection file. Working fgdb
+               outputs are passed downstream instead of being read back
+               from SDE when both stages are on the same database, and
+               Hiperweb and UtilityParcels run in parallel.
+
+               python runPipeline.py                  all stages
+               python runPipeline.py Hiperweb         one stage, inputs from SDE
+               python runPipeline.py Hiperweb --with-upstream
+               python runPipeline.py --force          ignore fingerprints
+               python runPipeline.py --resume         reuse stages a failed run completed
+_____________________________________________________________________
+   History:     AG      10/2026     Created
+                AG      10/2026     Stages whose inputs did not change and whose
+                                    upstream stages do not run are skipped
+                                    (sourceFingerprint.py), --force
+                AG      10/2026     Stages and reconcile timed with stageMetrics.py into each
+                                    stage's logs\metrics.jsonl
+                AG      10/2026     --scratch sets scratchWorkspace.py mode for every stage,
+                                    scratch datasets deleted after each stage
+                AG      10/2026     Shared version and connection file kept between runs
+                                    (versionManager.py)
+                AG      10/2026     Hiperweb reads address components from the AddressesAll folder
+                AG      10/2026     Stage outputs checkpointed against the stage's and its
+                                    upstream stages' fingerprints (stageCheckpoint.py), --resume
+                AG      10/2026     Connection and instance taken from each stage's script,
+                                    one version per database instead of one for all stages
+_____________________________________________________________________
+'''
+
+import arcpy
+import os
+import re
+import sys
+import argparse
+import multiprocessing
+from datetime import datetime
+import logging
+
+import addressComponents
+import scratchWorkspace
+import sourceFingerprint
+import stageCheckpoint
+import stageMetrics
+import syncSDE
+import versionManager
+import updateAddressesAll
+import updateParcelsAll
+import updateHiperweb
+import updateUtilityParcels
+
+# stage: upstream stages
+stages = {'AddressesAll': [],
+          'ParcelsAll': ['AddressesAll'],
+          'Hiperweb': ['ParcelsAll'],
+          'UtilityParcels': ['ParcelsAll']}
+
+modules = {'AddressesAll': updateAddressesAll,
+           'ParcelsAll': updateParcelsAll,
+           'Hiperweb': updateHiperweb,
+           'UtilityParcels': updateUtilityParcels}
+
+# inputs that are files written by a stage, by the stage that writes them
+stage_files = {'address_components': 'AddressesAll'}
+
+log_format = '%(levelname)s: %(asctime)s %(message)s'
+log_datefmt = '%m/%d/%Y %I:%M:%S'
+
+def stageDatabase(name):
+    '''(parent connection, SQL Server instance) of a stage, as its script has them'''
+
+    return modules[name].parent_cxn, modules[name].sql_instance
+
+def databaseStages(selected):
+    '''{(parent connection, instance): [stages]} of the selected stages'''
+
+    databases = {}
+    for name in sorted(selected):
+        databases.setdefault(stageDatabase(name), []).append(name)
+    return databases
+
+def ownerConnection(names):
+    '''Connection the stages' scripts delete their versions through'''
+
+    owners = set(modules[name].owner_cxn for name in names)
+    if len(owners) > 1:
+        raise ValueError('Stages {} delete versions through different connections: {}'.format(', '.join(names), ', '.join(sorted(owners))))
+    return owners.pop()
+
+def runStage(name, config, outputs):
+    '''
+    Runs one stage, upstream working outputs missing from outputs are read
+    from SDE. Outputs of stages on another database are not used, the
+    stage reads its own database like its script does.
+    '''
+
+    arcpy.env.overwriteOutput = True
+    version_cxn = config['version_cxns'][name]
+    parent_cxn = stageDatabase(name)[0]
+    folder = config['folders'][name]
+
+    for up in stages[name]:
+        if up in outputs and stageDatabase(up) != stageDatabase(name):
+            logging.info('{} reads {} from {}, not the {} output on {}'.format(
+                name, up, parent_cxn, up, stageDatabase(up)[1]))
+    outputs = dict((up, out) for up, out in outputs.items() if stageDatabase(up) == stageDatabase(name))
+
+    logging.info('Running stage {} on {}'.format(name, stageDatabase(name)[1]))
+    try:
+        with stageMetrics.job(name, folder):
+            checkpoints = checkpointStore(config, name, config.get('resume'))
+            if name == 'AddressesAll':
+                out = updateAddressesAll.runAddressesAll(version_cxn, folder, checkpoints=checkpoints)
+            elif name == 'ParcelsAll':
+                out = updateParcelsAll.runParcelsAll(version_cxn, folder, outputs.get('AddressesAll'), checkpoints=checkpoints)
+            elif name == 'Hiperweb':
+                out = updateHiperweb.runHiperweb(version_cxn, folder, outputs.get('ParcelsAll'),
+                                                 components_db=config['folders']['AddressesAll'] + '\\' + addressComponents.db_name,
+                                                 checkpoints=checkpoints)
+            elif name == 'UtilityParcels':
+                out = updateUtilityParcels.runUtilityParcels(version_cxn, parent_cxn, folder, outputs.get('ParcelsAll'),
+                                                             checkpoints=checkpoints)
+    finally:
+        # scratch intermediates of the stage are not read downstream
+        scratchWorkspace.cleanup()
+    logging.info('Finished stage {}'.format(name))
+
+    return(out)
+
+def _initWorker(lock, logfile, scratch_mode):
+
+    logging.basicConfig(filename=logfile, level=logging.INFO, format=log_format, datefmt=log_datefmt)
+    scratchWorkspace.mode = scratch_mode
+    # stages share the version, one edit session saves at a time
+    syncSDE.sde_lock = lock
+
+def _runWorker(args):
+    name, config, outputs = args
+    return(name, runStage(name, config, outputs))
+
+def selectStages(requested, with_upstream):
+    '''Stages to run: all when none are requested, plus their upstream stages when asked'''
+
+    if not requested:
+        return set(stages)
+
+    selected = set(requested)
+    if with_upstream:
+        todo = list(requested)
+        while todo:
+            for up in stages[todo.pop()]:
+                if up not in selected:
+                    selected.add(up)
+                    todo.append(up)
+    return selected
+
+def stageWaves(selected):
+    '''Groups the selected stages into waves whose upstream stages are all done'''
+
+    done = set()
+    waves = []
+    while len(done) < len(selected):
+        wave = sorted(s for s in selected if s not in done and all(up in done or up not in selected for up in stages[s]))
+        waves.append(wave)
+        done.update(wave)
+    return waves
+
+def fingerprintStore(config, name):
+    return sourceFingerprint.FingerprintStore(config['folders'][name] + r"\source_fingerprints.json")
+
+def changedStages(config, selected, force):
+    '''
+    Selected stages whose inputs changed since their last run or whose
+    upstream stage runs. Returns (stages to run, {stage: fingerprints}).
+    '''
+
+    run = set()
+    prints = {}
+    for wave in stageWaves(selected):
+        for name in wave:
+            inputs = modules[name].stageInputs(stageDatabase(name)[0], config['folders'][name])
+            changed, prints[name] = fingerprintStore(config, name).check(name, inputs)
+            upstream = [up for up in stages[name] if up in run]
+            if changed or upstream or force:
+                if upstream and not changed:
+                    logging.info('{}: upstream {} runs'.format(name, ', '.join(upstream)))
+                run.add(name)
+            else:
+                logging.info('Skipping {}, no inputs changed'.format(name))
+    return run, prints
+
+def checkpointStore(config, name, resume=False):
+    '''
+    Checkpoints of stage name, valid for the fingerprints of the stage and
+    of its upstream stages: a stage resumed on an upstream output that was
+    rebuilt from changed inputs would be stale
+    '''
+
+    prints = config.get('prints', {})
+    inputs = dict((s, prints[s]) for s in selectStages([name], True) if s in prints)
+    return stageCheckpoint.Checkpoints(config['folders'][name] + r"\stage_checkpoints.json", name, inputs, resume)
+
+def saveFingerprints(config, run, prints):
+    '''
+    Records the fingerprints of the stages that ran. Inputs written by a
+    stage of this run to the same database, or files a stage of this run
+    wrote, are fingerprinted again after the post so the next run does
+    not see them as changed.
+    '''
+
+    for name in run:
+        inputs = modules[name].stageInputs(stageDatabase(name)[0], config['folders'][name])
+        for key in prints[name]:
+            if stage_files.get(key) in run or (key in run and stageDatabase(key) == stageDatabase(name)):
+                prints[name][key] = sourceFingerprint.fingerprint(inputs[key])
+        fingerprintStore(config, name).save(name, prints[name])
+
+def runPipeline(config, selected, logfile):
+    '''Runs the selected stages wave by wave, returns {stage: working output}'''
+
+    outputs = {}
+    for wave in stageWaves(selected):
+        logging.info('Running {}'.format(', '.join(wave)))
+        if len(wave) == 1:
+            outputs[wave[0]] = runStage(wave[0], config, outputs)
+            continue
+
+        # independent branches in separate processes, arcpy is not thread safe
+        lock = multiprocessing.Lock()
+        pool = multiprocessing.Pool(len(wave), _initWorker, (lock, logfile, scratchWorkspace.mode))
+        try:
+            results = [pool.apply_async(_runWorker, ((name, config, outputs),)) for name in wave]
+            for result in results:
+                name, out = result.get()
+                outputs[name] = out
+        finally:
+            pool.close()
+            pool.join()
+
+    return(outputs)
+
+def versionManagers(databases, working_fldr):
+    '''
+    {(parent connection, instance): VersionManager}, the pipeline version
+    of each database with its connection file in a folder of its own
+    '''
+
+    mgrs = {}
+    for cxn, instance in databases:
+        db_fldr = working_fldr + '\\' + re.sub(r'\W+', '_', instance)
+        if not os.path.exists(db_fldr):
+            os.makedirs(db_fldr)
+        mgrs[(cxn, instance)] = versionManager.VersionManager(cxn, db_fldr, 'updatePipeline', instance, "GISAdmin", "G1SAdm1n!",
+                                                              owner_cxn=ownerConnection(databases[(cxn, instance)]))
+    return mgrs
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Runs the update scripts as one pipeline')
+    parser.add_argument('stages', nargs='*', help='stages to run, all when none are given: ' + ', '.join(sorted(stages)))
+    parser.add_argument('--with-upstream', action='store_true', help='also run the upstream stages of the given stages')
+    parser.add_argument('--force', action='store_true', help='run the stages even when no input changed since the last run')
+    parser.add_argument('--resume', action='store_true', help='reuse the stages a failed run completed when their inputs are unchanged')
+    parser.add_argument('--scratch', choices=scratchWorkspace.modes, default=scratchWorkspace.mode,
+                        help='intermediates in_memory up to a row threshold (auto), always (memory) or in the fgdb (disk)')
+    args = parser.parse_args()
+    scratchWorkspace.mode = args.scratch
+    for s in args.stages:
+        if s not in stages:
+            parser.error('unknown stage {}'.format(s))
+
+    version_mgrs = {}
+    try:
+
+        # env
+        arcpy.env.overwriteOutput = True
+
+        # inputs, each stage's connection comes from its own script
+        working_fldr = r'D:\prod-scripts\pipeline'
+
+        # maintain log file
+        current = datetime.today()
+        logfile = working_fldr + r"\logs\pipeline_log_{0}_{1}.txt".format(current.month, current.year)
+        logging.basicConfig(filename=logfile, level=logging.INFO, format=log_format, datefmt=log_datefmt)
+        logging.info("Starting run... \n")
+        stageMetrics.configure('Pipeline', working_fldr)
+
+        # working folders of each script
+        config = {'folders': {'AddressesAll': r'D:\prod-scripts\addressesall',
+                              'ParcelsAll': r'D:\prod-scripts\parcelsall',
+                              'Hiperweb': r'D:\prod-scripts\hiperweb',
+                              'UtilityParcels': r'D:\prod-scripts\utility-billing'}}
+
+        # skip stages with unchanged inputs
+        selected, prints = changedStages(config, selectStages(args.stages, args.with_upstream), args.force)
+        if not selected:
+            logging.info("Nothing to update, skipping run (--force runs anyway) \n ------------------------------------ \n\n")
+            sys.exit(0)
+        logging.info('Stages: {}'.format(', '.join(sorted(selected))))
+
+        # one version and connection per database, shared by its stages and reused between runs
+        databases = databaseStages(selected)
+        version_mgrs = versionManagers(databases, working_fldr)
+        config['version_cxns'] = {}
+        with stageMetrics.step('version'):
+            for (cxn, instance), names in sorted(databases.items()):
+                logging.info('{} on {} ({})'.format(', '.join(names), instance, cxn))
+                version_cxn = version_mgrs[(cxn, instance)].acquire(working_fldr + r"\logs\updatePipelineReset.txt")
+                for name in names:
+                    config['version_cxns'][name] = version_cxn
+        config['prints'] = prints
+        config['resume'] = args.resume
+
+        # execute stages
+        runPipeline(config, selected, logfile)
+
+        # clean up, aisle 5, the service is only stopped around the post of the UtilityParcels database
+        admin = updateUtilityParcels.adminClient()
+        for (cxn, instance), names in sorted(databases.items()):
+            logging.info("reconcile and posting {} edits to sde.DEFAULT on {}".format(', '.join(names), instance))
+            with updateUtilityParcels.serviceWindow(admin, updateUtilityParcels.stop_service and 'UtilityParcels' in names), \
+                    stageMetrics.step('reconcile'):
+                version_mgrs[(cxn, instance)].post(working_fldr + r"\logs\updatePipelineReconcile.txt")
+
+        saveFingerprints(config, selected, prints)
+        for name in selected:
+            checkpointStore(config, name).clear()
+        logging.info("Success! \n ------------------------------------ \n\n")
+
+    except Exception as e:
+        logging.error("EXCEPTION OCCURRED", exc_info=True)
+
+        # removing versions, recreated next run if still in use
+        for version_mgr in version_mgrs.values():
+            version_mgr.discard()
+
+        logging.info("Quitting! \n ------------------------------------ \n\n")
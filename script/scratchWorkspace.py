@@ -0,0 +1,98 @@
+'''
+ ____________________________________________________________________
+ Lawrenceville, GA
+_____________________________________________________________________
+
+   Program:    scratchWorkspace.py
+   Purpose:    Places intermediate datasets that are written and read
+               once inside a stage in the in_memory workspace instead of
+               the working fgdb on D:, falling back to the fgdb above a
+               row threshold or when the in-memory write fails. In-memory
+               datasets, and fgdb copies written because an in-memory
+               write failed, are deleted by cleanup(), also run at exit.
+               Datasets placed in the fgdb by mode or row count are kept
+               there for inspection, like before.
+
+               mode 'auto'    in_memory up to max_memory_rows, fgdb above
+               mode 'memory'  always in_memory, fgdb only if the write fails
+               mode 'disk'    always the fgdb, the old behaviour
+_____________________________________________________________________
+   History:     AG      10/2026     Created
+                AG      10/2026     isScratch() for stageCheckpoint.py
+                AG      10/2026     fgdb datasets only cleaned up when they replace a
+                                    failed in-memory write
+_____________________________________________________________________
+'''
+
+import arcpy
+import atexit
+import logging
+
+modes = ['auto', 'memory', 'disk']
+mode = 'auto'
+max_memory_rows = 250000
+memory_ws = 'in_memory'
+
+# in-memory datasets and their fgdb fallbacks created so far, deleted by cleanup()
+_created = []
+
+
+def workspaceFor(disk_ws, rows=None):
+    '''in_memory or disk_ws for an intermediate of about rows rows'''
+
+    if mode == 'memory' or (mode == 'auto' and rows is not None and rows <= max_memory_rows):
+        return memory_ws
+    return disk_ws
+
+
+def create(tool, disk_ws, name, rows=None):
+    '''
+    Runs tool(workspace, name) with the scratch workspace chosen for rows,
+    retrying in disk_ws if the in-memory write fails. Returns the path
+    actually written. Only in-memory outputs and their fallbacks are
+    cleaned up.
+    '''
+
+    ws = workspaceFor(disk_ws, rows)
+    path = ws + '\\' + name
+    logging.info('Scratch {} in {} ({} rows)'.format(name, ws, rows if rows is not None else 'unknown'))
+    if ws == disk_ws:
+        tool(ws, name)
+        return path
+
+    _created.append(path)
+    try:
+        tool(ws, name)
+        return path
+    except Exception as e:
+        logging.info('In-memory {} failed ({}), writing to {}'.format(name, e, disk_ws))
+        if arcpy.Exists(path):
+            arcpy.Delete_management(path)
+        path = disk_ws + '\\' + name
+        _created.append(path)
+        tool(disk_ws, name)
+        return path
+
+
+def isScratch(path):
+    '''True for an in-memory dataset (or its fallback) handed out by create() and not yet cleaned up'''
+
+    return str(path) in _created
+
+
+def rowCount(fc):
+    return int(arcpy.GetCount_management(fc).getOutput(0))
+
+
+def cleanup():
+    '''Deletes the in-memory datasets handed out and their fgdb fallbacks'''
+
+    while _created:
+        path = _created.pop()
+        try:
+            if arcpy.Exists(path):
+                arcpy.Delete_management(path)
+        except Exception as e:
+            logging.info('Could not delete scratch {}: {}'.format(path, e))
+
+atexit.register(cleanup)
@@ -0,0 +1,130 @@
+'''
+ ____________________________________________________________________
+ Lawrenceville, GA
+_____________________________________________________________________
+
+   Program:    serviceAreaIndex.py
+   Purpose:    Replaces the Clip of all of ParcelsAll by the service area
+               in prepUtilityParcels. Each parcel is recorded as inside,
+               outside or crossing CityUtilityServiceArea, keyed by
+               Parcel_No and a hash of its geometry, in a pickle kept in
+               the working folder. Parcels inside are copied, parcels
+               outside skipped and only crossing parcels are clipped;
+               new or reshaped parcels are classified again. The index is
+               dropped when the service area changes.
+_____________________________________________________________________
+   History:     AG      10/2026     Created
+_____________________________________________________________________
+'''
+
+import arcpy
+import os
+import hashlib
+import logging
+import pickle
+
+import bulkWriter
+import sourceFingerprint
+import stageMetrics
+
+inside = 'inside'
+outside = 'outside'
+crossing = 'crossing'
+
+
+def areaFingerprint(fc):
+    '''Row count, extent and hash of every row of the service area, it is small'''
+
+    return repr(sorted(sourceFingerprint.fingerprint(fc, sample=None).items()))
+
+
+def geometryHash(shape):
+    return hashlib.md5(bytes(shape.WKB)).digest()
+
+
+def serviceArea(fc, sr):
+    '''All service area polygons as one geometry in sr'''
+
+    area = None
+    with arcpy.da.SearchCursor(fc, ['SHAPE@'], spatial_reference=sr) as scur:
+        for row in scur:
+            if row[0] is not None:
+                area = row[0] if area is None else area.union(row[0])
+    return area
+
+
+def classify(area, shape):
+    if area.contains(shape):
+        return inside
+    if area.disjoint(shape):
+        return outside
+    return crossing
+
+
+def loadMembership(cache_path, area_fp):
+    '''{(Parcel_No, geometry hash): state}, empty when the service area changed'''
+
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'rb') as f:
+                cached = pickle.load(f)
+            if cached['area'] == area_fp:
+                logging.info('Using cached service area membership of {} parcels'.format(len(cached['parcels'])))
+                return cached['parcels']
+            logging.info('Service area changed, classifying every parcel...')
+        except Exception:
+            logging.info('Service area membership cache unreadable, classifying every parcel...')
+    return {}
+
+
+def clipParcels(parcels, servicearea, ws, name, cache_path):
+    '''
+    Writes the parcels within servicearea to ws\\name with the schema of
+    parcels, like Clip_analysis: inside parcels as they are, crossing
+    parcels cut to the service area. Returns the output path.
+    '''
+
+    sr = arcpy.Describe(parcels).spatialReference
+    area_fp = areaFingerprint(servicearea)
+    area = serviceArea(servicearea, sr)
+    membership = loadMembership(cache_path, area_fp)
+
+    out = arcpy.CreateFeatureclass_management(ws, name, 'POLYGON', parcels, spatial_reference=sr)[0]
+    fields = [fld.name for fld in arcpy.ListFields(parcels)
+              if fld.editable and fld.type not in ('OID', 'Geometry', 'GlobalID') and fld.name.upper() != 'PARCEL_NO']
+
+    # one pass: cached parcels copied or skipped, the rest classified
+    seen = {}
+    counts = {inside: 0, outside: 0, crossing: 0}
+    classified = 0
+    read = 0
+    with bulkWriter.BulkWriter(out, ['SHAPE@', 'Parcel_No'] + fields, 10000, label='Copied') as writer:
+        with arcpy.da.SearchCursor(parcels, ['SHAPE@', 'Parcel_No'] + fields, spatial_reference=sr) as scur:
+            for row in scur:
+                read += 1
+                shape = row[0]
+                if shape is None or area is None:
+                    continue
+                key = (row[1], geometryHash(shape))
+                state = membership.get(key)
+                if state is None:
+                    state = classify(area, shape)
+                    classified += 1
+                seen[key] = state
+                counts[state] += 1
+
+                if state == inside:
+                    writer.insertRow(row)
+                elif state == crossing:
+                    clipped = shape.intersect(area, 4)
+                    if clipped is not None and clipped.area > 0:
+                        writer.insertRow([clipped] + list(row[1:]))
+
+    # parcels gone from ParcelsAll drop out of the index
+    with open(cache_path, 'wb') as f:
+        pickle.dump({'area': area_fp, 'parcels': seen}, f, pickle.HIGHEST_PROTOCOL)
+
+    logging.info('{} parcels inside, {} crossing, {} outside the service area; {} classified, {} from the index'.format(
+        counts[inside], counts[crossing], counts[outside], classified, sum(counts.values()) - classified))
+    stageMetrics.rows(read=read, written=writer.count)
+    return out
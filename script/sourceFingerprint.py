@@ -0,0 +1,138 @@
+'''
+ ____________________________________________________________________
+ Lawrenceville, GA
+_____________________________________________________________________
+
+   Program:    sourceFingerprint.py
+   Purpose:    Fingerprints the input feature classes of a run (row
+               count, max LAST_EDITED_DATE, extent, sampled content
+               hash) so a run, or a pipeline stage, can be skipped when
+               nothing upstream changed since the last successful run.
+_____________________________________________________________________
+   History:     AG      10/2026     Created
+                AG      10/2026     Only OIDs are read in full, sampled rows fetched by
+                                    OID and max LAST_EDITED_DATE from one sorted row
+_____________________________________________________________________
+'''
+
+import arcpy
+import os
+import json
+import hashlib
+import logging
+
+
+def lastEdited(fc, field):
+    '''Latest non-null value of field, the first row of a descending sort'''
+
+    with arcpy.da.SearchCursor(fc, [field], '{} IS NOT NULL'.format(field),
+                               sql_clause=(None, 'ORDER BY {} DESC'.format(field))) as scur:
+        for row in scur:
+            return row[0]
+    return None
+
+
+def sampledRows(fc, oid_field, fields, count, sample, chunk_size=1000):
+    '''
+    Every Nth row of fc in OID order so about sample rows come back, all
+    rows when sample is None. Only the OIDs are read for every row, the
+    sampled rows are fetched chunk_size OIDs at a time.
+    '''
+
+    order = (None, 'ORDER BY {}'.format(oid_field))
+    if not sample or count <= sample:
+        with arcpy.da.SearchCursor(fc, fields, sql_clause=order) as scur:
+            for row in scur:
+                yield row
+        return
+
+    step = count // sample
+    with arcpy.da.SearchCursor(fc, ['OID@'], sql_clause=order) as scur:
+        oids = [row[0] for i, row in enumerate(scur) if i % step == 0]
+
+    for i in range(0, len(oids), chunk_size):
+        where = '{} IN ({})'.format(oid_field, ', '.join(str(oid) for oid in oids[i:i + chunk_size]))
+        with arcpy.da.SearchCursor(fc, fields, where, sql_clause=order) as scur:
+            for row in scur:
+                yield row
+
+
+def fingerprint(fc, sample=1000):
+    '''
+    Fingerprint of a feature class or table as a json-able dict. Every
+    Nth row in OID order is hashed so about sample rows are covered, all
+    rows when sample is None. Plain files (lookup json) are hashed whole.
+    '''
+
+    if os.path.isfile(fc):
+        md5 = hashlib.md5()
+        with open(fc, 'rb') as f:
+            md5.update(f.read())
+        return {'md5': md5.hexdigest()}
+
+    desc = arcpy.Describe(fc)
+    count = int(arcpy.GetCount_management(fc).getOutput(0))
+    fields = [fld.name for fld in arcpy.ListFields(fc) if fld.type not in ('OID', 'Geometry', 'Blob', 'Raster')]
+    shape = ['SHAPE@WKB'] if hasattr(desc, 'shapeType') else []
+
+    result = {'count': count}
+    if shape:
+        ext = desc.extent
+        result['extent'] = [ext.XMin, ext.YMin, ext.XMax, ext.YMax]
+
+    upper = [f.upper() for f in fields]
+    if 'LAST_EDITED_DATE' in upper:
+        result['last_edited'] = str(lastEdited(fc, fields[upper.index('LAST_EDITED_DATE')]))
+
+    md5 = hashlib.md5()
+    for row in sampledRows(fc, desc.OIDFieldName, ['OID@'] + fields + shape, count, sample):
+        if shape:
+            md5.update(repr(row[:-1]).encode('utf-8'))
+            md5.update(bytes(row[-1] or b''))
+        else:
+            md5.update(repr(row).encode('utf-8'))
+
+    result['sample_md5'] = md5.hexdigest()
+    return result
+
+
+class FingerprintStore(object):
+    '''Fingerprints of the last successful run of each job, kept in a json file'''
+
+    def __init__(self, path):
+
+        self.path = path
+        self.jobs = {}
+        if os.path.exists(path):
+            try:
+                with open(path) as f:
+                    self.jobs = json.load(f)
+            except ValueError:
+                logging.info('Fingerprint file {} unreadable, treating all inputs as changed'.format(path))
+
+    def check(self, job, sources):
+        '''
+        Fingerprints sources ({name: fc}) and compares them to the last run
+        of job. Returns (names of changed inputs, new fingerprints).
+        '''
+
+        previous = self.jobs.get(job, {})
+        prints = {}
+        changed = []
+        for name in sorted(sources):
+            prints[name] = fingerprint(sources[name])
+            if previous.get(name) != prints[name]:
+                changed.append(name)
+
+        if changed:
+            logging.info('{}: changed inputs {}'.format(job, ', '.join(changed)))
+        else:
+            logging.info('{}: no inputs changed since the last run'.format(job))
+        return changed, prints
+
+    def save(self, job, prints):
+        '''Records the fingerprints of a successful run'''
+
+        self.jobs[job] = prints
+        with open(self.path, 'w') as f:
+            json.dump(self.jobs, f, indent=1, sort_keys=True)
@@ -0,0 +1,181 @@
+'''
+ ____________________________________________________________________
+ Lawrenceville, GA
+_____________________________________________________________________
+
+   Program:    spatialIndex.py
+   Purpose:    In-memory grid index over points with bounding box
+               prefiltering and an exact point in polygon test. Used in
+               place of SpatialJoin_analysis where only a lookup is needed.
+_____________________________________________________________________
+   History:     AG      10/2026     Created
+_____________________________________________________________________
+'''
+
+import math
+
+
+def ringsFromGeometry(geom):
+    '''Returns the rings of an arcpy polygon as lists of (x, y) tuples'''
+
+    rings = []
+    for part in geom:
+        ring = []
+        for pnt in part:
+            # interior rings are separated by a None point
+            if pnt is None:
+                if ring:
+                    rings.append(ring)
+                ring = []
+            else:
+                ring.append((pnt.X, pnt.Y))
+        if ring:
+            rings.append(ring)
+    return rings
+
+
+def ringsExtent(rings):
+    '''(xmin, ymin, xmax, ymax) of a list of rings'''
+
+    xs = [x for ring in rings for x, y in ring]
+    ys = [y for ring in rings for x, y in ring]
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def pointInRings(x, y, rings):
+    '''
+    Even-odd test over every ring, so holes and multipart polygons work
+    without knowing ring orientation. Points on an edge count as inside,
+    the same as an INTERSECT match.
+    '''
+
+    inside = False
+    for ring in rings:
+        n = len(ring)
+        x1, y1 = ring[n - 1]
+        for i in range(n):
+            x2, y2 = ring[i]
+            # on the edge
+            if (min(x1, x2) <= x <= max(x1, x2) and min(y1, y2) <= y <= max(y1, y2)
+                    and (x2 - x1) * (y - y1) == (y2 - y1) * (x - x1)):
+                return True
+            if (y1 > y) != (y2 > y):
+                if x < (x2 - x1) * (y - y1) / float(y2 - y1) + x1:
+                    inside = not inside
+            x1, y1 = x2, y2
+    return inside
+
+
+class PointIndex(object):
+    '''Grid buckets of (x, y, item); build once, then query by polygon'''
+
+    def __init__(self, cell_size=None):
+
+        self.cell_size = cell_size
+        self.points = []
+        self.cells = None
+
+    def insert(self, x, y, item):
+        self.points.append((x, y, item))
+        self.cells = None
+
+    def build(self):
+
+        if not self.cell_size:
+            # about two points per cell
+            if self.points:
+                xs = [p[0] for p in self.points]
+                ys = [p[1] for p in self.points]
+                area = max(max(xs) - min(xs), 1.0) * max(max(ys) - min(ys), 1.0)
+                self.cell_size = math.sqrt(2.0 * area / len(self.points))
+            else:
+                self.cell_size = 1.0
+
+        self.cells = {}
+        size = self.cell_size
+        for pnt in self.points:
+            key = (int(math.floor(pnt[0] / size)), int(math.floor(pnt[1] / size)))
+            self.cells.setdefault(key, []).append(pnt)
+
+    def query(self, extent):
+        '''Yields (x, y, item) inside the (xmin, ymin, xmax, ymax) extent'''
+
+        if self.cells is None:
+            self.build()
+
+        xmin, ymin, xmax, ymax = extent
+        size = self.cell_size
+        for ix in range(int(math.floor(xmin / size)), int(math.floor(xmax / size)) + 1):
+            for iy in range(int(math.floor(ymin / size)), int(math.floor(ymax / size)) + 1):
+                for pnt in self.cells.get((ix, iy), ()):
+                    if xmin <= pnt[0] <= xmax and ymin <= pnt[1] <= ymax:
+                        yield pnt
+
+    def inPolygon(self, rings):
+        '''Items of the points that fall in the polygon'''
+
+        if not rings:
+            return []
+        return [item for x, y, item in self.query(ringsExtent(rings)) if pointInRings(x, y, rings)]
+
+    def firstInPolygon(self, rings):
+        '''Lowest item in the polygon, like a JOIN_ONE_TO_ONE match, or None'''
+
+        items = self.inPolygon(rings)
+        if items:
+            return min(items)
+        return None
+
+
+class PolygonIndex(object):
+    '''Grid buckets of polygon extents; build once, then query by point'''
+
+    def __init__(self, cell_size=None):
+
+        self.cell_size = cell_size
+        self.polygons = []
+        self.cells = None
+
+    def insert(self, rings, item):
+        if rings:
+            self.polygons.append((ringsExtent(rings), rings, item))
+            self.cells = None
+
+    def _keys(self, extent):
+        xmin, ymin, xmax, ymax = extent
+        size = self.cell_size
+        for ix in range(int(math.floor(xmin / size)), int(math.floor(xmax / size)) + 1):
+            for iy in range(int(math.floor(ymin / size)), int(math.floor(ymax / size)) + 1):
+                yield (ix, iy)
+
+    def build(self):
+
+        if not self.cell_size:
+            # about the size of an average polygon
+            if self.polygons:
+                self.cell_size = max(sum(max(e[2] - e[0], e[3] - e[1]) for e, r, i in self.polygons) / len(self.polygons), 1.0)
+            else:
+                self.cell_size = 1.0
+
+        self.cells = {}
+        for poly in self.polygons:
+            for key in self._keys(poly[0]):
+                self.cells.setdefault(key, []).append(poly)
+
+    def containing(self, x, y):
+        '''Items of the polygons that contain the point'''
+
+        if self.cells is None:
+            self.build()
+
+        key = (int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size)))
+        return [item for extent, rings, item in self.cells.get(key, ())
+                if extent[0] <= x <= extent[2] and extent[1] <= y <= extent[3] and pointInRings(x, y, rings)]
+
+    def firstContaining(self, x, y):
+        '''Lowest item of the polygons containing the point, or None'''
+
+        items = self.containing(x, y)
+        if items:
+            return min(items)
+        return None
@@ -0,0 +1,147 @@
+'''
+ ____________________________________________________________________
+ Lawrenceville, GA
+_____________________________________________________________________
+
+   Program:    stageCheckpoint.py
+   Purpose:    Checkpoints the output of each completed stage of a run
+               in the working fgdb (ckpt_<job>_<stage>) with a record of
+               the run's input fingerprints in stage_checkpoints.json, so
+               a failed run can be resumed (--resume) from the first
+               incomplete stage instead of rebuilt from scratch. Records
+               are only used when the inputs match; they are cleared when
+               the run succeeds. Loads into the version are never
+               checkpointed, a failed run deletes the version.
+_____________________________________________________________________
+   History:     AG      10/2026     Created
+_____________________________________________________________________
+'''
+
+import arcpy
+import os
+import json
+import time
+import logging
+
+import scratchWorkspace
+
+
+class Checkpoints(object):
+    '''
+    Completed stages of one run of job. inputs are the fingerprints of
+    the run (FingerprintStore.check), a previous run's stages are reused
+    only when resume is set and they were recorded for the same inputs.
+    With no path every stage just runs.
+    '''
+
+    def __init__(self, path, job=None, inputs=None, resume=False):
+
+        self.path = path
+        self.job = job
+        self.jobs = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path) as f:
+                    self.jobs = json.load(f)
+            except ValueError:
+                logging.info('Checkpoint file {} unreadable, starting over'.format(path))
+
+        previous = self.jobs.get(job)
+        if previous and resume and previous.get('inputs') == inputs:
+            logging.info('{}: resuming, completed stages {}'.format(job, ', '.join(s['stage'] for s in previous['stages']) or 'none'))
+        else:
+            if previous and resume:
+                logging.info('{}: inputs changed since the failed run, starting over'.format(job))
+            self._drop(previous)
+            if path:
+                self.jobs[job] = {'inputs': inputs, 'stages': []}
+
+    def _drop(self, record):
+        '''Deletes the checkpoint datasets of a record'''
+
+        for stage in (record or {}).get('stages', []):
+            try:
+                if arcpy.Exists(stage['checkpoint']):
+                    arcpy.Delete_management(stage['checkpoint'])
+            except Exception as e:
+                logging.info('Could not delete checkpoint {}: {}'.format(stage['checkpoint'], e))
+
+    def _save(self):
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.jobs, f, indent=1, sort_keys=True)
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        os.rename(tmp, self.path)
+
+    def _completed(self, stage):
+        '''Record of stage when its checkpoint is still there and whole'''
+
+        for rec in self.jobs[self.job]['stages']:
+            if rec['stage'] == stage:
+                if arcpy.Exists(rec['checkpoint']) and scratchWorkspace.rowCount(rec['checkpoint']) == rec['count']:
+                    return rec
+                logging.info('Checkpoint {} missing or incomplete, rerunning {}'.format(rec['checkpoint'], stage))
+        return None
+
+    def run(self, stage, gdb, func, *args, **kwargs):
+        '''
+        Output of func(*args, **kwargs), a feature class. Taken from the
+        checkpoint when stage completed in the run being resumed, else
+        run and checkpointed in gdb. Stages after one that reruns rerun.
+        '''
+
+        if not self.path:
+            return func(*args, **kwargs)
+
+        stages = self.jobs[self.job]['stages']
+        names = [s['stage'] for s in stages]
+        rec = self._completed(stage)
+        if rec:
+            # only the last completed stage is copied back, earlier outputs are not read again
+            later = names[names.index(stage) + 1:]
+            if any(self._completed(s) for s in later):
+                logging.info('{}: {} already completed'.format(self.job, stage))
+                return rec['output']
+            logging.info('{}: {} restored from {}'.format(self.job, stage, rec['checkpoint']))
+            return self._restore(rec, gdb)
+
+        # this stage and every stage after it rerun
+        index = names.index(stage) if stage in names else len(stages)
+        self._drop({'stages': stages[index:]})
+        del stages[index:]
+
+        out = str(func(*args, **kwargs))
+
+        # copied, later stages update their input in place
+        checkpoint = gdb + '\\ckpt_{}_{}'.format(self.job, stage)
+        arcpy.CopyFeatures_management(out, checkpoint)
+        stages.append({'stage': stage,
+                       'output': out,
+                       'scratch': scratchWorkspace.isScratch(out),
+                       'checkpoint': checkpoint,
+                       'count': scratchWorkspace.rowCount(checkpoint),
+                       'time': time.strftime('%Y-%m-%dT%H:%M:%S')})
+        self._save()
+        return out
+
+    def _restore(self, rec, gdb):
+        '''Copies a checkpoint back to where the stage wrote its output'''
+
+        out = rec['output']
+        if rec['scratch']:
+            name = out.rsplit('\\', 1)[-1]
+            return scratchWorkspace.create(lambda ws, n: arcpy.CopyFeatures_management(rec['checkpoint'], ws + '\\' + n),
+                                           gdb, name, rec['count'])
+        if arcpy.Exists(out):
+            arcpy.Delete_management(out)
+        arcpy.CopyFeatures_management(rec['checkpoint'], out)
+        return out
+
+    def clear(self):
+        '''The run succeeded, its checkpoints are not needed'''
+
+        if not self.path:
+            return
+        self._drop(self.jobs.pop(self.job, None))
+        self._save()
@@ -0,0 +1,217 @@
+'''
+ ____________________________________________________________________
+ Lawrenceville, GA
+_____________________________________________________________________
+
+   Program:    stageMetrics.py
+   Purpose:    Per-step performance metrics for the update scripts:
+               wall time, CPU time, peak RSS, rows read and written
+               and rows/sec. Each step is appended as a json line to
+               logs\metrics.jsonl in the working folder and the last
+               run is written as a Prometheus textfile-collector file.
+
+               @stageMetrics.measure                 time a function
+               with stageMetrics.step('reconcile'):  time a block
+               stageMetrics.rows(read=n, written=n)  count rows
+_____________________________________________________________________
+   History:     AG      10/2026     Created
+_____________________________________________________________________
+'''
+
+import os
+import sys
+import json
+import time
+import socket
+import logging
+import functools
+import contextlib
+
+# windows_exporter textfile collector folder, one <job>.prom per job
+textfile_dir = r'C:\Program Files\windows_exporter\textfile_inputs'
+
+# set by configure()
+_job = None
+_jsonl = None
+_prom_dir = None
+_run = None
+_records = []
+
+# steps running now, rows() counts toward all of them
+_active = []
+
+prom_metrics = [('wall_seconds', 'Wall clock time of the step'),
+                ('cpu_seconds', 'CPU time of the step, user + system'),
+                ('peak_rss_bytes', 'Peak resident memory of the process at the end of the step'),
+                ('rows_read', 'Rows read by the step'),
+                ('rows_written', 'Rows written by the step'),
+                ('rows_per_second', 'Rows read or written, whichever is more, per wall second'),
+                ('success', '1 when the step finished without an exception')]
+
+
+def configure(job, working_fldr, prom_dir=textfile_dir):
+    '''Starts a run of job, metrics go to working_fldr\\logs\\metrics.jsonl and prom_dir\\<job>.prom'''
+
+    global _job, _jsonl, _prom_dir, _run, _records
+    _job = job
+    _jsonl = working_fldr + r'\logs\metrics.jsonl'
+    _prom_dir = prom_dir
+    _run = time.strftime('%Y-%m-%dT%H:%M:%S')
+    _records = []
+
+
+@contextlib.contextmanager
+def job(name, working_fldr, prom_dir=textfile_dir):
+    '''Metrics of the block go to job name, the previous job is restored after'''
+
+    global _job, _jsonl, _prom_dir, _run, _records
+    saved = (_job, _jsonl, _prom_dir, _run, _records)
+    configure(name, working_fldr, prom_dir)
+    try:
+        yield
+    finally:
+        _job, _jsonl, _prom_dir, _run, _records = saved
+
+
+def cpuTime():
+    '''User + system CPU seconds of this process and its waited-for children (not counted on Windows)'''
+
+    t = os.times()
+    return t[0] + t[1] + t[2] + t[3]
+
+
+def peakRSS():
+    '''Peak resident memory of this process in bytes, None when unavailable'''
+
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on linux, bytes on mac
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except ImportError:
+        pass
+
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD),
+                        ('PageFaultCount', wintypes.DWORD),
+                        ('PeakWorkingSetSize', ctypes.c_size_t),
+                        ('WorkingSetSize', ctypes.c_size_t),
+                        ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                        ('PagefileUsage', ctypes.c_size_t),
+                        ('PeakPagefileUsage', ctypes.c_size_t)]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.PeakWorkingSetSize
+    except Exception:
+        pass
+
+    return None
+
+
+def rows(read=0, written=0):
+    '''Adds to the row counts of every step running now'''
+
+    for rec in _active:
+        rec['rows_read'] += read
+        rec['rows_written'] += written
+
+
+@contextlib.contextmanager
+def step(name):
+    '''Measures the block as step name'''
+
+    rec = {'rows_read': 0, 'rows_written': 0}
+    _active.append(rec)
+    wall = time.time()
+    cpu = cpuTime()
+    success = False
+    try:
+        yield
+        success = True
+    finally:
+        _active[:] = [r for r in _active if r is not rec]
+        wall = time.time() - wall
+        rec.update({'job': _job,
+                    'run': _run,
+                    'step': name,
+                    'host': socket.gethostname(),
+                    'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                    'wall_seconds': round(wall, 3),
+                    'cpu_seconds': round(cpuTime() - cpu, 3),
+                    'peak_rss_bytes': peakRSS(),
+                    'rows_per_second': round(max(rec['rows_read'], rec['rows_written']) / wall, 1) if wall > 0 else 0,
+                    'success': int(success)})
+        record(rec)
+
+
+def measure(func):
+    '''Decorator, measures each call of func as a step named after it'''
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with step(func.__name__):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def record(rec):
+    '''Logs a finished step and writes it out when a job is configured'''
+
+    peak = rec['peak_rss_bytes']
+    logging.info('{}: {:.1f}s wall, {:.1f}s cpu, {} peak, {} rows read, {} written, {} rows/s'.format(
+        rec['step'], rec['wall_seconds'], rec['cpu_seconds'], '{:.0f} MB'.format(peak / 1048576.0) if peak else 'n/a',
+        rec['rows_read'], rec['rows_written'], rec['rows_per_second']))
+
+    if not _job:
+        return
+
+    _records.append(rec)
+    # metrics must never fail a run
+    try:
+        with open(_jsonl, 'a') as f:
+            f.write(json.dumps(rec, sort_keys=True) + '\n')
+    except (IOError, OSError) as e:
+        logging.info('Could not write {}: {}'.format(_jsonl, e))
+    if _prom_dir:
+        try:
+            writeTextfile(os.path.join(_prom_dir, _job + '.prom'), _job, _records)
+        except (IOError, OSError) as e:
+            logging.info('Could not write Prometheus textfile: {}'.format(e))
+
+
+def writeTextfile(path, job, records):
+    '''Prometheus text format for the steps of the last run, the last call of a repeated step wins'''
+
+    latest = []
+    for rec in records:
+        latest = [r for r in latest if r['step'] != rec['step']] + [rec]
+
+    lines = []
+    for metric, help_text in prom_metrics:
+        name = 'gis_update_step_' + metric
+        lines.append('# HELP {} {}'.format(name, help_text))
+        lines.append('# TYPE {} gauge'.format(name))
+        for rec in latest:
+            if rec.get(metric) is not None:
+                lines.append('{}{{job="{}",step="{}"}} {}'.format(name, job, rec['step'], rec[metric]))
+    lines.append('# HELP gis_update_last_run_timestamp_seconds Time the last step of the job finished')
+    lines.append('# TYPE gis_update_last_run_timestamp_seconds gauge')
+    lines.append('gis_update_last_run_timestamp_seconds{{job="{}"}} {:.0f}'.format(job, time.time()))
+
+    # written aside first so the collector never reads a half written file
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+    if os.path.exists(path):
+        os.remove(path)
+    os.rename(tmp, path)
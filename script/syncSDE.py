@@ -0,0 +1,194 @@
+'''
+ ____________________________________________________________________
+ Lawrenceville, GA
+_____________________________________________________________________
+
+   Program:    syncSDE.py
+   Purpose:    Applies only the inserts, updates and deletes needed to
+               make a versioned SDE feature class match the working
+               FGDB output, instead of DeleteRows + Append.
+               Imported by the update scripts.
+_____________________________________________________________________
+   History:     AG      10/2026     Created
+                AG      10/2026     Rows read and written reported to stageMetrics.py
+                AG      10/2026     Inserts written through bulkWriter.py with progress
+                                    per batch
+_____________________________________________________________________
+'''
+
+import arcpy
+import os
+import hashlib
+import logging
+
+import bulkWriter
+import stageMetrics
+
+# fields maintained by the geodatabase, never compared or written
+skip_fields = ['CREATED_USER', 'CREATED_DATE', 'LAST_EDITED_USER', 'LAST_EDITED_DATE', 'GLOBALID']
+skip_types = ['OID', 'Geometry', 'GlobalID', 'Blob', 'Raster']
+
+# set by the pipeline runner when stages sharing one version run in
+# parallel processes, so only one edit session saves at a time
+sde_lock = None
+
+
+def syncFields(source, target):
+    '''Editable attribute fields found in both source and target'''
+
+    source_flds = set(fld.name.upper() for fld in arcpy.ListFields(source))
+    return [fld.name for fld in arcpy.ListFields(target)
+            if fld.editable and not fld.required and fld.type not in skip_types
+            and fld.name.upper() not in skip_fields and fld.name.upper() in source_flds]
+
+
+def workspaceOf(fc):
+    '''Walks up from a feature class path to its geodatabase'''
+
+    path = os.path.dirname(fc)
+    while arcpy.Describe(path).dataType != 'Workspace':
+        path = os.path.dirname(path)
+    return path
+
+
+def fingerprint(row):
+    '''md5 of the attribute values and geometry (last item) of a cursor row'''
+
+    md5 = hashlib.md5(repr(row[:-1]).encode('utf-8'))
+    if row[-1] is not None:
+        md5.update(bytes(row[-1].WKB))
+    return md5.digest()
+
+
+def readFingerprints(fc, fields, key_idx):
+    '''Returns {key: [(fingerprint, OID), ...]} for every row in fc'''
+
+    prints = {}
+    with arcpy.da.SearchCursor(fc, ['OID@'] + fields + ['SHAPE@']) as scur:
+        for row in scur:
+            key = tuple(row[i + 1] for i in key_idx)
+            prints.setdefault(key, []).append((fingerprint(row[1:]), row[0]))
+    return prints
+
+
+def compareFingerprints(source_prints, target_prints):
+    '''
+    Matches rows on key, then on fingerprint. Rows left over on both sides
+    of a key are paired as updates; the rest are inserts or deletes.
+    Returns (insert source OIDs, {target OID: source OID}, delete target OIDs, unchanged count)
+    '''
+
+    inserts = set()
+    updates = {}
+    deletes = set()
+    unchanged = 0
+
+    for key, src_rows in source_prints.items():
+        tgt_rows = target_prints.pop(key, [])
+        tgt_by_print = {}
+        for fp, oid in tgt_rows:
+            tgt_by_print.setdefault(fp, []).append(oid)
+
+        src_left = []
+        for fp, oid in src_rows:
+            if tgt_by_print.get(fp):
+                tgt_by_print[fp].pop()
+                unchanged += 1
+            else:
+                src_left.append(oid)
+
+        tgt_left = [oid for oids in tgt_by_print.values() for oid in oids]
+        for src_oid, tgt_oid in zip(src_left, tgt_left):
+            updates[tgt_oid] = src_oid
+        inserts.update(src_left[len(tgt_left):])
+        deletes.update(tgt_left[len(src_left):])
+
+    # keys no longer in the source
+    for tgt_rows in target_prints.values():
+        deletes.update(oid for fp, oid in tgt_rows)
+
+    return inserts, updates, deletes, unchanged
+
+
+def _oidBatches(oids, batch_size):
+    oids = sorted(oids)
+    for i in range(0, len(oids), batch_size):
+        yield oids[i:i + batch_size]
+
+
+def syncFeatureClass(source, target, key_fields, batch_size=1000):
+    '''
+    Makes target match source on key_fields, editing target in batched
+    edit operations. Returns a dict of insert, update, delete and unchanged counts.
+    '''
+
+    fields = syncFields(source, target)
+    key_idx = [[f.upper() for f in fields].index(k.upper()) for k in key_fields]
+    cur_fields = fields + ['SHAPE@']
+
+    logging.info('Fingerprinting {}...'.format(source))
+    source_prints = readFingerprints(source, fields, key_idx)
+    logging.info('Fingerprinting {}...'.format(target))
+    target_prints = readFingerprints(target, fields, key_idx)
+
+    inserts, updates, deletes, unchanged = compareFingerprints(source_prints, target_prints)
+    del(source_prints, target_prints)
+    logging.info('{} inserts, {} updates, {} deletes, {} unchanged'.format(len(inserts), len(updates), len(deletes), unchanged))
+    stageMetrics.rows(read=len(inserts) + 2 * len(updates) + len(deletes) + 2 * unchanged)
+
+    # source rows needed for updates, usually a small set
+    src_needed = set(updates.values())
+    src_rows = {}
+    if src_needed:
+        with arcpy.da.SearchCursor(source, ['OID@'] + cur_fields) as scur:
+            for row in scur:
+                if row[0] in src_needed:
+                    src_rows[row[0]] = list(row[1:])
+
+    tgt_oid = arcpy.Describe(target).OIDFieldName
+    where = '{} IN ({{}})'.format(tgt_oid)
+
+    if sde_lock:
+        logging.info('Waiting for the version edit lock...')
+        sde_lock.acquire()
+
+    edit = arcpy.da.Editor(workspaceOf(target))
+    try:
+        edit.startEditing(False, True)
+        for batch in _oidBatches(deletes, batch_size):
+            edit.startOperation()
+            with arcpy.da.UpdateCursor(target, ['OID@'], where.format(','.join(str(o) for o in batch))) as ucur:
+                for row in ucur:
+                    ucur.deleteRow()
+            edit.stopOperation()
+        logging.info('Deleted {} rows'.format(len(deletes)))
+
+        for batch in _oidBatches(updates, batch_size):
+            edit.startOperation()
+            with arcpy.da.UpdateCursor(target, ['OID@'] + cur_fields, where.format(','.join(str(o) for o in batch))) as ucur:
+                for row in ucur:
+                    ucur.updateRow([row[0]] + src_rows[updates[row[0]]])
+            edit.stopOperation()
+        logging.info('Updated {} rows'.format(len(updates)))
+
+        if inserts:
+            with bulkWriter.BulkWriter(target, cur_fields, batch_size, edit) as writer:
+                with arcpy.da.SearchCursor(source, ['OID@'] + cur_fields) as scur:
+                    for row in scur:
+                        if row[0] in inserts:
+                            writer.insertRow(row[1:])
+        logging.info('Inserted {} rows'.format(len(inserts)))
+
+        edit.stopEditing(True)
+        stageMetrics.rows(written=len(inserts) + len(updates) + len(deletes))
+
+    except Exception:
+        if edit.isEditing:
+            edit.stopEditing(False)
+        raise
+
+    finally:
+        if sde_lock:
+            sde_lock.release()
+
+    return {'insert': len(inserts), 'update': len(updates), 'delete': len(deletes), 'unchanged': unchanged}
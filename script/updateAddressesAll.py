@@ -14,110 +14,181 @@
                                     Gwinnett field mapping after new
                                     data delivery
                 JB      04/2022     Maintenance
+                AG      10/2026     Delta sync to SDE replaces DeleteRows
+                                    and Append (syncSDE.py)
+                AG      10/2026     Counties streamed into AddressesAll_f with
+                                    Full_Address built on the fly, replaces the
+                                    county copies and populateAddressesAll
+                AG      10/2026     Stage body moved to runAddressesAll() so runPipeline.py
+                                    can chain it
+                AG      10/2026     Run skipped when no input changed since the
+                                    last run (sourceFingerprint.py), --force
+                AG      10/2026     Steps timed with stageMetrics.py (wall, cpu,
+                                    peak RSS, rows), logs\metrics.jsonl
+                AG      10/2026     Version and connection file kept between runs
+                                    (versionManager.py): reset by reconcile, posted
+                                    with KEEP_VERSION, recreated only when unhealthy
+                AG      10/2026     Number and street of each address kept in
+                                    address_components.sqlite (addressComponents.py)
+                AG      10/2026     AddressesAll_f checkpointed in addressesAll.gdb
+                                    (stageCheckpoint.py), --resume
+                AG      10/2026     Counties and their field mappings read from
+                                    supp_data\counties.json and loaded in parallel,
+                                    one partition per county (countyIngest.py)
 '_____________________________________________________________________
 '''
 
 import arcpy
 from arcpy import env
 import os
+import sys
+import argparse
 from datetime import datetime
 import logging
 
+import addressComponents
+import countyIngest
+import sourceFingerprint
+import stageCheckpoint
+import stageMetrics
+import syncSDE
+import versionManager
+
 arcpy.env.overwriteOutput = True
 
-def prepAddressesAll(fgdb, addressall, gwinnett, rockdale, walton):
+# geodatabase the stage reads and posts to, module level so runPipeline.py uses the same one
+parent_cxn = r"D:\sdeConn\GISAdmin@sdeCity.sde"
+sql_instance = r"Blade-3\SQL2014"
+# versions are deleted through the GISADMIN connection, as they always were here
+owner_cxn = parent_cxn
+
+# parsed address fields, in Full_Address order
+geo_fields = ['geo_Number', 'geo_Address', 'geo_City', 'geo_State', 'geo_Zip']
+
+def buildFullAddress(parts):
+
+    # parts in geo_fields order, state defaults to GA
+    parts = list(parts)
+    if parts[3] == None:
+        parts[3] = 'GA'
+
+    return u' '.join(u'{}'.format(x) for x in parts if x != None)
+
+def _loadCountyAddresses(task):
+    '''Worker: one county's addresses into its partition, returns (partition, rows, components)'''
+
+    county, fc, fld_map, template, partition_fldr = task
+    partition = countyIngest.partitionFor(partition_fldr, county, template, 'AddressesAll_' + county)
+    sr = arcpy.Describe(partition).spatialReference
+
+    # stream the county straight into its partition, no copies or field changes
+    components = []
+    mapped = [g for g in geo_fields if g in fld_map]
+    count = 0
+    with arcpy.da.InsertCursor(partition, ['SHAPE@', 'Full_Address']) as icur:
+        with arcpy.da.SearchCursor(fc, ['SHAPE@'] + [fld_map[g] for g in mapped], spatial_reference=sr) as scur:
+            for row in scur:
+                values = dict(zip(mapped, row[1:]))
+                full_address = buildFullAddress([values.get(g) for g in geo_fields])
+                icur.insertRow([row[0], full_address])
+                # number and street as delivered, for Hiperweb
+                components.append((full_address, values.get('geo_Number'), values.get('geo_Address')))
+                count += 1
+
+    return partition, count, components
+
+@stageMetrics.measure
+def prepAddressesAll(fgdb, addressall, sources, partition_fldr, components_db=None, workers=None):
 
     # create addressesall fc in fgdb for working
     logging.info('Creating temporary fc...')
-    addall_f = arcpy.CreateFeatureclass_management(fgdb, 'AddressesAll_f', 'POLYGON', addressall, spatial_reference=addressall)
-    logging.info('Copying Gwinnett addresses...')
-    gwinnett_copy = arcpy.Copy_management(address_gwinnett, fgdb + r'\address_gwinnett')
-    logging.info('Copying Rockdale addresses...')
-    rockdale_copy = arcpy.Copy_management(address_rockdale, fgdb + r'\address_rockdale')
-    logging.info('Copying Walton addresses...')
-    walton_copy = arcpy.Copy_management(address_walton, fgdb + r'\address_walton')
-    
-    logging.info('Adding fields...')
-    add_fields = ['geo_Number', 'geo_Address', 'geo_City', 'geo_State', 'geo_Zip']
-    for f in add_fields:
-        arcpy.AddField_management(addall_f, f, 'TEXT')
-        
-    flds = {gwinnett_copy: [["FULLADDR","geo_Address"], ["MUNICIPALITY","geo_City"], ["ZIP5", "geo_Zip"]],
-    rockdale_copy: [["ADDR","geo_Number"], ["Street_Nam","geo_Address"], ["City_Name", "geo_City"]],
-    walton_copy: [["ADDR", "geo_Address"], ["Mail_City", "geo_City"], ["Zip_Code", "geo_Zip"]]}
-
-    for k, v in flds.items():
-
-        fc = k
-        for f in v:
-            f_orig = f[0]
-            f_new = f[1]
-            arcpy.AddField_management(fc, f_new, 'TEXT')
-            arcpy.CalculateField_management(fc, f_new, '!{}!'.format(f_orig), 'PYTHON_9.3')
-
-    keep_flds = ["CREATED_USER", "CREATED_DATE", "LAST_EDITED_USER", "LAST_EDITED_DATE"]
-    for add_fc in [gwinnett_copy, rockdale_copy, walton_copy]:
-        all_flds = [fld.name for fld in arcpy.ListFields(add_fc) if (not fld.required and fld.name not in keep_flds)]
-        del_flds = [n for n in all_flds if n not in add_fields]
-        logging.info('Deleting fields from {}...'.format(add_fc))
-        arcpy.DeleteField_management(add_fc, del_flds)
-
-    # append addresses to addressesAll
-    logging.info('Appending addresses to AddressesAll_f...')
-    arcpy.Append_management([gwinnett, rockdale, walton], addall_f, 'NO_TEST')
+    addall_f = arcpy.CreateFeatureclass_management(fgdb, 'AddressesAll_f', 'POINT', addressall, spatial_reference=addressall)
+
+    # each county (county, fc, {geo field: county field}) into its own partition at once, then merged
+    tasks = [(county, fc, fld_map, addressall, partition_fldr) for county, fc, fld_map in sources]
+    results = countyIngest.ingest(_loadCountyAddresses, tasks, workers)
+    components = []
+    for (county, fc, fld_map), (partition, count, county_components) in zip(sources, results):
+        logging.info('{} addresses loaded from {}'.format(count, county))
+        components.extend(county_components)
+    count = countyIngest.merge([r[0] for r in results], addall_f, ['SHAPE@', 'Full_Address'])
+    stageMetrics.rows(read=sum(r[1] for r in results), written=count)
+
+    if components_db:
+        addressComponents.ComponentStore(components_db).write(components)
 
     return(addall_f)
 
-def populateAddressesAll(addressall):
+@stageMetrics.measure
+def updateAddressesAllSDE(addall_f, addall_sde):
 
-    logging.info('Updating Full_Address field...')
-    with arcpy.da.UpdateCursor(addressall, ['Full_Address', 'geo_Number', 'geo_Address', 'geo_City', 'geo_State', 'geo_Zip']) as ucur:
-        for row in ucur:
+    # apply only changed rows to addressesAll in SDE
+    logging.info('Syncing rows...')
+    syncSDE.syncFeatureClass(addall_f, addall_sde, ['Full_Address'])
 
-            for row in ucur:
+    logging.info('AddressesAll is updated!')
 
-                if row[4] == None:
-                    state = 'GA'
-                else:
-                    state = row[4]
 
-                l = [row[1], row[2], row[3], state, row[5]]
-                new_l = [x for x in l if x != None]
+def stageInputs(cxn, working_fldr):
+    '''Inputs of the stage by name, fingerprinted to skip unchanged runs'''
 
-                full_add = ' '.join(new_l)
+    external_fds = cxn + r"\sdeCity.GISADMIN.ExternalData"
+    inputs = {'counties': working_fldr + r"\supp_data\counties.json"}
+    # county address layers from the config, keyed by feature class name
+    for county, county_fc, fields in countyIngest.loadCounties(inputs['counties'], 'addresses'):
+        inputs[county_fc] = countyIngest.sourcePath(external_fds, county_fc)
+    return inputs
 
-                row[0] = full_add
-                ucur.updateRow(row)
+@stageMetrics.measure
+def runAddressesAll(version_cxn, working_fldr, checkpoints=None, county_workers=None):
+    '''
+    Builds AddressesAll in the working fgdb and syncs it to SDE, returns the
+    working fc. A completed prep is taken from checkpoints.
+    '''
 
-    logging.info('Deleting parsed address fields...')
-    del_fields = ['geo_Number', 'geo_Address', 'geo_City', 'geo_State', 'geo_Zip']
-    arcpy.DeleteField_management(addressall, del_fields)
+    datamining_fds = version_cxn + r'\sdeCity.GISADMIN.DataMining'
 
-    return(addressall)
+    # workspace
+    fgdb = working_fldr + r'\addressesAll.gdb'
+    arcpy.env.workspace = fgdb
 
-def updateAddressesAllSDE(addall_f, addall_sde):
+    # input feature classes
+    inputs = stageInputs(version_cxn, working_fldr)
 
-    # delete rows from addressesAll in SDE
-    logging.info('Deleting rows...')
-    arcpy.DeleteRows_management(addall_sde)
+    # output feature
+    addressesall_fc = datamining_fds + r'\sdeCity.GISADMIN.AddressesAll'
 
-    # append addressesAll to addressesAll in SDE
-    logging.info('Appending rows...')
-    arcpy.Append_management(addall_f, addall_sde, 'TEST')
+    # county source fields for each parsed address field, from counties.json
+    address_sources = [(county, inputs[county_fc], fld_map)
+                       for county, county_fc, fld_map in countyIngest.loadCounties(inputs['counties'], 'addresses')]
 
-    logging.info('AddressesAll is updated!')
+    # execute functs, the sync always reruns
+    checkpoints = checkpoints or stageCheckpoint.Checkpoints(None)
+    logging.info('Running prepAddressesAll')
+    addAll_out = checkpoints.run('prep', fgdb, prepAddressesAll, fgdb, addressesall_fc, address_sources, working_fldr,
+                                 working_fldr + '\\' + addressComponents.db_name, county_workers)
+    logging.info('Running updateAddressesAllSDE')
+    updateAddressesAllSDE(addAll_out, addressesall_fc)
+
+    return(str(addAll_out))
 
 
 if __name__ == '__main__':
 
+    parser = argparse.ArgumentParser(description='Updates the AddressesAll feature class')
+    parser.add_argument('--force', action='store_true', help='run even when no input changed since the last run')
+    parser.add_argument('--resume', action='store_true', help='reuse the stages a failed run completed when its inputs are unchanged')
+    args = parser.parse_args()
+
     try:
 
         # env
         arcpy.env.overwriteOutput = True
 
         # inputs
-        sde_cxn = r"D:\sdeConn\GISAdmin@sdeCity.sde"
         working_fldr = r'D:\prod-scripts\addressesall'
+        version_mgr = versionManager.VersionManager(parent_cxn, working_fldr, 'updateAddressesAll', sql_instance, "GISAdmin", "G1SAdm1n!",
+                                                    owner_cxn=owner_cxn)
 
         # maintain log file
         current = datetime.today()
@@ -127,62 +198,37 @@ if __name__ == '__main__':
                             format='%(levelname)s: %(asctime)s %(message)s',
                             datefmt='%m/%d/%Y %I:%M:%S')
         logging.info("Starting run... \n")
+        stageMetrics.configure('AddressesAll', working_fldr)
+
+        # skip the run when no input changed since the last successful run
+        fingerprints = sourceFingerprint.FingerprintStore(working_fldr + r"\source_fingerprints.json")
+        changed, prints = fingerprints.check('AddressesAll', stageInputs(parent_cxn, working_fldr))
+        if not changed and not args.force:
+            logging.info("Nothing to update, skipping run (--force runs anyway) \n ------------------------------------ \n\n")
+            sys.exit(0)
+        checkpoints = stageCheckpoint.Checkpoints(working_fldr + r"\stage_checkpoints.json", 'AddressesAll', prints, args.resume)
         
-        # removing version check
-        versions = [ver.name for ver in arcpy.da.ListVersions(sde_cxn)]
-        if 'GISADMIN.updateAddressesAll' in versions:
-            arcpy.DeleteVersion_management(sde_cxn, 'GISADMIN.updateAddressesAll')
-        # set up version
-        logging.info("creating updateAddressesAll version")
-        arcpy.CreateVersion_management(sde_cxn, 'sde.DEFAULT', 'updateAddressesAll', 'PRIVATE')
-        logging.info("creating connection file")
-        arcpy.CreateDatabaseConnection_management(working_fldr, "updateAddressesAll@sdeCity", "SQL_SERVER", r"Blade-3\SQL2014", "DATABASE_AUTH",
-                                                "GISAdmin", "G1SAdm1n!", "SAVE_USERNAME", "sdeCity", "", "TRANSACTIONAL", "GISADMIN.updateAddressesAll")
-
-        addressesAll_sde_cxn = working_fldr + r"\updateAddressesAll@sdeCity.sde"
-        datamining_fds = addressesAll_sde_cxn + r'\sdeCity.GISADMIN.DataMining'
-        external_fds = addressesAll_sde_cxn + r"\sdeCity.GISADMIN.ExternalData"
-
-        # workspace
-        fgdb = working_fldr + r'\addressesAll.gdb'
-        arcpy.env.workspace = fgdb
-        
-        # input feature classes
-        address_gwinnett = external_fds + r"\sdeCity.GISADMIN.GwinnettAddresses"
-        address_rockdale = external_fds + r"\sdeCity.GISADMIN.RockdaleAddresses"
-        address_walton = external_fds + r"\sdeCity.GISADMIN.WaltonAddresses"
-
-        # output feature
-        addressesall_fc = datamining_fds + r'\sdeCity.GISADMIN.AddressesAll'
+        # reuse the updateAddressesAll version and connection file, recreated only when unhealthy
+        with stageMetrics.step('version'):
+            addressesAll_sde_cxn = version_mgr.acquire(working_fldr + r"\logs\updateAddressesAllReset.txt")
 
         # execute functs
-        logging.info('Running prepAddressesAll')
-        addAll_out = prepAddressesAll(fgdb, addressesall_fc, address_gwinnett, address_rockdale, address_walton)
-        logging.info('Running populateAddressesAll')
-        addAll_final = populateAddressesAll(addAll_out)
-        logging.info('Running updateAddressesAllSDE')
-        updateAddressesAllSDE(addAll_final, addressesall_fc)
+        runAddressesAll(addressesAll_sde_cxn, working_fldr, checkpoints=checkpoints)
 
         # clean up, aisle 5
         logging.info("reconcile and posting edits to sde.DEFAULT")
-        logging.info("version updateAddressesAll will be deleted...")
-        arcpy.ReconcileVersions_management(addressesAll_sde_cxn, "ALL_VERSIONS", "sde.DEFAULT", "GISADMIN.updateAddressesAll", "LOCK_ACQUIRED", "", "", "", 
-                                           "POST", "DELETE_VERSION", working_fldr + r"\logs\updateAddressesAllReconcile.txt")
-        logging.info('deleting sde connection to removed version')
-        if os.path.exists(addressesAll_sde_cxn):
-            os.remove(addressesAll_sde_cxn)
+        with stageMetrics.step('reconcile'):
+            version_mgr.post(working_fldr + r"\logs\updateAddressesAllReconcile.txt")
 
+        fingerprints.save('AddressesAll', prints)
+        checkpoints.clear()
         logging.info("Success! \n ------------------------------------ \n\n")
 
     except Exception as e:
         logging.error("EXCEPTION OCCURRED", exc_info=True)
 
-        # removing version
-        versions = [ver.name for ver in arcpy.da.ListVersions(sde_cxn)]
-        if 'GISADMIN.updateAddressesAll' in versions:
-            arcpy.DeleteVersion_management(sde_cxn, 'GISADMIN.updateAddressesAll')
-        if os.path.exists(addressesAll_sde_cxn):
-            os.remove(addressesAll_sde_cxn)
+        # removing version, recreated next run if still in use
+        version_mgr.discard()
 
         logging.info("Quitting! \n ------------------------------------ \n\n")
 
@@ -7,155 +7,251 @@ _____________________________________________________________________
    Purpose:    Updates the ParcelsHiperweb feature class. Runs ad-hoc.
 _____________________________________________________________________
    History:     GTG     11/2020     Created
+                AG      10/2026     Moved address parsing to addressParser.py,
+                                    lookup lists are now hashed sets
+                AG      10/2026     Parsed addresses cached in Hiperweb_parse_cache.sqlite
+                AG      10/2026     Added parse_workers process pool mode
+                AG      10/2026     Delta sync to SDE replaces DeleteRows
+                                    and Append (syncSDE.py)
+                AG      10/2026     Stage body moved to runHiperweb() so runPipeline.py
+                                    can chain it
+                AG      10/2026     Run skipped when no input changed since the
+                                    last run (sourceFingerprint.py), --force
+                AG      10/2026     Steps timed with stageMetrics.py (wall, cpu,
+                                    peak RSS, rows), logs\metrics.jsonl
+                AG      10/2026     ParcelsHiperweb_f kept in_memory when small enough
+                                    (scratchWorkspace.py), --scratch
+                AG      10/2026     ParcelsAll loaded with bulkWriter.appendRows,
+                                    replaces FieldMappings + Append
+                AG      10/2026     Version and connection file kept between runs
+                                    (versionManager.py): reset by reconcile, posted
+                                    with KEEP_VERSION, recreated only when unhealthy
+                AG      10/2026     Lexicon loaded from the compiled parsing_lists.lexicon
+                                    (lexiconCompiler.py), StreetType in USPS standard form
+                AG      10/2026     Addresses found in AddressesAll's address_components.sqlite
+                                    are split from their number and street, free text parsed
+                                    only for the rest
+                AG      10/2026     Prep and parsed outputs checkpointed in Hiperweb.gdb
+                                    (stageCheckpoint.py), --resume
+                AG      10/2026     parse_workers parse each distinct address once
+                AG      10/2026     address_components.sqlite fingerprinted with the
+                                    other inputs, a rebuild reruns the stage
 _____________________________________________________________________
 '''
 
 import arcpy
 from arcpy import env
 import os
-import json
+import sys
+import argparse
 from datetime import datetime
 import logging
 
+import addressComponents
+import addressParser
+import bulkWriter
+import lexiconCompiler
+import parseCache
+import scratchWorkspace
+import sourceFingerprint
+import stageCheckpoint
+import stageMetrics
+import syncSDE
+import versionManager
+
+# AddressesAll working folder, where its address components are kept
+addressesall_fldr = r'D:\prod-scripts\addressesall'
+
+# geodatabase the stage reads and posts to, module level so runPipeline.py uses the same one
+parent_cxn = r"D:\sdeConn\GISAdmin@sdeCity.sde"
+sql_instance = r"Blade-3\SQL2014"
+# versions are deleted through the GISADMIN connection, as they always were here
+owner_cxn = parent_cxn
+
+@stageMetrics.measure
 def prepHiperweb(gdb, hiperweb, parcelsall, parcelno, fulladd):
 
-    # create hiperweb fc in fdb for working
+    # create hiperweb fc for working, in memory unless ParcelsAll is too big
     logging.info('Creating empty fc with hiperweb template...')
-    hiperweb_f = arcpy.CreateFeatureclass_management(gdb, 'ParcelsHiperweb_f', 'POLYGON', hiperweb, '', '', hiperweb)
+    hiperweb_f = scratchWorkspace.create(lambda ws, name: arcpy.CreateFeatureclass_management(ws, name, 'POLYGON', hiperweb, '', '', hiperweb),
+                                         gdb, 'ParcelsHiperweb_f', scratchWorkspace.rowCount(parcelsall))
 
-    # field mappings for append
-    logging.info('Building fieldmappings...')
-    fm_parcelno = arcpy.FieldMap()
-    fm_fulladd = arcpy.FieldMap()
-    fms = arcpy.FieldMappings()
-
-    fm_parcelno.addInputField(parcelsall, parcelno)
-    fm_fulladd.addInputField(parcelsall, fulladd)
-
-    parcelno_fld = fm_parcelno.outputField
-    parcelno_fld.name = parcelno
-    fm_parcelno.outputField = parcelno_fld
-
-    fulladd_fld = fm_fulladd.outputField
-    fulladd_fld.name = fulladd
-    fm_fulladd.outputField = fulladd_fld
-
-    fms.addFieldMap(fm_parcelno)
-    fms.addFieldMap(fm_fulladd)
-
-    # append parcelsAll to Hiperweb
+    # parcel number and full address from parcelsAll, mapping checked once
     logging.info('Appending rows...')
-    arcpy.Append_management(parcelsall, hiperweb_f, 'NO_TEST', fms)
+    count = bulkWriter.appendRows(parcelsall, hiperweb_f, [('SHAPE@', 'SHAPE@'), (parcelno, parcelno), (fulladd, fulladd)])
+    stageMetrics.rows(read=count, written=count)
 
     return(hiperweb_f)
 
-def populateHiperweb(hiperweb, fulladd, hiperweb_fld, stnum, stname, sttype, predir, postdir):
+@stageMetrics.measure
+def populateHiperweb(hiperweb, fulladd, hiperweb_fld, stnum, stname, sttype, predir, postdir, lexicon, cache=None, workers=1,
+                     components=None):
+
+    # parse through the on-disk cache when one is given
+    if cache:
+        parse_text = cache.parse
+    else:
+        parse_text = lambda address: addressParser.parseAddress(address, lexicon)
+
+    # addresses with ingest components only have their street line split
+    components = components or {}
+    def parse(address):
+        parts = components.get(address)
+        if parts is not None:
+            return addressParser.parseParts(address, parts[0], parts[1], lexicon)
+        return parse_text(address)
+
+    fields = [fulladd, hiperweb_fld, stnum, stname, sttype, predir, postdir]
+
+    if workers > 1:
+        # read addresses up front and parse each distinct cache miss once on a process pool
+        logging.info('Reading addresses...')
+        parsed = {}
+        misses = {}
+        read = 0
+        with arcpy.da.SearchCursor(hiperweb, ['OID@', fulladd]) as scur:
+            for oid, address in scur:
+                read += 1
+                if address != None:
+                    if address in components:
+                        parsed[oid] = parse(address)
+                        continue
+                    hit = cache.get(address) if cache else None
+                    if hit is None:
+                        misses.setdefault(address, []).append(oid)
+                    else:
+                        parsed[oid] = hit
+
+        logging.info('Parsing {} addresses on {} workers...'.format(len(misses), workers))
+        # each distinct address goes out under its first OID and fans back out to the rest
+        results = addressParser.parseParallel([(oids[0], address) for address, oids in misses.items()], lexicon, workers)
+        for address, oids in misses.items():
+            result = results[oids[0]]
+            for oid in oids:
+                parsed[oid] = result
+            if cache:
+                cache.add(address, result)
+
+        # one write pass in OID order
+        logging.info('Entering cursor...')
+        written = 0
+        with arcpy.da.UpdateCursor(hiperweb, ['OID@'] + fields[1:], sql_clause=(None, 'ORDER BY OBJECTID')) as ucur:
+            for row in ucur:
+                if row[0] in parsed:
+                    row[1:] = parsed[row[0]]
+                    ucur.updateRow(row)
+                    written += 1
+        stageMetrics.rows(read=read, written=written)
+
+        logging.info('Finished!')
+
+        return(hiperweb)
 
     logging.info('Entering cursor...')
-    
-    with arcpy.da.UpdateCursor(hiperweb, [fulladd, hiperweb_fld, stnum, stname, sttype, predir, postdir]) as ucur:
+
+    # parsed values come back in the same order as the cursor fields
+    count = 0
+    with arcpy.da.UpdateCursor(hiperweb, fields) as ucur:
         for row in ucur:
             if row[0] != None:
-                address_split = row[0].split(' GA ')
-                if len(address_split) > 2:
-                    address = ' '.join((row[0].split(' '))[:-2]).replace('<Null>', '').replace('<Nul.l>', '').replace('  ',' ').replace('  ',' ').strip()
-                else:
-                    address = ''.join(row[0].split(' GA ')[0]).replace('<Null>', '').replace('<Nul.l>', '').replace('  ',' ').replace('  ',' ').strip()
-                # hiperweb_fld
-                row[1] = address
-
-                # clean up for 2430 Tucker Dr... GYST
-                if address.split(' ')[1] == '-':
-                    templist = address.split(' ')
-                    del(templist[1:3])
-                    address = ' '.join(templist)
-
-                # removing text after comma, or text after subadd val, or removing city
-                commacheck = address.split(',')
-                dashcheck = address.split('-')
-                if len(commacheck) > 1:
-                    del(commacheck[1:])
-                    address_list = (''.join(commacheck).strip()).split(' ')
-                elif len(dashcheck) > 1:
-                    del(dashcheck[1:])
-                    address_list = (''.join(dashcheck).strip()).split(' ')
-                else:
-                    address_list = address.split(' ')
-                    subadd = [address_list.index(s) for s in address_list if s in subadd_list]
-                    if subadd:
-                        del(address_list[subadd[0]:])
-                    else: 
-                        if address_list[-1].upper() in city_list:
-                            del(address_list[-1])
-                        elif ' '.join(address_list[-2:]) in city_list:
-                            del(address_list[-2:])
-
-                # all invalid nulls, sub addresses, city, state, and zip info is removed!!
-
-                if address_list and address_list[0].isdigit():
-                    addnum = address_list[0]
-                    # stnum
-                    row[2] = addnum
-                    address_list.remove(addnum)
-
-                if address_list and address_list[0] in dir_list:
-                    predir_val = address_list[0]
-                    # predir
-                    row[5] = predir_val
-                    address_list.remove(predir_val)
-
-                if address_list and address_list[-1] in dir_list:
-                    postdir_val = address_list[-1]
-                    # postdir
-                    row[6] = postdir_val
-                    address_list.remove(postdir_val)
-
-                if address_list and address_list[0] == 'HWY':
-                    stname_val = ' '.join(address_list[:2])
-                    # stname
-                    row[3] = stname_val
-                elif address_list and address_list[-1] in sttype_list:
-                    sttype_val = address_list[-1]
-                    # sttype
-                    row[4] = sttype_val
-                    address_list.remove(sttype_val)
-                    stname_val = ' '.join(address_list)
-                    # stname
-                    row[3] = stname_val
-                else:
-                    stname_val = ' '.join(address_list)
-                    # stname
-                    row[3] = stname_val
-
+                row[1:] = parse(row[0])
             ucur.updateRow(row)
+            count += 1
+    stageMetrics.rows(read=count, written=count)
 
     logging.info('Finished!')
 
     return(hiperweb)
 
+@stageMetrics.measure
 def updateHiperwebSDE(hiperweb_f, hiperweb_sde):
 
-    # delete rows from hiperweb
-    logging.info('Deleting rows...')
-    arcpy.DeleteRows_management(hiperweb_sde)
-
-    # append parcelsAll to Hiperweb
-    logging.info('Appending rows...')
-    arcpy.Append_management(hiperweb_f, hiperweb_sde, 'TEST')
+    # apply only changed rows to hiperweb
+    logging.info('Syncing rows...')
+    syncSDE.syncFeatureClass(hiperweb_f, hiperweb_sde, ['Parcel_No', 'Full_Address'])
 
     logging.info('ParcelsHiperweb is updated!')
 
 
+def stageInputs(cxn, working_fldr):
+    '''Inputs of the stage by name, fingerprinted to skip unchanged runs'''
+
+    inputs = {'ParcelsAll': cxn + r'\sdeCity.GISADMIN.DataMining\sdeCity.GISADMIN.ParcelsAll',
+              'parsing_lists': working_fldr + r"\supp_data\parsing_lists.json"}
+    # written by AddressesAll, missing until its first run
+    components_db = addressesall_fldr + '\\' + addressComponents.db_name
+    if os.path.exists(components_db):
+        inputs['address_components'] = components_db
+    return inputs
+
+@stageMetrics.measure
+def runHiperweb(version_cxn, working_fldr, parcelsall=None, parse_workers=4, components_db=None, checkpoints=None):
+    '''
+    Builds ParcelsHiperweb in the working fgdb and syncs it to SDE, returns
+    the working fc. Completed stages are taken from checkpoints.
+    '''
+
+    datamining_fds = version_cxn + r'\sdeCity.GISADMIN.DataMining'
+
+    # workspace
+    fgdb = working_fldr + r'\Hiperweb.gdb'
+    arcpy.env.workspace = fgdb
+
+    # feature classes, a working ParcelsAll from the pipeline is used when given
+    hiperweb_fc = datamining_fds + r'\sdeCity.GISADMIN.ParcelsHiperweb'
+    inputs = stageInputs(version_cxn, working_fldr)
+    parcelsall_fc = parcelsall or inputs['ParcelsAll']
+
+    # compiled lookup sets for address parsing, recompiled when the json changes
+    lexicon, lexicon_digest = lexiconCompiler.loadLexicon(inputs['parsing_lists'])
+    # parsed addresses from earlier runs, cleared when the lexicon changes
+    parse_cache = parseCache.ParseCache(working_fldr + r"\Hiperweb_parse_cache.sqlite", lexicon, lexicon_digest)
+    # number and street kept by AddressesAll, keyed by the Full_Address ParcelsAll carries
+    components = addressComponents.ComponentStore(components_db or addressesall_fldr + '\\' + addressComponents.db_name).load()
+
+    # fields
+    parcelno_fld = 'Parcel_No'
+    fulladd_fld = 'Full_Address'
+    hiperweb_fld = 'Hiperweb_Address'
+    addnum_fld = 'StreetNumber'
+    stname_fld = 'StreetName'
+    sttype_fld = 'StreetType'
+    predir_fld = 'PreDirection'
+    postdir_fld = 'PostDirection'
+
+    # execute functs, parse_workers > 1 parses on a process pool, the sync always reruns
+    checkpoints = checkpoints or stageCheckpoint.Checkpoints(None)
+    logging.info('Running prepHiperweb')
+    hiperweb_out = checkpoints.run('prep', fgdb, prepHiperweb, fgdb, hiperweb_fc, parcelsall_fc, parcelno_fld, fulladd_fld)
+    logging.info('Running populateHiperweb')
+    with parse_cache:
+        hiperweb_final = checkpoints.run('populate', fgdb, populateHiperweb, hiperweb_out, fulladd_fld, hiperweb_fld, addnum_fld, stname_fld,
+                                         sttype_fld, predir_fld, postdir_fld, lexicon, parse_cache, parse_workers, components)
+    logging.info('Running updateHiperwebSDE')
+    updateHiperwebSDE(hiperweb_final, hiperweb_fc)
+
+    return(str(hiperweb_final))
+
+
 if __name__ == '__main__':
 
+    parser = argparse.ArgumentParser(description='Updates the ParcelsHiperweb feature class')
+    parser.add_argument('--force', action='store_true', help='run even when no input changed since the last run')
+    parser.add_argument('--resume', action='store_true', help='reuse the stages a failed run completed when its inputs are unchanged')
+    parser.add_argument('--scratch', choices=scratchWorkspace.modes, default=scratchWorkspace.mode,
+                        help='intermediates in_memory up to a row threshold (auto), always (memory) or in the fgdb (disk)')
+    args = parser.parse_args()
+    scratchWorkspace.mode = args.scratch
+
     try:
 
         # env
         arcpy.env.overwriteOutput = True
 
         # inputs
-        sde_cxn = r"D:\sdeConn\GISAdmin@sdeCity.sde"
         working_fldr = r'D:\prod-scripts\hiperweb'
+        version_mgr = versionManager.VersionManager(parent_cxn, working_fldr, 'updateHiperweb', sql_instance, "GISAdmin", "G1SAdm1n!",
+                                                    owner_cxn=owner_cxn)
 
         # maintain log file
         current = datetime.today()
@@ -165,75 +261,37 @@ if __name__ == '__main__':
                             format='%(levelname)s: %(asctime)s %(message)s',
                             datefmt='%m/%d/%Y %I:%M:%S')
         logging.info("Starting run... \n")
-        
-        # load json array for global lists
-        text = open(working_fldr + r"\supp_data\parsing_lists.json").read()
-        json_array = json.loads(text)
-
-        dir_list = json_array['dir_list']
-        subadd_list = json_array['subadd_list']
-        city_list = json_array['city_list']
-        sttype_list = json_array['sttype_list']
-
-        # removing version check
-        versions = [ver.name for ver in arcpy.da.ListVersions(sde_cxn)]
-        if 'GISADMIN.updateHiperweb' in versions:
-            arcpy.DeleteVersion_management(sde_cxn, 'GISADMIN.updateHiperweb')
-        # set up version
-        logging.info("creating updateHiperweb version")
-        arcpy.CreateVersion_management(sde_cxn, 'sde.DEFAULT', 'updateHiperweb', 'PRIVATE')
-        logging.info("creating connection file")
-        arcpy.CreateDatabaseConnection_management(working_fldr, "updateHiperweb@sdeCity", "SQL_SERVER", r"Blade-3\SQL2014", "DATABASE_AUTH",
-                                                "GISAdmin", "G1SAdm1n!", "SAVE_USERNAME", "sdeCity", "", "TRANSACTIONAL", "GISADMIN.updateHiperweb")
-        hiperweb_sde_cxn = working_fldr + r"\updateHiperweb@sdeCity.sde"
-        datamining_fds = hiperweb_sde_cxn + r'\sdeCity.GISADMIN.DataMining'
-
-        # workspace
-        fgdb = working_fldr + r'\Hiperweb.gdb'
-        arcpy.env.workspace = fgdb
-        
-        # feature classes
-        hiperweb_fc = datamining_fds + r'\sdeCity.GISADMIN.ParcelsHiperweb'
-        parcelsall_fc = datamining_fds + r'\sdeCity.GISADMIN.ParcelsAll'
-
-        # fields
-        parcelno_fld = 'Parcel_No'
-        fulladd_fld = 'Full_Address'
-        hiperweb_fld = 'Hiperweb_Address'
-        addnum_fld = 'StreetNumber'
-        stname_fld = 'StreetName'
-        sttype_fld = 'StreetType'
-        predir_fld = 'PreDirection'
-        postdir_fld = 'PostDirection'
+        stageMetrics.configure('Hiperweb', working_fldr)
+
+        # skip the run when no input changed since the last successful run
+        fingerprints = sourceFingerprint.FingerprintStore(working_fldr + r"\source_fingerprints.json")
+        changed, prints = fingerprints.check('Hiperweb', stageInputs(parent_cxn, working_fldr))
+        if not changed and not args.force:
+            logging.info("Nothing to update, skipping run (--force runs anyway) \n ------------------------------------ \n\n")
+            sys.exit(0)
+        checkpoints = stageCheckpoint.Checkpoints(working_fldr + r"\stage_checkpoints.json", 'Hiperweb', prints, args.resume)
+
+        # reuse the updateHiperweb version and connection file, recreated only when unhealthy
+        with stageMetrics.step('version'):
+            hiperweb_sde_cxn = version_mgr.acquire(working_fldr + r"\logs\updateHiperwebReset.txt")
 
         # execute functs
-        logging.info('Running prepHiperweb')
-        hiperweb_out = prepHiperweb(fgdb, hiperweb_fc, parcelsall_fc, parcelno_fld, fulladd_fld)
-        logging.info('Running populateHiperweb')
-        hiperweb_final = populateHiperweb(hiperweb_out, fulladd_fld, hiperweb_fld, addnum_fld, stname_fld, sttype_fld, predir_fld, postdir_fld)
-        logging.info('Running updateHiperwebSDE')
-        updateHiperwebSDE(hiperweb_final, hiperweb_fc)
+        runHiperweb(hiperweb_sde_cxn, working_fldr, checkpoints=checkpoints)
 
         # clean up, aisle 5
         logging.info("reconcile and posting edits to sde.DEFAULT")
-        logging.info("version updateHiperweb will be deleted...")
-        arcpy.ReconcileVersions_management(hiperweb_sde_cxn, "ALL_VERSIONS", "sde.DEFAULT", "GISADMIN.updateHiperweb", "LOCK_ACQUIRED", "", "", "", 
-                                           "POST", "DELETE_VERSION", working_fldr + r"\logs\updateHiperwebReconcile.txt")
-        logging.info('deleting sde connection to removed version')
-        if os.path.exists(hiperweb_sde_cxn):
-            os.remove(hiperweb_sde_cxn)
+        with stageMetrics.step('reconcile'):
+            version_mgr.post(working_fldr + r"\logs\updateHiperwebReconcile.txt")
 
+        fingerprints.save('Hiperweb', prints)
+        checkpoints.clear()
         logging.info("Success! \n ------------------------------------ \n\n")
 
     except Exception as e:
         logging.error("EXCEPTION OCCURRED", exc_info=True)
 
-        # removing version
-        versions = [ver.name for ver in arcpy.da.ListVersions(sde_cxn)]
-        if 'GISADMIN.updateHiperweb' in versions:
-            arcpy.DeleteVersion_management(sde_cxn, 'GISADMIN.updateHiperweb')
-        if os.path.exists(hiperweb_sde_cxn):
-            os.remove(hiperweb_sde_cxn)
+        # removing version, recreated next run if still in use
+        version_mgr.discard()
 
         logging.info("Quitting! \n ------------------------------------ \n\n")
 
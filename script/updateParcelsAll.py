@@ -7,104 +7,217 @@ _____________________________________________________________________
    Purpose:    Updates the ParcelsAll feature class. Run ad-hoc.
 _____________________________________________________________________
    History:     GTG     11/2020     Created
+                AG      10/2026     Delta sync to SDE replaces DeleteRows
+                                    and Append (syncSDE.py)
+                AG      10/2026     Address join uses an in-memory point index
+                                    (spatialIndex.py), spatial join kept as
+                                    engine='spatialjoin'
+                AG      10/2026     Stage body moved to runParcelsAll() so runPipeline.py
+                                    can chain it
+                AG      10/2026     Run skipped when no input changed since the
+                                    last run (sourceFingerprint.py), --force
+                AG      10/2026     Steps timed with stageMetrics.py (wall, cpu,
+                                    peak RSS, rows), logs\metrics.jsonl
+                AG      10/2026     par_add_sj written to scratch, in_memory when small
+                                    enough (scratchWorkspace.py), --scratch
+                AG      10/2026     County parcels loaded with bulkWriter.appendRows,
+                                    replaces FieldMappings + Append
+                AG      10/2026     Version and connection file kept between runs
+                                    (versionManager.py): reset by reconcile, posted
+                                    with KEEP_VERSION, recreated only when unhealthy
+                AG      10/2026     engine='numpy' reads the spatial join with
+                                    TableToNumPyArray and updates through columnar.py
+                AG      10/2026     Prep and Full_Address outputs checkpointed in
+                                    parcelsAll.gdb (stageCheckpoint.py), --resume
+                AG      10/2026     Counties and their Parcel_No fields read from
+                                    supp_data\counties.json and loaded in parallel,
+                                    one partition per county (countyIngest.py)
+                AG      10/2026     engine='spatialjoin' writes the join back with a
+                                    sorted merge join (mergeJoin.py), replaces the
+                                    hard-coded OID slices and their dictionaries
+                AG      10/2026     Partitions merged on every field the counties map
+                AG      10/2026     engine='numpy' and columnar.py removed, slower and
+                                    larger than the cursor paths and '' came back null
 _____________________________________________________________________
 '''
 
 import arcpy
 from arcpy import env
 import os
+import sys
+import argparse
 from datetime import datetime
 import logging
 
-def prepParcelsAll(gdb, parcelsall, gwinnett, rockdale, walton):
+import sourceFingerprint
+import bulkWriter
+import countyIngest
+import mergeJoin
+import scratchWorkspace
+import spatialIndex
+import stageCheckpoint
+import stageMetrics
+import syncSDE
+import versionManager
+
+# geodatabase the stage reads and posts to, module level so runPipeline.py uses the same one
+parent_cxn = r"D:\sdeConn\GISAdmin@sdeCity.sde"
+sql_instance = r"Blade-3\SQL2014"
+# versions are deleted through the GISADMIN connection, as they always were here
+owner_cxn = parent_cxn
+
+def _loadCountyParcels(task):
+    '''Worker: one county's parcels into its partition, returns (partition, rows)'''
+
+    county, county_fc, fields, template, partition_fldr = task
+    partition = countyIngest.partitionFor(partition_fldr, county, template, 'ParcelsAll_' + county)
+    # county parcel number field for Parcel_No, mapping checked once
+    return partition, bulkWriter.appendRows(county_fc, partition, [('SHAPE@', 'SHAPE@')] + sorted(fields.items()))
+
+@stageMetrics.measure
+def prepParcelsAll(gdb, parcelsall, sources, partition_fldr, workers=None):
 
     # create parcelsall fc in fgdb for working
     parcelsall_f = arcpy.CreateFeatureclass_management(gdb, 'ParcelsAll_f', 'POLYGON', parcelsall, spatial_reference=parcelsall)
 
-    # field mappings for append
-    logging.info('Building fieldmappings...')
-    fm_gwinnett = arcpy.FieldMap()
-    fm_rockdale = arcpy.FieldMap()
-    fm_walton = arcpy.FieldMap()
-    fms = arcpy.FieldMappings()
+    # each county (county, fc, {field: county field}) into its own partition at once, then merged
+    tasks = [(county, county_fc, fields, parcelsall, partition_fldr) for county, county_fc, fields in sources]
+    results = countyIngest.ingest(_loadCountyParcels, tasks, workers)
+    for (county, county_fc, fields), (partition, count) in zip(sources, results):
+        logging.info('{} parcels loaded from {}'.format(count, county))
+    read = sum(count for partition, count in results)
+    count = countyIngest.merge([partition for partition, count in results], parcelsall_f, countyIngest.mergeFields(sources))
+    logging.info('{} parcels loaded'.format(count))
+    stageMetrics.rows(read=read, written=count)
 
-    fm_gwinnett.addInputField(gwinnett, 'PIN')
-    fm_rockdale.addInputField(rockdale, 'PARCEL_NO')
-    fm_walton.addInputField(walton, 'Parcel_No')
+    return(parcelsall_f)
 
-    gwinnet_fld = fm_gwinnett.outputField
-    gwinnet_fld.name = 'Parcel_No'
-    fm_gwinnett.outputField = gwinnet_fld
+@stageMetrics.measure
+def populateParcelsAll(parcelsall, addressall, engine='index'):
 
-    rockdale_fld = fm_rockdale.outputField
-    rockdale_fld.name = 'Parcel_No'
-    fm_rockdale.outputField = rockdale_fld
+    if engine == 'index':
+        return(populateParcelsAllIndex(parcelsall, addressall))
 
-    walton_fld = fm_walton.outputField
-    walton_fld.name = 'Parcel_No'
-    fm_walton.outputField = walton_fld
+    # spatial join between parcels and addresses to get full address field
+    logging.info("Spatial join between ParcelsAll and AddressesAll...")
+    def spatialJoin(ws, name):
+        arcpy.SpatialJoin_analysis(parcelsall, addressall, ws + '\\' + name, "JOIN_ONE_TO_ONE", "KEEP_ALL", "", "INTERSECT")
+    parcel_address_sj = scratchWorkspace.create(spatialJoin, arcpy.env.workspace, 'par_add_sj', scratchWorkspace.rowCount(parcelsall))
 
-    fms.addFieldMap(fm_gwinnett)
-    fms.addFieldMap(fm_rockdale)
-    fms.addFieldMap(fm_walton)
+    return(updateFullAddress(parcelsall, parcel_address_sj))
 
-    # append parcels to parcelsAll
-    arcpy.Append_management([gwinnett, rockdale, walton], parcelsall_f, 'NO_TEST', fms)
+def updateFullAddress(parcelsall, parcel_address_sj):
 
-    return(parcelsall_f)
+    # join output sorted on TARGET_FID merged with ParcelsAll sorted on OBJECTID,
+    # one pass over each and no lookup held in memory
+    logging.info("Updating Full Address")
+    read, written = mergeJoin.mergeUpdate(parcelsall, ["Full_Address"], parcel_address_sj, "TARGET_FID", ["Full_Address_1"])
+    stageMetrics.rows(read=read, written=written)
 
-def populateParcelsAll(parcelsall, addressall):
+    return(parcelsall)
 
-    # spatial join between parcels and addresses to get full address field
-    logging.info("Spatial join between ParcelsAll and AddressesAll...")
-    parcel_address_sj = arcpy.SpatialJoin_analysis(parcelsall, addressall, "par_add_sj", "JOIN_ONE_TO_ONE", "KEEP_ALL", "", "INTERSECT")
-
-    # to avoid join table limitations, creating dictionaries to use in update cursor
-    logging.info("Creating full address and account/cust. calss. dictionary for updating...")
-    sj_id = 'TARGET_FID'
-    oid = 'OBJECTID'
-    whereclause = ['{} < 135653', '{} BETWEEN 135653 AND 271304', '{} > 271304']
-
-    for w in whereclause:
-        # full address dictionary
-        lutDict_add = dict([(row[0], (row[1])) for row in arcpy.da.SearchCursor(parcel_address_sj, ["TARGET_FID", "Full_Address_1"], w.format(sj_id))])
-    
-        # update cursor for final ParcelsAll output
-        logging.info("Updating Full Address")
-        with arcpy.da.UpdateCursor(parcelsall, ["OBJECTID", "Full_Address"], w.format(oid)) as ucur:
-            for urow in ucur:
-                joinFld = urow[0]
-                if joinFld in lutDict_add.keys():
-                    urow[1] = lutDict_add[joinFld]
-                ucur.updateRow(urow)
-        lutDict_add.clear()
-        del(lutDict_add)
+def populateParcelsAllIndex(parcelsall, addressall):
+
+    # index address points in memory, no spatial join output is written
+    logging.info("Indexing AddressesAll points...")
+    address_idx = spatialIndex.PointIndex()
+    count = 0
+    with arcpy.da.SearchCursor(addressall, ["OID@", "SHAPE@XY", "Full_Address"]) as scur:
+        for oid, xy, fulladd in scur:
+            count += 1
+            if xy and xy[0] is not None:
+                address_idx.insert(xy[0], xy[1], (oid, fulladd))
+    address_idx.build()
+    stageMetrics.rows(read=count)
+
+    # first address point intersecting each parcel, same as JOIN_ONE_TO_ONE
+    logging.info("Updating Full Address")
+    count = 0
+    with arcpy.da.UpdateCursor(parcelsall, ["SHAPE@", "Full_Address"]) as ucur:
+        for urow in ucur:
+            match = None
+            if urow[0] is not None:
+                match = address_idx.firstInPolygon(spatialIndex.ringsFromGeometry(urow[0]))
+            urow[1] = match[1] if match else None
+            ucur.updateRow(urow)
+            count += 1
+    stageMetrics.rows(read=count, written=count)
 
     return(parcelsall)
 
+@stageMetrics.measure
 def updateParcelsAllSDE(parcelsall_f, parcelsall_sde):
 
-    # delete rows from parcelsAll in SDE
-    logging.info('Deleting rows...')
-    arcpy.DeleteRows_management(parcelsall_sde)
-
-    # append parcelsAll to parcelsAll in SDE
-    logging.info('Appending rows...')
-    arcpy.Append_management(parcelsall_f, parcelsall_sde, 'TEST')
+    # apply only changed rows to parcelsAll in SDE
+    logging.info('Syncing rows...')
+    syncSDE.syncFeatureClass(parcelsall_f, parcelsall_sde, ['Parcel_No', 'Full_Address'])
 
     logging.info('ParcelsAll is updated!')
 
 
+def stageInputs(cxn, working_fldr):
+    '''Inputs of the stage by name, fingerprinted to skip unchanged runs'''
+
+    datamining_fds = cxn + r'\sdeCity.GISADMIN.DataMining'
+    external_fds = cxn + r"\sdeCity.GISADMIN.ExternalData"
+    inputs = {'AddressesAll': datamining_fds + r'\sdeCity.GISADMIN.AddressesAll',
+              'counties': working_fldr + r"\supp_data\counties.json"}
+    # county parcel layers from the config, keyed by feature class name
+    for county, county_fc, fields in countyIngest.loadCounties(inputs['counties'], 'parcels'):
+        inputs[county_fc] = countyIngest.sourcePath(external_fds, county_fc)
+    return inputs
+
+@stageMetrics.measure
+def runParcelsAll(version_cxn, working_fldr, addressesall=None, checkpoints=None, county_workers=None):
+    '''
+    Builds ParcelsAll in the working fgdb and syncs it to SDE, returns the
+    working fc. Completed stages are taken from checkpoints.
+    '''
+
+    datamining_fds = version_cxn + r'\sdeCity.GISADMIN.DataMining'
+
+    # workspace
+    fgdb = working_fldr + r'\parcelsAll.gdb'
+    arcpy.env.workspace = fgdb
+
+    # feature classes, a working AddressesAll from the pipeline is joined when given
+    inputs = stageInputs(version_cxn, working_fldr)
+    addressesall_fc = addressesall or inputs['AddressesAll']
+    parcelsall_fc = datamining_fds + r'\sdeCity.GISADMIN.ParcelsAll'
+    county_sources = [(county, inputs[county_fc], fields)
+                      for county, county_fc, fields in countyIngest.loadCounties(inputs['counties'], 'parcels')]
+
+    # execute functs, the sync always reruns
+    checkpoints = checkpoints or stageCheckpoint.Checkpoints(None)
+    logging.info('Running prepParcelsAll')
+    parcelsAll_out = checkpoints.run('prep', fgdb, prepParcelsAll, fgdb, parcelsall_fc, county_sources, working_fldr, county_workers)
+    logging.info('Running populateParcelsAll')
+    parcelsAll_final = checkpoints.run('populate', fgdb, populateParcelsAll, parcelsAll_out, addressesall_fc)
+    logging.info('Running updateParcelsAllSDE')
+    updateParcelsAllSDE(parcelsAll_final, parcelsall_fc)
+
+    return(str(parcelsAll_final))
+
+
 if __name__ == '__main__':
 
+    parser = argparse.ArgumentParser(description='Updates the ParcelsAll feature class')
+    parser.add_argument('--force', action='store_true', help='run even when no input changed since the last run')
+    parser.add_argument('--resume', action='store_true', help='reuse the stages a failed run completed when its inputs are unchanged')
+    parser.add_argument('--scratch', choices=scratchWorkspace.modes, default=scratchWorkspace.mode,
+                        help='intermediates in_memory up to a row threshold (auto), always (memory) or in the fgdb (disk)')
+    args = parser.parse_args()
+    scratchWorkspace.mode = args.scratch
+
     try:
 
         # env
         arcpy.env.overwriteOutput = True
 
         # inputs
-        sde_cxn = r"D:\sdeConn\GISAdmin@sdeCity.sde"
         working_fldr = r'D:\prod-scripts\parcelsall'
+        version_mgr = versionManager.VersionManager(parent_cxn, working_fldr, 'updateParcelsAll', sql_instance, "GISAdmin", "G1SAdm1n!",
+                                                    owner_cxn=owner_cxn)
 
         # maintain log file
         current = datetime.today()
@@ -114,61 +227,37 @@ if __name__ == '__main__':
                             format='%(levelname)s: %(asctime)s %(message)s',
                             datefmt='%m/%d/%Y %I:%M:%S')
         logging.info("Starting run... \n")
+        stageMetrics.configure('ParcelsAll', working_fldr)
+
+        # skip the run when no input changed since the last successful run
+        fingerprints = sourceFingerprint.FingerprintStore(working_fldr + r"\source_fingerprints.json")
+        changed, prints = fingerprints.check('ParcelsAll', stageInputs(parent_cxn, working_fldr))
+        if not changed and not args.force:
+            logging.info("Nothing to update, skipping run (--force runs anyway) \n ------------------------------------ \n\n")
+            sys.exit(0)
+        checkpoints = stageCheckpoint.Checkpoints(working_fldr + r"\stage_checkpoints.json", 'ParcelsAll', prints, args.resume)
         
-        # removing version check
-        versions = [ver.name for ver in arcpy.da.ListVersions(sde_cxn)]
-        if 'GISADMIN.updateParcelsAll' in versions:
-            arcpy.DeleteVersion_management(sde_cxn, 'GISADMIN.updateParcelsAll')
-        # set up version
-        logging.info("creating updateparcelsAll version")
-        arcpy.CreateVersion_management(sde_cxn, 'sde.DEFAULT', 'updateParcelsAll', 'PRIVATE')
-        logging.info("creating connection file")
-        arcpy.CreateDatabaseConnection_management(working_fldr, "updateParcelsAll@sdeCity", "SQL_SERVER", r"Blade-3\SQL2014", "DATABASE_AUTH",
-                                                "GISAdmin", "G1SAdm1n!", "SAVE_USERNAME", "sdeCity", "", "TRANSACTIONAL", "GISADMIN.updateParcelsAll")
-
-        parcelsAll_sde_cxn = working_fldr + r"\updateParcelsAll@sdeCity.sde"
-        datamining_fds = parcelsAll_sde_cxn + r'\sdeCity.GISADMIN.DataMining'
-        external_fds = parcelsAll_sde_cxn + r"\sdeCity.GISADMIN.ExternalData"
-
-        # workspace
-        fgdb = working_fldr + r'\parcelsAll.gdb'
-        arcpy.env.workspace = fgdb
-        
-        # feature classes
-        addressesall_fc = datamining_fds + r'\sdeCity.GISADMIN.AddressesAll'
-        parcelsall_fc = datamining_fds + r'\sdeCity.GISADMIN.ParcelsAll'
-        parcel_gwinnett = external_fds + r"\sdeCity.GISADMIN.GwinnettParcels"
-        parcel_rockdale = external_fds + r"\sdeCity.GISADMIN.RockdaleParcels"
-        parcel_walton = external_fds + r"\sdeCity.GISADMIN.WaltonParcels"
+        # reuse the updateParcelsAll version and connection file, recreated only when unhealthy
+        with stageMetrics.step('version'):
+            parcelsAll_sde_cxn = version_mgr.acquire(working_fldr + r"\logs\updateparcelsAllReset.txt")
 
         # execute functs
-        logging.info('Running prepParcelsAll')
-        parcelsAll_out = prepParcelsAll(fgdb, parcelsall_fc, parcel_gwinnett, parcel_rockdale, parcel_walton)
-        logging.info('Running populateParcelsAll')
-        parcelsAll_final = populateParcelsAll(parcelsAll_out, addressesall_fc)
-        logging.info('Running updateParcelsAllSDE')
-        updateParcelsAllSDE(parcelsAll_final, parcelsall_fc)
+        runParcelsAll(parcelsAll_sde_cxn, working_fldr, checkpoints=checkpoints)
 
         # clean up, aisle 5
         logging.info("reconcile and posting edits to sde.DEFAULT")
-        logging.info("version updateparcelsAll will be deleted...")
-        arcpy.ReconcileVersions_management(parcelsAll_sde_cxn, "ALL_VERSIONS", "sde.DEFAULT", "GISADMIN.updateParcelsAll", "LOCK_ACQUIRED", "", "", "", 
-                                           "POST", "DELETE_VERSION", working_fldr + r"\logs\updateparcelsAllReconcile.txt")
-        logging.info('deleting sde connection to removed version')
-        if os.path.exists(parcelsAll_sde_cxn):
-            os.remove(parcelsAll_sde_cxn)
+        with stageMetrics.step('reconcile'):
+            version_mgr.post(working_fldr + r"\logs\updateparcelsAllReconcile.txt")
 
+        fingerprints.save('ParcelsAll', prints)
+        checkpoints.clear()
         logging.info("Success! \n ------------------------------------ \n\n")
 
     except Exception as e:
         logging.error("EXCEPTION OCCURRED", exc_info=True)
 
-        # removing version
-        versions = [ver.name for ver in arcpy.da.ListVersions(sde_cxn)]
-        if 'GISADMIN.updateParcelsAll' in versions:
-            arcpy.DeleteVersion_management(sde_cxn, 'GISADMIN.updateParcelsAll')
-        if os.path.exists(parcelsAll_sde_cxn):
-            os.remove(parcelsAll_sde_cxn)
+        # removing version, recreated next run if still in use
+        version_mgr.discard()
 
         logging.info("Quitting! \n ------------------------------------ \n\n")
 
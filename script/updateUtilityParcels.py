@@ -41,22 +41,107 @@ _____________________________________________________________________
                                     adding new line to remove version.
                 JB      02/11/2021  Deleting updatParcel version using SDE, not GISADMIN.
                 JB      11/23/2021  Adding recycle routes populateServiceFields function.
+                AG      10/2026     Delta sync to SDE replaces DeleteRows and Append
+                                    (syncSDE.py)
+                AG      10/2026     Service fields set from the ServiceInfo join in one
+                                    pass instead of a selection per service
+                AG      10/2026     Limb, sanitation and recycle routes assigned by
+                                    parcel center in one sweep (routeIndex.py), route
+                                    index kept in route_index.pkl
+                AG      10/2026     Accounts resolved streaming ServiceInfo once, gas
+                                    account wins. Replaces par_serv_sj one-to-many join
+                                    whose str TARGET_FID keys never matched
+                AG      10/2026     Publish stages rows in the version with the service
+                                    running and checks counts. Service is only stopped
+                                    around the post when stop_service is set (serviceWindow)
+                AG      10/2026     get_token and serviceStartStop replaced by agsAdmin.py
+                                    client with cached token, keep-alive and retries
+                AG      10/2026     Stage body moved to runUtilityParcels() so runPipeline.py
+                                    can chain it
+                AG      10/2026     Run skipped when no input changed since the
+                                    last run (sourceFingerprint.py), --force
+                AG      10/2026     Steps timed with stageMetrics.py (wall, cpu,
+                                    peak RSS, rows), logs\metrics.jsonl
+                AG      10/2026     UtilityParcels_f kept in_memory when small enough
+                                    (scratchWorkspace.py), --scratch
+                AG      10/2026     Version and connection file kept between runs
+                                    (versionManager.py), no longer deleted after the
+                                    post, so other GISADMIN sessions are not disconnected
+                AG      10/2026     engine='numpy' writes service fields and accounts
+                                    through columnar.py
+                AG      10/2026     Prep and service field outputs checkpointed in
+                                    working.gdb (stageCheckpoint.py), --resume
+                AG      10/2026     Service area membership of each parcel kept in
+                                    service_area_index.pkl (serviceAreaIndex.py), only
+                                    crossing and changed parcels are clipped
+                AG      10/2026     A failed restart after a failed swap is logged,
+                                    the swap's error is the one raised
+                AG      10/2026     Versions deleted through the sde owner connection
+                                    again (owner_cxn), as in the 02/11/2021 fix
+                AG      10/2026     Failed runs leave the restart to serviceWindow
+                AG      10/2026     engine='numpy' and columnar.py removed, the update
+                                    cursor is the only write path
 _____________________________________________________________________
 '''
 
 import arcpy
 from arcpy import env
 import os
-import json, urllib, urllib2
+import sys
+import argparse
 import contextlib
 from datetime import datetime
 import logging
-
-def prepUtilityParcels(gdb, parcelsall, servicearea):
-
-    # create utilityparcels fc in fgdb for working 
-    logging.info('Creating copy of ParcelsAll to fgdb for working...')
-    utilityparcels_f = arcpy.Clip_analysis(parcelsall, servicearea, gdb + r'\UtilityParcels_f')
+import time
+
+import agsAdmin
+import routeIndex
+import scratchWorkspace
+import serviceAreaIndex
+import sourceFingerprint
+import spatialIndex
+import stageCheckpoint
+import stageMetrics
+import syncSDE
+import versionManager
+
+# geodatabase the stage reads and posts to, module level so runPipeline.py uses the same one
+parent_cxn = r"D:\sdeConn\GISProd_Alias\Alias@GISProd@GISAdmin@sdeCity.sde"
+sql_instance = r"ch-server-sql\sql2019GISProd"
+# versions are deleted using sde owner, not gisadmin (02/11/2021)
+owner_cxn = r'D:\sdeConn\GISProd_Alias\Alias@GISProd@sde@sdeCity.sde'
+
+# service inputs, module level so the pipeline runner can publish too
+# credentials
+admin_user = "siteadmin"
+admin_pass = "colg1sadmin"
+# server info
+server_name = "gis-app.lawrencevillega.org"
+port = "6443"
+# service name
+service_folder = "MyCityServices"
+service_name = "MyCityServices.MapServer"
+# token expires in 12 hours
+expiration = 720
+# status polls give up after 2 minutes
+status_timeout = 120
+# stop the service while posting, the load itself never needs it stopped
+stop_service = False
+
+@stageMetrics.measure
+def prepUtilityParcels(gdb, parcelsall, servicearea, membership_cache=None):
+
+    # create utilityparcels fc for working, in memory unless ParcelsAll is too big
+    logging.info('Creating copy of ParcelsAll for working...')
+    if membership_cache:
+        # parcels known to be inside copied, outside skipped, only crossing ones clipped
+        utilityparcels_f = scratchWorkspace.create(
+            lambda ws, name: serviceAreaIndex.clipParcels(parcelsall, servicearea, ws, name, membership_cache),
+            gdb, 'UtilityParcels_f', scratchWorkspace.rowCount(parcelsall))
+    else:
+        utilityparcels_f = scratchWorkspace.create(lambda ws, name: arcpy.Clip_analysis(parcelsall, servicearea, ws + '\\' + name),
+                                                   gdb, 'UtilityParcels_f', scratchWorkspace.rowCount(parcelsall))
+        stageMetrics.rows(written=int(arcpy.GetCount_management(utilityparcels_f).getOutput(0)))
 
     # adding service fields
     fields = {'Electric':10, 'Garbage':10, 'Gas':10, 'Security_Lights':10, 'Sewer':10, 'Stormwater':10, 'Water':10, 
@@ -72,200 +157,223 @@ def prepUtilityParcels(gdb, parcelsall, servicearea):
 
     return(utilityparcels_f)
 
-def populateServiceFields(utilityparcels, serviceinfo, limb, sanitation, recycle):
-
-    # creating feature layers for selection
-    logging.info('Making feature layer of utility parcels for selection...')
-    utilityparcels_lyr = arcpy.MakeFeatureLayer_management(utilityparcels, 'utilityparcels_lyr')
+@stageMetrics.measure
+def populateServiceFields(utilityparcels, serviceinfo, limb, sanitation, recycle, route_cache):
 
     # dictionary with vaues in ServiceInfo as keys, and field names in utility parcels as values
     svc_dict = {'GAS':'Gas', 'ELECTRIC':'Electric', 'GARBAGE':'Garbage', 'STORMWATER FEE':'Stormwater', 'SHD SWR':'Stormwater', 
                 'SEWER':'Sewer', 'WATER':'Water', 'SHD WTR':'Water', 'SECURITY LIGHTS':'Security_Lights'}
 
-    logging.info("Running selections to find service by parcel...")
-    # loop through items to populate service fields 
-    for k, v in svc_dict.items():
-        logging.info("Checking service {}".format(k))
-        # select service type from ServiceInfo
-        select_lyr = arcpy.MakeFeatureLayer_management(serviceinfo, "serviceinfo_lyr", "SvcName = '{}'".format(k))
-        # select parcel that intersects selected service point
-        select_loc = arcpy.SelectLayerByLocation_management(utilityparcels_lyr, 'INTERSECT', select_lyr, '', 'NEW_SELECTION')
-        logging.info(str(int(arcpy.GetCount_management(select_loc).getOutput(0))) + " records with {} service".format(v))
-        # update corresponding field as 'Available' in utility parcels
-        with arcpy.da.UpdateCursor(select_loc, [v]) as ucur:
-            for urow in ucur:
-                urow[0] = "Available"
-                ucur.updateRow(urow)
-
-    # spatial join between parcels and services to get account number and customer classification
-    logging.info("Spatial join between utility parcels and ServiceInfo...")
-    parcel_service_sj = arcpy.SpatialJoin_analysis(utilityparcels, serviceinfo, "par_serv_sj", "JOIN_ONE_TO_MANY")
-    logging.info('Adding AccountNum_final field...')
-    arcpy.AddField_management(parcel_service_sj, "AccountNum_final", "TEXT")
-
-    # use cursor to calculate account number for gas accounts
-    logging.info("Finding accounts with Gas service...")
-    gas_list = {}
-    with arcpy.da.SearchCursor(parcel_service_sj, ["AcctNum", "TARGET_FID"], "SvcName = 'GAS'") as scur: 
-        for row in scur:
-            if row[1] not in gas_list:
-                gas_list[str(row[1])] = str(row[0])
-    logging.info('number of gas records: ' + str(len(gas_list)))
-
-    # update account number row to prioritize Gas accounts
-    logging.info("Starting to update account numbers...")
-    with arcpy.da.UpdateCursor(parcel_service_sj, ["AccountNum_final", "AcctNum", "TARGET_FID"]) as ucur:
+    # one bit per service name, and the bits that make each service field Available
+    svc_names = sorted(svc_dict)
+    svc_bits = dict((k, 1 << i) for i, k in enumerate(svc_names))
+    svc_fields = sorted(set(svc_dict.values()))
+    fld_bits = [sum(svc_bits[k] for k, v in svc_dict.items() if v == f) for f in svc_fields]
+
+    # index utility parcels so each ServiceInfo point finds the parcels it intersects
+    logging.info("Indexing utility parcels...")
+    parcel_idx = spatialIndex.PolygonIndex()
+    read = 0
+    with arcpy.da.SearchCursor(utilityparcels, ["OID@", "SHAPE@"]) as scur:
+        for oid, shape in scur:
+            read += 1
+            if shape is not None:
+                parcel_idx.insert(spatialIndex.ringsFromGeometry(shape), oid)
+    parcel_idx.build()
+
+    # one visit per ServiceInfo point, keeping a service mask and one account per parcel:
+    # the first gas account wins, otherwise the first account
+    logging.info("Finding service and accounts by parcel...")
+    svc_masks = {}
+    accounts = {}
+    with arcpy.da.SearchCursor(serviceinfo, ["SHAPE@XY", "SvcName", "AcctNum", "CustClass"],
+                               sql_clause=(None, "ORDER BY OBJECTID")) as scur:
+        for xy, svc, acct, custclass in scur:
+            read += 1
+            if not xy or xy[0] is None:
+                continue
+            is_gas = svc == 'GAS'
+            for fid in parcel_idx.containing(xy[0], xy[1]):
+                if svc in svc_bits:
+                    svc_masks[fid] = svc_masks.get(fid, 0) | svc_bits[svc]
+                winner = accounts.get(fid)
+                if winner is None or (is_gas and not winner[2]):
+                    accounts[fid] = (acct, custclass, is_gas)
+    del(parcel_idx)
+
+    for k in svc_names:
+        count = sum(1 for mask in svc_masks.values() if mask & svc_bits[k])
+        logging.info("{} records with {} service ({})".format(count, svc_dict[k], k))
+    logging.info('number of gas accounts: ' + str(sum(1 for winner in accounts.values() if winner[2])))
+
+    # update service fields as 'Available', account and customer classification in one pass
+    logging.info("Updating service fields, Account and Customer Classification...")
+    acct_idx = len(svc_fields) + 1
+    written = 0
+    with arcpy.da.UpdateCursor(utilityparcels, ["OID@"] + svc_fields + ["Account", "Customer_Classification"]) as ucur:
         for urow in ucur:
-            if urow[2] in gas_list:
-                urow[0] = gas_list[urow[2]]
-            else:
-                urow[0] = urow[1]
-            ucur.updateRow(urow)
-
-    # spatial join between parcels and services to get service
-    logging.info('Spatial join between utility parcels and limb service...')
-    util_limb_sj = arcpy.SpatialJoin_analysis(utilityparcels, limb, 'util_limb_sj', 'JOIN_ONE_TO_ONE',
-                                              'KEEP_ALL', '', 'HAVE_THEIR_CENTER_IN')
-    logging.info('Spatial join between utility parcels and sanitation service...')
-    util_sani_sj = arcpy.SpatialJoin_analysis(utilityparcels, sanitation, 'util_sani_sj', 'JOIN_ONE_TO_ONE',
-                                              'KEEP_ALL', '', 'HAVE_THEIR_CENTER_IN')
-    logging.info('Spatial join between utility parcels and recycle service...')
-    util_recycle_sj = arcpy.SpatialJoin_analysis(utilityparcels, recycle, 'util_recycle_sj', 'JOIN_ONE_TO_ONE',
-                                              'KEEP_ALL', '', 'HAVE_THEIR_CENTER_IN')
-
-    # to avoid join table limitations, creating dictionaries to use in update cursor
-    sj_id = 'TARGET_FID'
-    oid = 'OBJECTID'
-    whereclause = ['{} < 135653', '{} BETWEEN 135653 AND 271304', '{} > 271304']
-    service_fields = ["OBJECTID", "Account", "Customer_Classification", "Limb_Pickup_Day", 
-                    "Sanitation_Pickup_Day", "Recycle_Pickup_Day", "Recycle_Pickup_Week"]
-
-    for w in whereclause:
-        # service account number and customer classification dictionary
-        logging.info("Creating account number and cust. class. dictionary for updating...")
-        lutDict_ser = dict([(row[0], (row[1], row[2])) for row in arcpy.da.SearchCursor(parcel_service_sj,["TARGET_FID", "AccountNum_final", "CustClass"], w.format(sj_id))])
-        logging.info("Creating DOW limb dictionary for updating...")
-        lutDict_limb = dict([(row[0], (row[1])) for row in arcpy.da.SearchCursor(util_limb_sj, ["TARGET_FID", "DOW"], w.format(sj_id))])
-        logging.info("Creating DOW sanitation dictionary for updating...")
-        lutDict_sani = dict([(row[0], (row[1])) for row in arcpy.da.SearchCursor(util_sani_sj, ["TARGET_FID", "DOW"], w.format(sj_id))])
-        logging.info("Creating DOW and Week recycle dictionary for updating...")
-        lutDict_recycle = dict([(row[0], (row[1], row[2])) for row in arcpy.da.SearchCursor(util_recycle_sj, ["TARGET_FID", "Weekday", "Week"], w.format(sj_id))])
-        
-        
-        # update cursor for utility parcels output
-        logging.info("Updating Account, Customer Classification, limb, and sanitation...")
-        with arcpy.da.UpdateCursor(utilityparcels, service_fields, w.format(oid)) as ucur:
-            for urow in ucur:
-                joinFld = urow[0]
-                if joinFld in lutDict_ser.keys():
-                    urow[1] = lutDict_ser[joinFld][0]
-                    urow[2] = lutDict_ser[joinFld][1]
-                if joinFld in lutDict_limb.keys():
-                    urow[3] = lutDict_limb[joinFld]
-                if joinFld in lutDict_sani.keys():
-                    urow[4] = lutDict_sani[joinFld]
-                if joinFld in lutDict_recycle.keys():
-                    urow[5] = lutDict_recycle[joinFld][0]
-                    urow[6] = lutDict_recycle[joinFld][1]
-                                                 
+            mask = svc_masks.get(urow[0])
+            winner = accounts.get(urow[0])
+            if mask or winner:
+                if mask:
+                    for i, bits in enumerate(fld_bits):
+                        if mask & bits:
+                            urow[i + 1] = "Available"
+                if winner:
+                    urow[acct_idx] = winner[0]
+                    urow[acct_idx + 1] = winner[1]
                 ucur.updateRow(urow)
+                written += 1
+    stageMetrics.rows(read=read, written=written)
+
+    # route values by parcel center, all three route layers in one sweep
+    route_layers = [('limb', limb, ['DOW'], ['Limb_Pickup_Day']),
+                    ('sanitation', sanitation, ['DOW'], ['Sanitation_Pickup_Day']),
+                    ('recycle', recycle, ['Weekday', 'Week'], ['Recycle_Pickup_Day', 'Recycle_Pickup_Week'])]
+    routeIndex.assignRoutes(utilityparcels, route_layers, route_cache)
 
     logging.info("Ready to populate UtilityParcels in SDE!")
 
     return utilityparcels
 
+@stageMetrics.measure
 def publishUtilityParcels(utilityparcels_f, utilityparcels_sde):
 
-    logging.info("Updating UtilityParcels and MyGovernmentServices map service")
-    try:
-        # getting token
-        token = get_token(admin_user, admin_pass, server_name, port, expiration)
-
-        # stopping service
-        action = 'stop'
-        json_output = serviceStartStop(server_name, port, service_name, action, token)
-        # verify success
-        if json_output['status'] == 'success':
+    # edits land in the updateParcels version, the service reads sde.DEFAULT
+    # and keeps running until the post in serviceWindow
+    logging.info("Loading new data into UtilityParcels in the updateParcels version...")
+    expected = int(arcpy.GetCount_management(utilityparcels_f).getOutput(0))
+    syncSDE.syncFeatureClass(utilityparcels_f, utilityparcels_sde, ['Parcel_No', 'Full_Address'])
+
+    # check the staged rows before anything is posted
+    loaded = int(arcpy.GetCount_management(utilityparcels_sde).getOutput(0))
+    logging.info('{} rows in working UtilityParcels, {} rows staged in version'.format(expected, loaded))
+    if loaded != expected:
+        raise Exception('UtilityParcels row count mismatch: {} expected, {} staged'.format(expected, loaded))
+
+def adminClient():
+    '''Admin client for the map service, calls time out after 30 seconds'''
+    return agsAdmin.AdminClient(server_name, port, admin_user, admin_pass, expiration, timeout=30)
+
+@contextlib.contextmanager
+def serviceWindow(admin, stop_service):
+    '''Swap window around the post, stops the service only when asked and always restarts it'''
+
+    stopped = None
+    if stop_service:
+        json_output = admin.stopService(service_folder, service_name)
+        if json_output.get('status') == 'success':
             logging.info('{} was stopped successfully'.format(service_name))
+            stopped = time.time()
         else:
             logging.info('Failed to stop {}'.format(service_name))
-            raise Exception(json_output)
-
-    except Exception, e:
-        logging.info(e)
-
-    # appending new data to utility parcel
-    logging.info("appending new data to UtilityParcels...")
-    arcpy.DeleteRows_management(utilityparcels_sde)
-    arcpy.Append_management(utilityparcels_f, utilityparcels_sde, "NO_TEST")
 
+    window_start = time.time()
+    failed = True
     try:
-        # starting service
-        action = 'start'
-        json_output = serviceStartStop(server_name, port, service_name, action, token)
-        # verify success
-        if json_output['status'] == 'success':
-            logging.info('{} was started successfully'.format(service_name))
+        yield
+        failed = False
+    finally:
+        logging.info('Swap window took {:.1f} seconds'.format(time.time() - window_start))
+        if stop_service and failed:
+            # the swap's error propagates, not the restart's
+            try:
+                startService(admin)
+            except Exception as e:
+                logging.info('Failed to restart {} after the swap failed: {}'.format(service_name, e))
+        elif stop_service:
+            startService(admin)
+        if stopped:
+            logging.info('{} was down for {:.1f} seconds'.format(service_name, time.time() - stopped))
         else:
-            logging.info('Failed to start {}'.format(service_name))
-            raise Exception(json_output)
-
-    except Exception, e:
-        logging.info(e)
-
-def get_token(adminuser, adminpass, server, port, exp):
-    '''Generates token'''
-    logging.info("getting token")
+            logging.info('{} was not stopped, downtime 0 seconds'.format(service_name))
+
+def startService(admin):
+    '''Starts the service and waits for ArcGIS Server to report it running'''
+
+    json_output = admin.startService(service_folder, service_name)
+    if json_output.get('status') != 'success':
+        logging.info('Failed to start {}'.format(service_name))
+        raise Exception(json_output)
+
+    logging.info('{} was started successfully'.format(service_name))
+    poll = admin.pollStatus(service_folder, service_name, 'STARTED', timeout=status_timeout)
+    if poll.wait(status_timeout + admin.timeout):
+        logging.info('{} reports STARTED'.format(service_name))
+    else:
+        logging.info('{} did not report STARTED within {} seconds: {}'.format(service_name, status_timeout, poll.error or poll.result))
     
-    # build url
-    url = r"https://{}:{}/arcgis/admin/generateToken?f=json".format(server, port)
-
-    # dict for query string, used to request token
-    query_dict = {"username":adminuser, "password":adminpass, "expiration":str(exp), "client":"requestip"}
-    query_string = urllib.urlencode(query_dict)
+def stageInputs(cxn, working_fldr):
+    '''Inputs of the stage by name, fingerprinted to skip unchanged runs'''
+
+    datamining_fds = cxn + r"\sdeCity.GISADMIN.DataMining"
+    facilstreets_fds = cxn + r"\sdeCity.GISADMIN.FacilitiesStreets"
+    return {'ParcelsAll': datamining_fds + r"\sdeCity.GISADMIN.ParcelsAll",
+            'ServiceInfo': datamining_fds + r"\sdeCity.GISADMIN.ServiceInfo",
+            'CityUtilityServiceArea': datamining_fds + r"\sdeCity.GISADMIN.CityUtilityServiceArea",
+            'LimbRoutes': facilstreets_fds + r"\sdeCity.GISADMIN.LimbRoutes",
+            'SanitationRoutes': facilstreets_fds + r"\sdeCity.GISADMIN.SanitationRoutes",
+            'RecycleRoutes': facilstreets_fds + r'\sdeCity.GISADMIN.RecycleRoutes'}
+
+@stageMetrics.measure
+def runUtilityParcels(version_cxn, parent_cxn, working_fldr, parcelsall=None, checkpoints=None):
+    '''
+    Builds UtilityParcels in the working fgdb and loads it into the version,
+    returns the working fc. Completed stages are taken from checkpoints.
+    '''
+
+    # input workspaces
+    gdb = working_fldr + r"\working.gdb"
+    arcpy.env.workspace = gdb
+
+    # input FDS
+    datamining_fds = version_cxn + r"\sdeCity.GISADMIN.DataMining"
+
+    # input FC, a working ParcelsAll from the pipeline is clipped when given
+    inputs = stageInputs(version_cxn, working_fldr)
+    parcelsall_fc = parcelsall or inputs['ParcelsAll']
+    # new version was empty - using parent service info feature class
+    serviceinfo_fc = stageInputs(parent_cxn, working_fldr)['ServiceInfo']
+    servicearea_fc = inputs['CityUtilityServiceArea']
+    limb_fc = inputs['LimbRoutes']
+    sanitation_fc = inputs['SanitationRoutes']
+    recycle_fc = inputs['RecycleRoutes']
+
+    # output FC
+    utilityparcels_fc = datamining_fds + r"\sdeCity.GISADMIN.UtilityParcels"
+
+    # run modules, the load into the version always reruns
+    checkpoints = checkpoints or stageCheckpoint.Checkpoints(None)
+    logging.info('Running prepUtilityParcels')
+    utilityparcels_out = checkpoints.run('prep', gdb, prepUtilityParcels, gdb, parcelsall_fc, servicearea_fc,
+                                         working_fldr + r"\service_area_index.pkl")
+    logging.info('Running populateServiceFields')
+    utilityparcels_final = checkpoints.run('populate', gdb, populateServiceFields, utilityparcels_out, serviceinfo_fc, limb_fc,
+                                           sanitation_fc, recycle_fc, working_fldr + r"\route_index.pkl")
+    logging.info('Running publishUtilityParcels')
+    publishUtilityParcels(utilityparcels_final, utilityparcels_fc)
+
+    return(str(utilityparcels_final))
 
-    try:
-        # request token, will close url after completed
-        with contextlib.closing(urllib2.urlopen(url, query_string)) as json_response:
-            token_result = json.loads(json_response.read())
-            if 'token' not in token_result or token_result == None:
-                raise Exception('Failed to get token: {}'.format(token_result['messages']))
-            else:
-                return token_result['token']
-
-    except urllib2.URLError, e:
-        raise Exception('Could not connect to {} on port {}. {}'.format(server, port, e))
-
-def serviceStartStop(server, port, service, action, token):
-    '''Starts or stops service'''
-    logging.info("{} service".format(action))
-
-    # build url
-    url = r"https://{}:{}/arcgis/admin".format(server, port)
-    request_url = url + r"/services/MyCityServices/{}/{}".format(service, action)
-    logging.info(request_url)
-
-    # dict for query string, used to send request to start/stop
-    query_dict = {"token": token, "f": "json"}
-    query_string = urllib.urlencode(query_dict)
-
-    # send request, close after complete
-    with contextlib.closing(urllib.urlopen(request_url, query_string)) as json_response:
-        logging.info(json_response)
-        return json.loads(json_response.read())
-    
 if __name__ == "__main__":
 
+    parser = argparse.ArgumentParser(description='Updates the UtilityParcels feature class')
+    parser.add_argument('--force', action='store_true', help='run even when no input changed since the last run')
+    parser.add_argument('--resume', action='store_true', help='reuse the stages a failed run completed when its inputs are unchanged')
+    parser.add_argument('--scratch', choices=scratchWorkspace.modes, default=scratchWorkspace.mode,
+                        help='intermediates in_memory up to a row threshold (auto), always (memory) or in the fgdb (disk)')
+    args = parser.parse_args()
+    scratchWorkspace.mode = args.scratch
+
     try:
 
         # env
         arcpy.env.overwriteOutput = True
 
         # inputs
-        sde_cxn= r'D:\sdeConn\GISProd_Alias\Alias@GISProd@sde@sdeCity.sde'
-        gisadmin_cxn = r"D:\sdeConn\GISProd_Alias\Alias@GISProd@GISAdmin@sdeCity.sde"
-        
         up_fldr = r"D:\prod-scripts\utility-billing"
+        version_mgr = versionManager.VersionManager(parent_cxn, up_fldr, 'updateParcels', sql_instance, "GISAdmin", "G1SAdm1n!",
+                                                    owner_cxn=owner_cxn)
 
         # maintain log file
         current = datetime.today()
@@ -275,99 +383,41 @@ if __name__ == "__main__":
                             format='%(levelname)s: %(asctime)s %(message)s',
                             datefmt='%m/%d/%Y %I:%M:%S')
         logging.info("Starting run... \n")
+        stageMetrics.configure('UtilityParcels', up_fldr)
 
-        # input workspaces
-        gdb = up_fldr + r"\working.gdb"
-        arcpy.env.workspace = gdb
-
-        # service inputs 
-        # credentials
-        admin_user = "siteadmin"
-        admin_pass = "colg1sadmin"
-        # server info
-        server_name = "gis-app.lawrencevillega.org"
-        port = "6443"
-        # service name
-        service_name = "MyCityServices.MapServer"
-        # token expires in 12 hours
-        expiration = 720
-
-        # removing version
-        versions = [ver.name for ver in arcpy.da.ListVersions(gisadmin_cxn)]
-        if 'GISADMIN.updateParcels' in versions:
-            arcpy.DeleteVersion_management(gisadmin_cxn, 'GISADMIN.updateParcels')
-        # set up version
-        logging.info("creating updateParcels version")
-        arcpy.CreateVersion_management(gisadmin_cxn, 'sde.DEFAULT', 'updateParcels', 'PRIVATE')
-        logging.info("creating connection file")
-        arcpy.CreateDatabaseConnection_management(up_fldr, "updateParcels@sdeCity", "SQL_SERVER", r"ch-server-sql\sql2019GISProd", "DATABASE_AUTH",
-                                                "GISAdmin", "G1SAdm1n!", "SAVE_USERNAME", "sdeCity", "", "TRANSACTIONAL", "GISADMIN.updateParcels")
-        parcel_gisadmin_cxn = r"D:\prod-scripts\utility-billing\updateParcels@sdeCity.sde"
-
-        # input FDS
-        datamining_fds = parcel_gisadmin_cxn + r"\sdeCity.GISADMIN.DataMining"
-        facilstreets_fds = parcel_gisadmin_cxn + r"\sdeCity.GISADMIN.FacilitiesStreets"
-
-        # input FC
-        parcelsall_fc = datamining_fds + r"\sdeCity.GISADMIN.ParcelsAll"
-        # new version was empty - using parent service info feature class
-        serviceinfo_fc = gisadmin_cxn + r"\sdeCity.GISADMIN.DataMining\sdeCity.GISADMIN.ServiceInfo"
-        servicearea_fc = datamining_fds + r"\sdeCity.GISADMIN.CityUtilityServiceArea"
-        limb_fc = facilstreets_fds + r"\sdeCity.GISADMIN.LimbRoutes"
-        sanitation_fc = facilstreets_fds + r"\sdeCity.GISADMIN.SanitationRoutes"
-        recycle_fc = facilstreets_fds + r'\sdeCity.GISADMIN.RecycleRoutes'
-        
-        # output FC
-        utilityparcels_fc = datamining_fds + r"\sdeCity.GISADMIN.UtilityParcels"
+        # skip the run when no input changed since the last successful run
+        fingerprints = sourceFingerprint.FingerprintStore(up_fldr + r"\source_fingerprints.json")
+        changed, prints = fingerprints.check('UtilityParcels', stageInputs(parent_cxn, up_fldr))
+        if not changed and not args.force:
+            logging.info("Nothing to update, skipping run (--force runs anyway) \n ------------------------------------ \n\n")
+            sys.exit(0)
+        checkpoints = stageCheckpoint.Checkpoints(up_fldr + r"\stage_checkpoints.json", 'UtilityParcels', prints, args.resume)
+
+        # admin client for the map service
+        admin = adminClient()
+
+        # reuse the updateParcels version and connection file, recreated only when unhealthy
+        with stageMetrics.step('version'):
+            parcel_gisadmin_cxn = version_mgr.acquire(up_fldr + r"\logs\updateParcelsReset.txt")
 
         # run modules
-        logging.info('Running prepUtilityParcels')
-        utilityparcels_out = prepUtilityParcels(gdb, parcelsall_fc, servicearea_fc)
-        logging.info('Running populateServiceFields')
-        utilityparcels_final = populateServiceFields(utilityparcels_out, serviceinfo_fc, limb_fc, sanitation_fc, recycle_fc)
-        logging.info('Running publishUtilityParcels')
-        publishUtilityParcels(utilityparcels_final, utilityparcels_fc)
-        
+        runUtilityParcels(parcel_gisadmin_cxn, parent_cxn, up_fldr, checkpoints=checkpoints)
+
         # clean up, aisle 5
         logging.info("reconcile and posting edits to sde.DEFAULT")
-        arcpy.ReconcileVersions_management(parcel_gisadmin_cxn, "ALL_VERSIONS", "sde.DEFAULT", "GISADMIN.updateParcels", "LOCK_ACQUIRED", "", "", "", 
-                                           "POST", "KEEP_VERSION", up_fldr + r"\logs\updateParcelsReconcile.txt")
-        logging.info('deleting sde connection to updateParcels version')
-        if os.path.exists(parcel_gisadmin_cxn):
-            os.remove(parcel_gisadmin_cxn)
-
-        logging.info("Deleting version updateParcels...") 
-        # using sde owner, not gisadmin
-        user_name = 'GISADMIN'
-        users = arcpy.ListUsers(sde_cxn)
-        for u in users:
-            logging.info('{0} - {1}'.format(u.Name, u.ConnectionTime))
-            if u.Name == user_name:
-                arcpy.DisconnectUser(sde_cxn, u.ID)
-        arcpy.DeleteVersion_management(sde_cxn, 'GISADMIN.updateParcels')
+        with serviceWindow(admin, stop_service), stageMetrics.step('reconcile'):
+            version_mgr.post(up_fldr + r"\logs\updateParcelsReconcile.txt")
 
+        fingerprints.save('UtilityParcels', prints)
+        checkpoints.clear()
         logging.info("Success! \n ------------------------------------ \n\n")
 
     except Exception as e:
         logging.error("EXCEPTION OCCURRED", exc_info=True)
 
-        # removing version
-        versions = [ver.name for ver in arcpy.da.ListVersions(gisadmin_cxn)]
-        if 'GISADMIN.updateParcels' in versions:
-            arcpy.DeleteVersion_management(sde_cxn, 'GISADMIN.updateParcels')
-        if os.path.exists(parcel_gisadmin_cxn):
-            os.remove(parcel_gisadmin_cxn)
-
-        # starting service 
-        token = get_token(admin_user, admin_pass, server_name, port, expiration)
-        action = 'start'
-        json_output = serviceStartStop(server_name, port, service_name, action, token)
-        # verify success
-        if json_output['status'] == 'success':
-            logging.info('{} was started successfully'.format(service_name))
-        else:
-            logging.info('Failed to start {}'.format(service_name))
-            raise Exception(json_output)  
+        # removing version, recreated next run if still in use
+        version_mgr.discard()
 
+        # the service is restarted by serviceWindow, which stopped it
         logging.info("Quitting! \n ------------------------------------ \n\n")
 
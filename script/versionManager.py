@@ -0,0 +1,157 @@
+'''
+ ____________________________________________________________________
+ Lawrenceville, GA
+_____________________________________________________________________
+
+   Program:    versionManager.py
+   Purpose:    Keeps one long-lived version and .sde connection file per
+               job instead of creating and deleting them on every run.
+               A healthy version is reset by reconciling it with DEFAULT
+               (no post), edits are posted with KEEP_VERSION, and the
+               version and connection file are only recreated when they
+               are missing, point at the wrong version or parent, fail to
+               open, or were left behind by a failed run. Versions are
+               deleted through the owner connection when one is given
+               (sde owner, as updateUtilityParcels.py has done since
+               02/2021). Nothing here disconnects other sessions.
+_____________________________________________________________________
+   History:     AG      10/2026     Created
+                AG      10/2026     owner_cxn for DeleteVersion
+_____________________________________________________________________
+'''
+
+import arcpy
+import os
+import logging
+
+
+class VersionManager(object):
+    '''
+    Version <owner>.<version> off parent, connection file
+    <folder>\<version>@<database>.sde. A marker file next to the
+    connection file is present while edits may be unposted; a version
+    found with the marker on the next run is recreated. Versions are
+    deleted through owner_cxn, parent_cxn when it is not given.
+    '''
+
+    def __init__(self, parent_cxn, folder, version, instance, user, password,
+                 database='sdeCity', owner='GISADMIN', parent='sde.DEFAULT', owner_cxn=None):
+
+        self.parent_cxn = parent_cxn
+        self.owner_cxn = owner_cxn or parent_cxn
+        self.folder = folder
+        self.version = version
+        self.instance = instance
+        self.user = user
+        self.password = password
+        self.database = database
+        self.parent = parent
+        self.full_name = owner + '.' + version
+        self.cxn_name = '{}@{}'.format(version, database)
+        self.cxn = folder + '\\' + self.cxn_name + '.sde'
+        self.marker = self.cxn + '.inuse'
+
+    def _versionInfo(self):
+        for ver in arcpy.da.ListVersions(self.parent_cxn):
+            if ver.name.upper() == self.full_name.upper():
+                return ver
+        return None
+
+    def _versionHealthy(self):
+        ver = self._versionInfo()
+        if ver is None:
+            logging.info('Version {} does not exist'.format(self.full_name))
+            return False
+        if (ver.parentVersionName or '').upper() != self.parent.upper():
+            logging.info('Version {} is based on {}, not {}'.format(self.full_name, ver.parentVersionName, self.parent))
+            return False
+        if os.path.exists(self.marker):
+            logging.info('Version {} was left by a failed run'.format(self.full_name))
+            return False
+        return True
+
+    def _connectionHealthy(self):
+        if not os.path.exists(self.cxn):
+            return False
+        try:
+            props = arcpy.Describe(self.cxn).connectionProperties
+            if props.version.upper() != self.full_name.upper():
+                logging.info('{} points at {}'.format(self.cxn, props.version))
+                return False
+            arcpy.da.ListVersions(self.cxn)
+            return True
+        except Exception as e:
+            logging.info('{} cannot be opened: {}'.format(self.cxn, e))
+            return False
+
+    def _createVersion(self):
+        if self._versionInfo() is not None:
+            logging.info('Deleting version {}'.format(self.full_name))
+            arcpy.DeleteVersion_management(self.owner_cxn, self.full_name)
+        logging.info('Creating version {}'.format(self.full_name))
+        arcpy.CreateVersion_management(self.parent_cxn, self.parent, self.version, 'PRIVATE')
+
+    def _createConnection(self):
+        if os.path.exists(self.cxn):
+            os.remove(self.cxn)
+        logging.info('Creating connection file {}'.format(self.cxn))
+        arcpy.CreateDatabaseConnection_management(self.folder, self.cxn_name, "SQL_SERVER", self.instance, "DATABASE_AUTH",
+                                                  self.user, self.password, "SAVE_USERNAME", self.database, "", "TRANSACTIONAL",
+                                                  self.full_name)
+
+    def _reset(self, log):
+        '''Rebases the version on its parent, parent wins any conflict'''
+
+        logging.info('Resetting version {} to {}'.format(self.full_name, self.parent))
+        arcpy.ReconcileVersions_management(self.cxn, "ALL_VERSIONS", self.parent, self.full_name, "LOCK_ACQUIRED", "NO_ABORT",
+                                           "BY_OBJECT", "FAVOR_TARGET_VERSION", "NO_POST", "KEEP_VERSION", log)
+
+    def acquire(self, log=None):
+        '''
+        Returns the connection file to edit through, reusing the version
+        and connection file when healthy and recreating what is not.
+        '''
+
+        version_ok = self._versionHealthy()
+        if not version_ok:
+            self._createVersion()
+        if not self._connectionHealthy():
+            self._createConnection()
+
+        if version_ok:
+            try:
+                self._reset(log)
+            except Exception as e:
+                logging.info('Reset of {} failed ({}), recreating'.format(self.full_name, e))
+                self._createVersion()
+                self._createConnection()
+
+        with open(self.marker, 'w') as f:
+            f.write(self.full_name)
+
+        return(self.cxn)
+
+    def post(self, log=None):
+        '''Reconciles and posts to the parent, the version is kept for the next run'''
+
+        arcpy.ReconcileVersions_management(self.cxn, "ALL_VERSIONS", self.parent, self.full_name, "LOCK_ACQUIRED", "", "", "",
+                                           "POST", "KEEP_VERSION", log)
+        if os.path.exists(self.marker):
+            os.remove(self.marker)
+
+    def discard(self):
+        '''
+        After a failed run: deletes the version so unposted edits never
+        reach the parent. If it is in use the marker stays and the next
+        run recreates it instead. Does nothing before acquire().
+        '''
+
+        if not os.path.exists(self.marker):
+            return
+        try:
+            if self._versionInfo() is not None:
+                arcpy.DeleteVersion_management(self.owner_cxn, self.full_name)
+            if os.path.exists(self.marker):
+                os.remove(self.marker)
+        except Exception as e:
+            logging.info('Could not delete version {} ({}), it will be recreated next run'.format(self.full_name, e))